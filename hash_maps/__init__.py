@@ -0,0 +1,55 @@
+# Description: Hash map package: the OA & SC HashMaps, the structures they
+# share in core, and the wrappers and alternative engines built on them
+
+
+import importlib
+
+# public names and the module defining each of them; a module is only
+# imported the first time one of its names is used, so importing the
+# package costs nothing beyond this table
+_EXPORTS = {
+    'DynamicArray': ('core', 'DynamicArray'),
+    'hash_function_1': ('core', 'hash_function_1'),
+    'hash_function_2': ('core', 'hash_function_2'),
+    'hash_function_3': ('core', 'hash_function_3'),
+    'fibonacci_hash': ('core', 'fibonacci_hash'),
+    'splitmix64': ('core', 'splitmix64'),
+    'OAHashMap': ('hash_map_oa', 'HashMap'),
+    'SCHashMap': ('hash_map_sc', 'HashMap'),
+    'OAArenaHashMap': ('hash_map_oa', 'ArenaHashMap'),
+    'SCArenaHashMap': ('hash_map_sc', 'ArenaHashMap'),
+    'IntHashMap': ('hash_map_oa', 'IntHashMap'),
+    'HopscotchHashMap': ('hash_map_hopscotch', 'HopscotchHashMap'),
+    'CountingMap': ('hash_map_sc', 'CountingMap'),
+    'find_mode': ('hash_map_sc', 'find_mode'),
+    'FrozenHashMap': ('hash_map_frozen', 'FrozenHashMap'),
+    'DiskHashMap': ('hash_map_disk', 'HashMap'),
+    'HashSet': ('hash_collections', 'HashSet'),
+    'HashMultiMap': ('hash_collections', 'HashMultiMap'),
+    'TTLHashMap': ('hash_map_ttl', 'TTLHashMap'),
+    'AsyncHashMap': ('hash_map_async', 'AsyncHashMap'),
+    'DurableHashMap': ('hash_map_wal', 'DurableHashMap'),
+    'HookRegistry': ('hash_profile', 'HookRegistry'),
+    'SamplingTracer': ('hash_profile', 'SamplingTracer'),
+    'HashRing': ('hash_map_partitioned', 'HashRing'),
+    'PartitionedHashMap': ('hash_map_partitioned', 'PartitionedHashMap'),
+    'LocalCluster': ('hash_map_partitioned', 'LocalCluster'),
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    """Import the module defining a public name the first time it is used."""
+    if name not in _EXPORTS:
+        raise AttributeError('module ' + repr(__name__) + ' has no attribute ' + repr(name))
+
+    module, attribute = _EXPORTS[name]
+    value = getattr(importlib.import_module('.' + module, __name__), attribute)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    """List the public names along with the module globals."""
+    return sorted(set(globals()) | set(__all__))
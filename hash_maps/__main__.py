@@ -0,0 +1,46 @@
+# Description: Startup benchmark for the hash_maps package, run with
+# `python -m hash_maps`: import time and first map construction, in ms
+
+
+import subprocess
+import sys
+
+# every measurement runs in a fresh interpreter, so no module is cached
+STARTUP = '''
+import time
+start = time.perf_counter()
+import {module}
+imported = time.perf_counter()
+from hash_maps.core import hash_function_1
+{module}.HashMap({capacity}, hash_function_1)
+built = time.perf_counter()
+print((imported - start) * 1000, (built - imported) * 1000)
+'''
+
+RUNS = 5
+
+
+def measure(module: str, capacity: int) -> tuple:
+    """
+    Return the best import time and first construction time, in ms, of
+    `module` over RUNS fresh interpreters.
+    """
+    imports, builds = [], []
+    for _ in range(RUNS):
+        output = subprocess.run(
+            [sys.executable, '-c', STARTUP.format(module=module, capacity=capacity)],
+            capture_output=True, text=True, check=True).stdout
+        imported, built = output.split()
+        imports.append(float(imported))
+        builds.append(float(built))
+    return min(imports), min(builds)
+
+
+if __name__ == "__main__":
+
+    print("\nStartup - import and first construction (ms, best of " + str(RUNS) + ")")
+    print("------------------------------------------------------")
+    for module in ('hash_maps.hash_map_oa', 'hash_maps.hash_map_sc'):
+        for capacity in (11, 100000, 1000000):
+            imported, built = measure(module, capacity)
+            print(module, capacity, round(imported, 2), round(built, 2))
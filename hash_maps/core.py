@@ -0,0 +1,759 @@
+# Data Structures used by hash_map_oa.py and hash_map_sc.py
+
+import math
+import random
+from array import array
+
+# -------------- Used by both HashMaps (SC & OA)  -------------- #
+
+class DynamicArrayException(Exception):
+    pass
+
+
+class DynamicArray:
+    """
+    Class implementing a Dynamic Array
+    Supported methods are:
+    append, extend, pop, swap, get_at_index, set_at_index,
+    get_unchecked, set_unchecked, length
+    """
+
+    def __init__(self, arr=None, size: int = 0, fill: object = None) -> None:
+        """
+        Initialize new dynamic array using a list, or preallocate `size`
+        elements all set to `fill` in a single operation.
+        """
+        if arr:
+            self._data = arr.copy()
+        else:
+            self._data = [fill] * size
+
+    def __iter__(self):
+        """
+        Disable iterator capability for DynamicArray class
+        This means loops and aggregate functions like
+        those shown below won't work:
+
+        da = DynamicArray()
+        for value in da:        # will not work
+        min(da)                 # will not work
+        max(da)                 # will not work
+        sort(da)                # will not work
+        """
+        return None
+
+    def __str__(self) -> str:
+        """Override string method to provide more readable output."""
+        return str(self._data)
+
+    def append(self, value: object) -> None:
+        """Add new element at the end of the array."""
+        self._data.append(value)
+
+    def extend(self, values) -> None:
+        """
+        Add every element of another DynamicArray (or of a list or other
+        iterable) at the end of the array in one operation.
+        """
+        if isinstance(values, DynamicArray):
+            values = values._data
+        self._data.extend(values)
+
+    def pop(self):
+        """Remove element from end of the array and return it."""
+        return self._data.pop()
+
+    def swap(self, i: int, j: int) -> None:
+        """Swap two elements in array given their indices."""
+        self._data[i], self._data[j] = self._data[j], self._data[i]
+
+    def get_at_index(self, index: int):
+        """Return value of element at a given index."""
+        if index < 0 or index >= len(self._data):
+            raise DynamicArrayException
+        return self._data[index]
+
+    def __getitem__(self, index):
+        """
+        Return value of element at a given index using [] syntax,
+        or a new DynamicArray for a slice.
+        """
+        if isinstance(index, slice):
+            return DynamicArray(self._data[index])
+        if index < 0 or index >= len(self._data):
+            raise DynamicArrayException
+        return self._data[index]
+
+    def get_unchecked(self, index: int):
+        """
+        Return value of element at a given index without bounds checking.
+        For internal callers that already know the index is valid.
+        """
+        return self._data[index]
+
+    def set_at_index(self, index: int, value: object) -> None:
+        """Set value of element at a given index."""
+        if index < 0 or index >= len(self._data):
+            raise DynamicArrayException
+        self._data[index] = value
+
+    def __setitem__(self, index, value: object) -> None:
+        """
+        Set value of element at a given index using [] syntax. A slice is
+        set from a DynamicArray or list of the same length.
+        """
+        if isinstance(index, slice):
+            if isinstance(value, DynamicArray):
+                value = value._data
+            if len(range(*index.indices(len(self._data)))) != len(value):
+                raise DynamicArrayException
+            self._data[index] = value
+            return
+        if index < 0 or index >= len(self._data):
+            raise DynamicArrayException
+        self._data[index] = value
+
+    def set_unchecked(self, index: int, value: object) -> None:
+        """
+        Set value of element at a given index without bounds checking.
+        For internal callers that already know the index is valid.
+        """
+        self._data[index] = value
+
+    def length(self) -> int:
+        """Return length of array."""
+        return len(self._data)
+
+
+def hash_function_1(key: str) -> int:
+    """Sample Hash function #1 to be used with HashMap implementation"""
+    hash = 0
+    for letter in key:
+        hash += ord(letter)
+    return hash
+
+
+def hash_function_2(key: str) -> int:
+    """Sample Hash function #2 to be used with HashMap implementation"""
+    hash, index = 0, 0
+    index = 0
+    for letter in key:
+        hash += (index + 1) * ord(letter)
+        index += 1
+    return hash
+
+
+def hash_function_3(key: str) -> int:
+    """
+    Sample Hash function #3 to be used with HashMap implementation
+    64-bit FNV-1a over the code points of the key, which mixes every
+    character into all bits of the hash instead of summing them
+    """
+    hash = 0xCBF29CE484222325
+    for letter in key:
+        hash = ((hash ^ ord(letter)) * 0x100000001B3) & 0xFFFFFFFFFFFFFFFF
+    return hash
+
+
+def fibonacci_hash(key: int) -> int:
+    """
+    Integer hash function to be used with IntHashMap
+    Multiplies the key by 2^64 / golden ratio; the high bits of the 64-bit
+    product, which IntHashMap uses as the index, depend on every key bit
+    """
+    return ((key & 0xFFFFFFFFFFFFFFFF) * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+
+
+def splitmix64(key: int) -> int:
+    """
+    Integer hash function to be used with IntHashMap
+    The splitmix64 finalizer: slower than fibonacci_hash, but every output
+    bit depends on every key bit, for keys with structure in the high bits
+    """
+    key = ((key & 0xFFFFFFFFFFFFFFFF) + 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+    key = ((key ^ (key >> 30)) * 0xBF58476D1CE4E5B9) & 0xFFFFFFFFFFFFFFFF
+    key = ((key ^ (key >> 27)) * 0x94D049BB133111EB) & 0xFFFFFFFFFFFFFFFF
+    return key ^ (key >> 31)
+
+
+class HashFunctionSelector:
+    """
+    Picks the hash function of a HashMap built with function='auto'
+    A reservoir sample of the keys put into the map is kept until
+    `decide_after` keys have been put. Every candidate then hashes the
+    sample into the map's buckets (at least one per sampled key) and is
+    scored by the mean size of the bucket a sampled key lands in, which
+    is near 1 for an even spread. The best candidate replaces the current
+    function only when the current score is more than `margin` times worse.
+    Supported methods are: observe, decide
+    """
+
+    CANDIDATES = (hash_function_1, hash_function_2, hash_function_3)
+
+    def __init__(self,
+                 sample_size: int = 512,
+                 decide_after: int = 2048,
+                 margin: float = 1.25) -> None:
+        """Initialize an empty sample."""
+        self._sample = []
+        self._sample_size = sample_size
+        self._decide_after = decide_after
+        self._margin = margin
+        self._seen = 0
+
+    def observe(self, key: str) -> bool:
+        """
+        Offer a new key to the reservoir sample (algorithm R).
+        Return True once enough keys were seen to decide.
+        """
+        self._seen += 1
+        if len(self._sample) < self._sample_size:
+            self._sample.append(key)
+        else:
+            slot = random.randrange(self._seen)
+            if slot < self._sample_size:
+                self._sample[slot] = key
+        return self._seen >= self._decide_after
+
+    def _score(self, function: callable, capacity: int) -> float:
+        """Return the mean bucket size seen by a sampled key."""
+        counts = {}
+        for key in self._sample:
+            index = function(key) % capacity
+            counts[index] = counts.get(index, 0) + 1
+        return sum(count * count for count in counts.values()) / len(self._sample)
+
+    def decide(self, current: callable, capacity: int) -> dict:
+        """
+        Score every candidate and the current function at `capacity`
+        buckets, or one bucket per sampled key if that is more.
+        Return the decision: the function to use from now on, the
+        previous one, every score, the # of keys seen and whether to switch.
+        """
+        capacity = max(capacity, next_prime(len(self._sample)))
+        scores = {function.__name__: self._score(function, capacity)
+                  for function in self.CANDIDATES + (current,)}
+        best = min(self.CANDIDATES, key=lambda function: scores[function.__name__])
+        switched = (best is not current and
+                    scores[current.__name__] > self._margin * scores[best.__name__])
+
+        return {
+            'function': best if switched else current,
+            'previous': current,
+            'scores': scores,
+            'keys_seen': self._seen,
+            'capacity': capacity,
+            'switched': switched,
+        }
+
+
+# sieve of Eratosthenes shared by both HashMaps for capacities below
+# SIEVE_SIZE, where sieve[n] is 1 when n is prime; it is built on first use
+SIEVE_SIZE = 1 << 16
+_sieve = None
+
+# next_prime answers for capacities beyond the sieve
+_next_primes = {}
+
+
+def _build_sieve() -> bytearray:
+    """Build the shared sieve the first time a prime is needed."""
+    global _sieve
+    if _sieve is None:
+        sieve = bytearray([1]) * SIEVE_SIZE
+        sieve[0:2] = b'\x00\x00'
+        for factor in range(2, math.isqrt(SIEVE_SIZE - 1) + 1):
+            if sieve[factor]:
+                sieve[factor * factor::factor] = bytes(
+                    len(range(factor * factor, SIEVE_SIZE, factor)))
+        _sieve = sieve
+    return _sieve
+
+
+def is_prime(number: int) -> bool:
+    """
+    Return True if `number` is prime. Numbers below SIEVE_SIZE are looked
+    up in the sieve, larger ones go through a Miller-Rabin test whose bases
+    make it exact below 3.3 * 10 ** 24
+    """
+    if number < SIEVE_SIZE:
+        return number > 1 and _build_sieve()[number] == 1
+    if number % 2 == 0:
+        return False
+
+    d, s = number - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for base in (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37):
+        x = pow(base, d, number)
+        if x == 1 or x == number - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % number
+            if x == number - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def next_prime(capacity: int) -> int:
+    """
+    Return the smallest odd prime greater than or equal to `capacity`,
+    which is how both HashMaps round their capacity. Answers beyond the
+    sieve are cached, so maps built or resized to the same capacity only
+    search for the prime once
+    """
+    capacity = max(capacity, 3)
+    if capacity < SIEVE_SIZE:
+        found = _build_sieve().find(1, capacity)
+        if found != -1:
+            return found
+
+    prime = _next_primes.get(capacity)
+    if prime is None:
+        prime = max(capacity, SIEVE_SIZE) | 1
+        while not is_prime(prime):
+            prime += 2
+        _next_primes[capacity] = prime
+    return prime
+
+
+def shadow_method(instance: object, name: str, make_wrapper: callable) -> callable:
+    """
+    Shadow method `name` of `instance` with make_wrapper(current method),
+    stored on the instance, and return the wrapper. The wrapper remembers
+    the instance attribute it covered, so unshadow_method can take off
+    exactly this layer when several tools wrap the same method. While
+    wrapper.active is False the wrapper must only call through.
+    """
+    wrapper = make_wrapper(getattr(instance, name))
+    wrapper.covered = instance.__dict__.get(name)
+    wrapper.active = True
+    setattr(instance, name, wrapper)
+    return wrapper
+
+
+def unshadow_method(instance: object, name: str, wrapper: callable) -> None:
+    """
+    Retire a wrapper set by shadow_method. Retired wrappers are removed
+    from the top of the stack down to the first active one (or the class
+    method); a retired wrapper still covered by an active one stays in
+    place, calling through, until that one is retired too.
+    """
+    wrapper.active = False
+    top = instance.__dict__.get(name)
+    while top is not None and getattr(top, 'active', True) is False:
+        top = top.covered
+        if top is None:
+            del instance.__dict__[name]
+        else:
+            instance.__dict__[name] = top
+
+
+class CountingBloomFilter:
+    """
+    Counting Bloom filter used as a membership prefilter by both HashMaps
+    Every key sets k one-byte counters, so keys can be removed again.
+    Counters stick at 255 instead of wrapping. A False answer from
+    might_contain is definite, a True answer may be a false positive.
+    Supported methods are:
+    add, discard, might_contain, resized, clear, length, capacity,
+    false_positive, false_positive_rate
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01) -> None:
+        """Initialize an empty filter sized for `capacity` keys."""
+        self._capacity = max(capacity, 1)
+        self._error_rate = error_rate
+        self._bits = max(int(-self._capacity * math.log(error_rate) / math.log(2) ** 2), 8)
+        self._hashes = max(round(self._bits / self._capacity * math.log(2)), 1)
+        self._counters = bytearray(self._bits)
+        self._size = 0
+        self._negatives = 0
+        self._false_positives = 0
+
+    def _indexes(self, key: str) -> list:
+        """Return the counter indexes of a key using double hashing."""
+        digest = hash(key) & 0xFFFFFFFFFFFFFFFF
+        step = (digest >> 32) | 1
+        return [(digest + i * step) % self._bits for i in range(self._hashes)]
+
+    def add(self, key: str) -> None:
+        """Add a key that is not in the filter yet."""
+        for index in self._indexes(key):
+            if self._counters[index] < 255:
+                self._counters[index] += 1
+        self._size += 1
+
+    def discard(self, key: str) -> None:
+        """Remove a key that was added before."""
+        for index in self._indexes(key):
+            if 0 < self._counters[index] < 255:
+                self._counters[index] -= 1
+        self._size -= 1
+
+    def might_contain(self, key: str) -> bool:
+        """Return False if the key is definitely absent, True otherwise."""
+        for index in self._indexes(key):
+            if self._counters[index] == 0:
+                self._negatives += 1
+                return False
+        return True
+
+    def false_positive(self) -> None:
+        """Record that a True answer of might_contain was wrong."""
+        self._false_positives += 1
+
+    def false_positive_rate(self) -> float:
+        """
+        Return the measured share of absent keys that might_contain let
+        through, or 0 before any absent key was looked up.
+        """
+        absent = self._negatives + self._false_positives
+        return self._false_positives / absent if absent else 0.0
+
+    def resized(self, capacity: int) -> "CountingBloomFilter":
+        """
+        Return an empty filter sized for `capacity` keys with the same
+        error rate, carrying over the measured statistics.
+        """
+        filter = CountingBloomFilter(capacity, self._error_rate)
+        filter._negatives = self._negatives
+        filter._false_positives = self._false_positives
+        return filter
+
+    def clear(self) -> None:
+        """Remove every key, keeping the measured statistics."""
+        self._counters = bytearray(self._bits)
+        self._size = 0
+
+    def length(self) -> int:
+        """Return the number of keys in the filter."""
+        return self._size
+
+    def capacity(self) -> int:
+        """Return the number of keys the filter was sized for."""
+        return self._capacity
+
+
+class SkipNode:
+    """
+    Skip list node holding a key and one forward link per level
+    """
+
+    __slots__ = ('key', 'forward')
+
+    def __init__(self, key: str, levels: int) -> None:
+        """Initialize node given a key and its number of levels."""
+        self.key = key
+        self.forward = [None] * levels
+
+
+class SkipList:
+    """
+    Class implementing a Skip List of unique keys kept in sorted order,
+    used as the ordered index of both HashMaps
+    Supported methods are:
+    insert, remove, first, last, keys_from, keys_between,
+    keys_with_prefix, length
+    """
+
+    MAX_LEVEL = 32
+
+    def __init__(self) -> None:
+        """Initialize an empty skip list with a sentinel head node."""
+        self._head = SkipNode(None, self.MAX_LEVEL)
+        self._level = 1
+        self._size = 0
+
+    def __iter__(self):
+        """Return a generator over the keys in ascending order."""
+        node = self._head.forward[0]
+        while node:
+            yield node.key
+            node = node.forward[0]
+
+    def _predecessors(self, key: str) -> list:
+        """Return the last node before `key` on every level."""
+        update = [self._head] * self.MAX_LEVEL
+        node = self._head
+        for level in range(self._level - 1, -1, -1):
+            while node.forward[level] and node.forward[level].key < key:
+                node = node.forward[level]
+            update[level] = node
+        return update
+
+    def insert(self, key: str) -> bool:
+        """
+        Insert a key in order.
+        Return True if it was added, False if it was already present.
+        """
+        update = self._predecessors(key)
+        node = update[0].forward[0]
+        if node and node.key == key:
+            return False
+
+        levels = 1
+        while levels < self.MAX_LEVEL and random.random() < 0.5:
+            levels += 1
+        self._level = max(self._level, levels)
+
+        node = SkipNode(key, levels)
+        for level in range(levels):
+            node.forward[level] = update[level].forward[level]
+            update[level].forward[level] = node
+        self._size += 1
+        return True
+
+    def remove(self, key: str) -> bool:
+        """
+        Remove a key.
+        Return True if removal was successful, False otherwise.
+        """
+        update = self._predecessors(key)
+        node = update[0].forward[0]
+        if not node or node.key != key:
+            return False
+
+        for level in range(len(node.forward)):
+            update[level].forward[level] = node.forward[level]
+        while self._level > 1 and self._head.forward[self._level - 1] is None:
+            self._level -= 1
+        self._size -= 1
+        return True
+
+    def first(self) -> str:
+        """Return the smallest key, or None if the list is empty."""
+        node = self._head.forward[0]
+        return node.key if node else None
+
+    def last(self) -> str:
+        """Return the largest key, or None if the list is empty."""
+        node = self._head
+        for level in range(self._level - 1, -1, -1):
+            while node.forward[level]:
+                node = node.forward[level]
+        return node.key
+
+    def keys_from(self, key: str):
+        """Return a generator over the keys >= `key` in ascending order."""
+        node = self._predecessors(key)[0].forward[0]
+        while node:
+            yield node.key
+            node = node.forward[0]
+
+    def keys_between(self, low: str, high: str):
+        """Return a generator over the keys with low <= key <= high."""
+        for key in self.keys_from(low):
+            if key > high:
+                return
+            yield key
+
+    def keys_with_prefix(self, prefix: str):
+        """Return a generator over the keys starting with `prefix`."""
+        for key in self.keys_from(prefix):
+            if not key.startswith(prefix):
+                return
+            yield key
+
+    def length(self) -> int:
+        """Return the number of keys in the list."""
+        return self._size
+
+
+class KeyArena:
+    """
+    Class implementing an arena of string keys stored back to back as UTF-8
+    in one growable bytearray. A key is referenced by its position in the
+    arena, and its offset, length and hash are kept in parallel arrays, so
+    no str object is held per key
+    Supported methods are:
+    add, matches, key, key_bytes, hash, length, nbytes
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty arena."""
+        self._data = bytearray()
+        self._offsets = array('Q')
+        self._lengths = array('I')
+        self._hashes = array('Q')
+
+    def add(self, key_bytes: bytes, hash: int) -> int:
+        """Append an encoded key and its 64-bit hash. Return its reference."""
+        self._offsets.append(len(self._data))
+        self._lengths.append(len(key_bytes))
+        self._hashes.append(hash)
+        self._data += key_bytes
+        return len(self._hashes) - 1
+
+    def matches(self, ref: int, key_bytes: bytes, hash: int) -> bool:
+        """
+        Return True if the key at `ref` equals `key_bytes`. The cached hash
+        and the length are compared first, so the bytes are only compared
+        for keys that are almost certainly equal.
+        """
+        if self._hashes[ref] != hash or self._lengths[ref] != len(key_bytes):
+            return False
+        offset = self._offsets[ref]
+        return self._data[offset:offset + len(key_bytes)] == key_bytes
+
+    def key_bytes(self, ref: int) -> bytes:
+        """Return the encoded key at `ref`."""
+        offset = self._offsets[ref]
+        return bytes(self._data[offset:offset + self._lengths[ref]])
+
+    def key(self, ref: int) -> str:
+        """Return the key at `ref` as a str."""
+        offset = self._offsets[ref]
+        return self._data[offset:offset + self._lengths[ref]].decode('utf-8')
+
+    def hash(self, ref: int) -> int:
+        """Return the cached hash of the key at `ref`."""
+        return self._hashes[ref]
+
+    def length(self) -> int:
+        """Return the number of keys ever added to the arena."""
+        return len(self._hashes)
+
+    def nbytes(self) -> int:
+        """Return the number of bytes used by the arena buffers."""
+        return (len(self._data) + self._offsets.itemsize * len(self._offsets) +
+                self._lengths.itemsize * len(self._lengths) +
+                self._hashes.itemsize * len(self._hashes))
+
+
+# --------- For use in Separate Chaining (SC) HashMap  --------- #
+
+class SLNode:
+    """
+    Singly Linked List node for use in a hash map
+    """
+
+    def __init__(self, key: str, value: object, next: "SLNode" = None) -> None:
+        """Initialize node given a key and value."""
+        self.key = key
+        self.value = value
+        self.next = next
+
+    def __str__(self) -> str:
+        """Override string method to provide more readable output."""
+        return '(' + str(self.key) + ': ' + str(self.value) + ')'
+
+
+class LinkedListIterator:
+    """
+    Separate iterator class for LinkedList
+    """
+
+    def __init__(self, current_node: SLNode) -> None:
+        """Initialize the iterator with a node."""
+        self._node = current_node
+
+    def __iter__(self) -> "LinkedListIterator":
+        """Return the iterator."""
+        return self
+
+    def __next__(self) -> SLNode:
+        """Obtain next node and advance iterator."""
+
+        if not self._node:
+            raise StopIteration
+
+        current_node = self._node
+        self._node = self._node.next
+        return current_node
+
+
+class LinkedList:
+    """
+    Class implementing a Singly Linked List
+    Supported methods are: insert, remove, contains, length, iterator
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize new linked list;
+        doesn't use a sentinel and keeps track of its size in a variable.
+        """
+        self._head = None
+        self._size = 0
+
+        # The SC HashMap stamps each list with its clear() generation;
+        # a list from an older generation is treated as empty
+        self.generation = 0
+
+    def __str__(self) -> str:
+        """Override string method to provide more readable output."""
+        if not self._head:
+            return "SLL []"
+
+        content = str(self._head)
+        node = self._head.next
+        while node:
+            content += ' -> ' + str(node)
+            node = node.next
+        return 'SLL [' + content + ']'
+
+    def __iter__(self) -> LinkedListIterator:
+        """Return an iterator for the list, starting at the head."""
+        return LinkedListIterator(self._head)
+
+    def insert(self, key: str, value: object) -> None:
+        """Insert new node at front of the list."""
+        self._head = SLNode(key, value, self._head)
+        self._size += 1
+
+    def remove(self, key: str) -> bool:
+        """
+        Remove first node with matching key.
+        Return True if removal was successful, False otherwise.
+        """
+        previous, node = None, self._head
+        while node:
+
+            if node.key == key:
+                if previous:
+                    previous.next = node.next
+                else:
+                    self._head = node.next
+                self._size -= 1
+                return True
+
+            previous, node = node, node.next
+        return False
+
+    def contains(self, key: str) -> SLNode:
+        """Return node with matching key, or None if no match"""
+        node = self._head
+        while node:
+            if node.key == key:
+                return node
+            node = node.next
+        return node
+
+    def length(self) -> int:
+        """Return the length of the list."""
+        return self._size
+
+
+# ---------- For use in Open Addressing (OA) HashMap  ---------- #
+
+class HashEntry:
+
+    def __init__(self, key: str, value: object, generation: int = 0) -> None:
+        """Initialize an entry for use in a hash map."""
+        self.key = key
+        self.value = value
+
+        # Set this value to True when you "delete" a HashEntry
+        self.is_tombstone = False
+
+        # clear() generation of the OA HashMap the entry was put in;
+        # an entry from an older generation is treated as an empty index
+        self.generation = generation
+
+    def __str__(self) -> str:
+        """Override string method to provide more readable output."""
+        return f"K: {self.key} V: {self.value} TS: {self.is_tombstone}"
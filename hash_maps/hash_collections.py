@@ -0,0 +1,364 @@
+# Description: Set and multimap built on the OA & SC HashMap engines, without
+# dummy values or a DynamicArray per key
+
+
+from .core import DynamicArray, hash_function_1
+from .hash_map_sc import HashMap
+from .hash_map_snapshot import presize
+
+
+# shared value of every HashSet entry, so members cost no allocation of
+# their own
+PRESENT = True
+
+
+class HashSet:
+    def __init__(self,
+                 capacity: int = 11,
+                 function: callable = hash_function_1,
+                 engine: type = HashMap) -> None:
+        """
+        Initialize an empty set stored in a HashMap of class `engine` (the
+        OA or SC HashMap, or either ArenaHashMap) built with the given
+        capacity and hash function
+        """
+        self._map = engine(capacity, function)
+        self._function = function
+        self._engine = engine
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        return '{' + ', '.join(str(key) for key in self) + '}'
+
+    def __iter__(self):
+        """Return a generator over the members of the set."""
+        for key, _ in self._map.iter_items():
+            yield key
+
+    def __contains__(self, key: str) -> bool:
+        """Return True if `key` is a member of the set."""
+        return self._map.contains_key(key)
+
+    def get_size(self) -> int:
+        """
+        Return number of members
+        """
+        return self._map.get_size()
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of the underlying map
+        """
+        return self._map.get_capacity()
+
+    # ------------------------------------------------------------------ #
+
+    def _empty(self, count: int) -> "HashSet":
+
+        """ Helper that returns an empty set with the same engine and hash
+        function, sized once for `count` members. """
+
+        answer = HashSet(self._map.get_capacity(), self._function, self._engine)
+        presize(answer._map, count)
+        return answer
+
+    def _grow(self) -> None:
+
+        """ Helper that doubles the SC table once its load goes past 1, the
+        same rule find_mode uses. The OA table resizes on its own. """
+
+        if self._map.table_load() > 1:
+            self._map.resize_table(self._map.get_capacity() * 2)
+
+    def add(self, key: str) -> None:
+
+        """ Add method that makes `key` a member of the set. """
+
+        self._map.put(key, PRESENT)
+        self._grow()
+
+    def discard(self, key: str) -> None:
+
+        """ Discard method that removes `key` if it is a member. """
+
+        self._map.remove(key)
+
+    def contains(self, key: str) -> bool:
+
+        """ Contains method that returns True if `key` is a member. """
+
+        return self._map.contains_key(key)
+
+    def clear(self) -> None:
+
+        """ Clear method that removes every member. """
+
+        self._map.clear()
+
+    def get_keys(self) -> DynamicArray:
+
+        """ Get keys method that returns the members of the set. """
+
+        return DynamicArray(list(self))
+
+    # ------------------------------------------------------------------ #
+
+    def update(self, keys) -> None:
+
+        """ Update method that adds every key of an iterable, sizing the
+        table once up front when the number of keys is known. """
+
+        if hasattr(keys, 'get_size'):
+            presize(self._map, keys.get_size())
+        for key in keys:
+            self._map.put(key, PRESENT)
+        self._grow()
+
+    def union(self, other: "HashSet") -> "HashSet":
+
+        """ Union method that returns a new set with the members of both
+        sets. The larger set is copied and the smaller one is added to
+        it. """
+
+        large, small = (self, other) if self.get_size() >= other.get_size() else (other, self)
+        answer = self._empty(large.get_size() + small.get_size())
+        for key in large:
+            answer._map.put(key, PRESENT)
+        for key in small:
+            answer._map.put(key, PRESENT)
+        answer._grow()
+        return answer
+
+    def intersection(self, other: "HashSet") -> "HashSet":
+
+        """ Intersection method that returns a new set with the members
+        found in both sets. Only the smaller set is iterated, and each of
+        its members is looked up in the larger one. """
+
+        large, small = (self, other) if self.get_size() >= other.get_size() else (other, self)
+        answer = self._empty(small.get_size())
+        for key in small:
+            if large._map.contains_key(key):
+                answer._map.put(key, PRESENT)
+        return answer
+
+    def difference(self, other: "HashSet") -> "HashSet":
+
+        """ Difference method that returns a new set with the members of
+        this set that are not in `other`. When this set is the smaller one
+        it is filtered against `other`; otherwise it is copied and the
+        members of `other` are removed from the copy. """
+
+        if self.get_size() <= other.get_size():
+            answer = self._empty(self.get_size())
+            for key in self:
+                if not other._map.contains_key(key):
+                    answer._map.put(key, PRESENT)
+            return answer
+
+        answer = self._empty(self.get_size())
+        for key in self:
+            answer._map.put(key, PRESENT)
+        for key in other:
+            answer._map.remove(key)
+        return answer
+
+
+class _Values(list):
+    """
+    Value list of a HashMultiMap key holding two values or more. A key with
+    a single value stores that value directly, and the subclass tells the
+    two cases apart even when the values are lists themselves.
+    """
+
+    __slots__ = ()
+
+
+class HashMultiMap:
+    def __init__(self,
+                 capacity: int = 11,
+                 function: callable = hash_function_1,
+                 engine: type = HashMap) -> None:
+        """
+        Initialize an empty multimap stored in a HashMap of class `engine`
+        (the OA or SC HashMap, or either ArenaHashMap) built with the given
+        capacity and hash function
+        A key holding one value stores it in place; the values of a key
+        holding more share one plain list.
+        """
+        self._map = engine(capacity, function)
+        self._size = 0
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for key, values in self._map.iter_items():
+            out += str(key) + ': ' + str(list(values) if type(values) is _Values else [values]) + '\n'
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return number of values across all keys
+        """
+        return self._size
+
+    def key_count(self) -> int:
+        """
+        Return number of distinct keys
+        """
+        return self._map.get_size()
+
+    # ------------------------------------------------------------------ #
+
+    def add(self, key: str, value: object) -> None:
+
+        """ Add method that appends `value` to the values of `key`. The
+        first value is stored in place; a list is only allocated once a
+        key gets its second value. """
+
+        values = self._map.get(key)
+        if type(values) is _Values:
+            values.append(value)
+        elif values is not None or self._map.contains_key(key):
+            self._map.put(key, _Values((values, value)))
+        else:
+            self._map.put(key, value)
+            if self._map.table_load() > 1:
+                self._map.resize_table(self._map.get_capacity() * 2)
+        self._size += 1
+
+    def get_all(self, key: str) -> DynamicArray:
+
+        """ Get all method that returns the values of `key` in insertion
+        order, or an empty DynamicArray if the key is not present. """
+
+        values = self._map.get(key)
+        if type(values) is _Values:
+            return DynamicArray(list(values))
+        if values is None and not self._map.contains_key(key):
+            return DynamicArray()
+        return DynamicArray([values])
+
+    def count(self, key: str) -> int:
+
+        """ Count method that returns the number of values of `key`. """
+
+        values = self._map.get(key)
+        if type(values) is _Values:
+            return len(values)
+        return 1 if values is not None or self._map.contains_key(key) else 0
+
+    def contains_key(self, key: str) -> bool:
+
+        """ Contains key method that returns True if `key` has a value. """
+
+        return self._map.contains_key(key)
+
+    def remove_one(self, key: str, value: object) -> bool:
+
+        """ Remove one method that removes the first occurrence of `value`
+        from the values of `key`. A key left with a single value goes back
+        to storing it in place, and a key left with none is removed.
+        Returns True if a value was removed. """
+
+        values = self._map.get(key)
+        if type(values) is _Values:
+            if value not in values:
+                return False
+            values.remove(value)
+            if len(values) == 1:
+                self._map.put(key, values[0])
+        elif self._map.contains_key(key) and values == value:
+            self._map.remove(key)
+        else:
+            return False
+
+        self._size -= 1
+        return True
+
+    def remove_all(self, key: str) -> int:
+
+        """ Remove all method that removes `key` with all of its values.
+        Returns the number of values removed. """
+
+        removed = self.count(key)
+        if removed:
+            self._map.remove(key)
+            self._size -= removed
+        return removed
+
+    def clear(self) -> None:
+
+        """ Clear method that removes every key. """
+
+        self._map.clear()
+        self._size = 0
+
+    # ------------------------------------------------------------------ #
+
+    def iter_items(self):
+
+        """ Generator that yields one key/value pair per value. """
+
+        for key, values in self._map.iter_items():
+            if type(values) is _Values:
+                for value in values:
+                    yield key, value
+            else:
+                yield key, values
+
+    def get_keys_and_values(self) -> DynamicArray:
+
+        """ Get keys and values method that returns one key/value pair per
+        value. """
+
+        return DynamicArray(list(self.iter_items()))
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    from .hash_map_oa import HashMap as OAHashMap
+
+    print("\nHashSet - set operations example 1")
+    print("----------------------------------")
+    a = HashSet(11, hash_function_1, OAHashMap)
+    b = HashSet(11, hash_function_1, OAHashMap)
+    a.update('str' + str(i) for i in range(100))
+    b.update('str' + str(i) for i in range(90, 95))
+    print(a.union(b).get_size(), a.intersection(b).get_size(),
+          a.difference(b).get_size(), b.difference(a).get_size(), 'str3' in a)
+
+    print("\nHashSet - full probe sequence example 1")
+    print("---------------------------------------")
+    # 11 buckets hold 6 keys before resizing, and a quadratic probe only
+    # reaches 6 distinct buckets: fill those of 'miss' so its lookup never
+    # meets an empty one and has to stop on its own
+    from .hash_map_oa import ArenaHashMap
+    probe = {(hash_function_1('miss') + j * j) % 11 for j in range(11)}
+    fill = {}
+    for i in range(1000):
+        fill.setdefault(hash_function_1('str' + str(i)) % 11, 'str' + str(i))
+    for engine in (OAHashMap, ArenaHashMap):
+        s = HashSet(11, hash_function_1, engine)
+        s.update(fill[index] for index in probe)
+        print(engine.__name__, s.get_size(), s.get_capacity(), 'miss' in s)
+    m = OAHashMap(11, hash_function_1)
+    for index in probe:
+        m.put(fill[index], index)
+    print(m.get('miss'), m.get_many(['miss', fill[min(probe)]]))
+
+    print("\nHashMultiMap - add/remove example 1")
+    print("-----------------------------------")
+    m = HashMultiMap()
+    for i in range(20):
+        m.add('str' + str(i % 3), i)
+    m.add('key1', [1, 2])
+    print(m.get_size(), m.key_count(), m.count('str0'), m.get_all('key1'))
+    print(m.remove_one('str0', 3), m.remove_one('str0', 4), m.remove_all('str1'),
+          m.get_size(), m.get_all('str0'))
@@ -0,0 +1,275 @@
+# Description: asyncio facade for the OA & SC HashMaps with cooperative,
+# chunked resizing, async bulk loading and off-loop snapshot files
+
+
+import asyncio
+
+from .core import DynamicArray
+from .hash_map_snapshot import read_pairs, write_pairs
+
+
+class AsyncHashMap:
+    def __init__(self,
+                 hash_map,
+                 chunk_size: int = 4096,
+                 max_load: float = None,
+                 executor=None) -> None:
+        """
+        Initialize an asyncio facade over an OA or SC HashMap
+        Work that is proportional to the capacity of the map is split into
+        slices of `chunk_size` buckets with an await point between slices.
+        `max_load` grows maps that never resize on their own (SC) once
+        their table load goes above it. Snapshot files are read and written
+        on `executor` (the loop's default executor when None).
+        """
+        self._map = hash_map
+        self._chunk_size = chunk_size
+        self._max_load = max_load
+        self._executor = executor
+        self._lock = asyncio.Lock()
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        return str(self._map)
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._map.get_size()
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._map.get_capacity()
+
+    def table_load(self) -> float:
+        """
+        Return table load of map
+        """
+        return self._map.table_load()
+
+    # ------------------------------------------------------------------ #
+
+    async def _resize(self, new_capacity: int) -> None:
+
+        """ Resize helper that runs the map's resize_table_steps generator,
+        yielding to the event loop between every chunk. The lock must be
+        held by the caller. A cancelled resize leaves the map as it was. """
+
+        for _ in self._map.resize_table_steps(new_capacity, self._chunk_size):
+            await asyncio.sleep(0)
+
+    async def _grow_if_needed(self) -> None:
+
+        """ Helper that performs, in chunks, the resize the next put would
+        otherwise perform in one blocking call. """
+
+        new_capacity = self._map.pending_resize()
+        if new_capacity is None and self._max_load is not None:
+            if self._map.table_load() > self._max_load:
+                new_capacity = self._map.get_capacity() * 2
+
+        if new_capacity is not None:
+            await self._resize(new_capacity)
+
+    async def resize_table(self, new_capacity: int) -> None:
+
+        """ Resize table method that resizes the map cooperatively. """
+
+        async with self._lock:
+            await self._resize(new_capacity)
+
+    # ------------------------------------------------------------------ #
+
+    async def put(self, key: str, value: object) -> None:
+
+        """ Put method that adds a key/value pair, resizing in chunks first
+        if the map is due to grow. """
+
+        async with self._lock:
+            await self._grow_if_needed()
+            self._map.put(key, value)
+
+    async def get(self, key: str) -> object:
+
+        """ Get method that returns the value of a given key. """
+
+        async with self._lock:
+            return self._map.get(key)
+
+    async def contains_key(self, key: str) -> bool:
+
+        """ Contains key method that returns True if the key is present. """
+
+        async with self._lock:
+            return self._map.contains_key(key)
+
+    async def remove(self, key: str) -> None:
+
+        """ Remove method that removes a key/value pair. """
+
+        async with self._lock:
+            self._map.remove(key)
+
+    async def clear(self) -> None:
+
+        """ Clear method that clears the map. """
+
+        async with self._lock:
+            self._map.clear()
+
+    async def get_keys_and_values(self) -> DynamicArray:
+
+        """ Get keys and values method that collects the key/value pairs of
+        the map in chunks. """
+
+        async with self._lock:
+            return await self._collect()
+
+    async def _collect(self) -> DynamicArray:
+
+        """ Helper that walks the map's iter_items generator, yielding to
+        the event loop every chunk. The lock must be held by the caller. """
+
+        answer = DynamicArray()
+        for pair in self._map.iter_items():
+            answer.append(pair)
+            if answer.length() % self._chunk_size == 0:
+                await asyncio.sleep(0)
+        return answer
+
+    # ------------------------------------------------------------------ #
+
+    async def load(self, pairs, count: int = None) -> int:
+
+        """ Load method that puts every key/value pair of an async iterable
+        (or a plain iterable) and returns the number of pairs loaded. When
+        `count` is given, or `pairs` has a length, the map is pre-sized
+        once instead of growing step by step. """
+
+        if count is None and hasattr(pairs, '__len__'):
+            count = len(pairs)
+
+        loaded = 0
+        async with self._lock:
+            if count is not None:
+                await self._presize(count)
+
+            if hasattr(pairs, '__aiter__'):
+                async for key, value in pairs:
+                    await self._grow_if_needed()
+                    self._map.put(key, value)
+                    loaded += 1
+                    if loaded % self._chunk_size == 0:
+                        await asyncio.sleep(0)
+            else:
+                for key, value in pairs:
+                    await self._grow_if_needed()
+                    self._map.put(key, value)
+                    loaded += 1
+                    if loaded % self._chunk_size == 0:
+                        await asyncio.sleep(0)
+
+        return loaded
+
+    async def _presize(self, count: int) -> None:
+
+        """ Helper that grows the map once, in chunks, for `count` more
+        keys, mirroring hash_map_snapshot.presize. """
+
+        needed = (self._map.get_size() + count) * 2 + 1
+        if needed > self._map.get_capacity():
+            await self._resize(needed)
+
+    # ------------------------------------------------------------------ #
+
+    async def save_snapshot(self, path: str) -> None:
+
+        """ Save snapshot method that collects the pairs of the map on the
+        event loop in chunks and writes the file on the executor. """
+
+        async with self._lock:
+            pairs = await self._collect()
+
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, write_pairs, pairs, path)
+
+    async def load_snapshot(self, path: str) -> int:
+
+        """ Load snapshot method that reads the file on the executor and
+        bulk loads its pairs into the map. Returns the number of pairs. """
+
+        loop = asyncio.get_running_loop()
+        pairs = await loop.run_in_executor(self._executor, read_pairs, path)
+        return await self.load(_pairs_of(pairs), pairs.length())
+
+
+def _pairs_of(pairs: DynamicArray):
+    """Yield the elements of a DynamicArray, which is not iterable itself."""
+    for i in range(pairs.length()):
+        yield pairs[i]
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    import os
+    import tempfile
+    import time
+
+    from .core import hash_function_2
+    from .hash_map_oa import HashMap
+    from .hash_map_sc import HashMap as SCHashMap
+
+    async def ticker(gaps: list, stop: asyncio.Event) -> None:
+        last = time.perf_counter()
+        while not stop.is_set():
+            await asyncio.sleep(0)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    async def keys(n: int):
+        for i in range(n):
+            yield 'str' + str(i), i
+            if i % 1000 == 0:
+                await asyncio.sleep(0)
+
+    async def main() -> None:
+        print("\nAsync - bulk load example 1")
+        print("---------------------------")
+        m = AsyncHashMap(HashMap(53, hash_function_2), chunk_size=512)
+        gaps, stop = [], asyncio.Event()
+        tick = asyncio.create_task(ticker(gaps, stop))
+        print(await m.load(keys(20000)), m.get_size(), m.get_capacity())
+        stop.set()
+        await tick
+        print("longest event loop stall (ms):", round(max(gaps) * 1000, 2))
+
+        path = os.path.join(tempfile.mkdtemp(), 'map.snap')
+        await m.save_snapshot(path)
+        n = AsyncHashMap(HashMap(53, hash_function_2))
+        print(await n.load_snapshot(path), n.get_size(),
+              await n.get('str19999'), await n.contains_key('str20000'))
+
+        print("\nAsync - cancelled resize example 1")
+        print("----------------------------------")
+        for engine in (HashMap, SCHashMap):
+            m = AsyncHashMap(engine(20011, hash_function_2), chunk_size=64)
+            await m.load(keys(5000))
+            capacity = m.get_capacity()
+            resize = asyncio.create_task(m.resize_table(200003))
+            for _ in range(10):
+                await asyncio.sleep(0)
+            resize.cancel()
+            await asyncio.wait([resize])
+            values = [await m.get('str' + str(i)) for i in range(5000)]
+            print(engine.__module__, resize.cancelled(), m.get_size(),
+                  m.get_capacity() == capacity, values == list(range(5000)))
+
+    asyncio.run(main())
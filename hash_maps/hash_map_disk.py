@@ -0,0 +1,520 @@
+# Description: Disk resident Hash Map keeping fixed-size bucket pages in a
+# memory-mapped file, grown one bucket at a time with linear hashing
+
+
+import mmap
+import os
+import pickle
+import struct
+from array import array
+from collections import OrderedDict
+
+from .core import DynamicArray, hash_function_3
+
+
+MAGIC = b'HMDISK01'
+
+# magic, page size, initial buckets, level, split pointer, size,
+# allocated pages, directory page, directory length, free list length
+FILE_HEADER = struct.Struct('<8sIIIIQQQQQ')
+
+# next overflow page (0 for none), record count
+PAGE_HEADER = struct.Struct('<qH')
+
+# key length, value length
+RECORD_HEADER = struct.Struct('<HI')
+
+
+class Page:
+    """
+    Decoded bucket page held by the page cache
+    """
+
+    __slots__ = ('number', 'next', 'records', 'used', 'dirty')
+
+    def __init__(self, number: int, next: int = 0, records: list = None) -> None:
+        """Initialize a page given its number and its records."""
+        self.number = number
+        self.next = next
+        self.records = records if records is not None else []
+        self.used = sum(RECORD_HEADER.size + len(key) + len(value)
+                        for key, value in self.records)
+        self.dirty = False
+
+    def encode(self, page_size: int) -> bytes:
+        """Return the on-disk bytes of the page."""
+        out = bytearray(PAGE_HEADER.pack(self.next, len(self.records)))
+        for key, value in self.records:
+            out += RECORD_HEADER.pack(len(key), len(value)) + key + value
+        out += bytes(page_size - len(out))
+        return bytes(out)
+
+    @staticmethod
+    def decode(number: int, data: bytes) -> "Page":
+        """Build a page from its on-disk bytes."""
+        next, count = PAGE_HEADER.unpack_from(data, 0)
+        offset = PAGE_HEADER.size
+        records = []
+        for _ in range(count):
+            key_length, value_length = RECORD_HEADER.unpack_from(data, offset)
+            offset += RECORD_HEADER.size
+            key = data[offset:offset + key_length]
+            offset += key_length
+            records.append([key, data[offset:offset + value_length]])
+            offset += value_length
+        return Page(number, next, records)
+
+
+class HashMap:
+    def __init__(self,
+                 path: str,
+                 function: callable = hash_function_3,
+                 page_size: int = 4096,
+                 initial_buckets: int = 16,
+                 cache_pages: int = 1024,
+                 bucket_load: int = 32) -> None:
+        """
+        Initialize a disk resident HashMap stored in `path`, reopening the
+        file if it already exists. The hash function must give the same
+        hash in every process, so Python's built-in hash() cannot be used.
+        At most `cache_pages` decoded pages are kept in memory, and a bucket
+        is split whenever the map holds more than `bucket_load` keys per
+        bucket on average.
+        """
+        self._path = path
+        self._hash_function = function
+        self._cache_pages = max(cache_pages, 4)
+        self._bucket_load = bucket_load
+        self._cache = OrderedDict()
+
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        self._file = open(path, 'r+b' if exists else 'w+b')
+
+        if exists:
+            self._open()
+        else:
+            self._page_size = page_size
+            self._format(initial_buckets)
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i in range(len(self._directory)):
+            pairs = [(key.decode('utf-8'), pickle.loads(value))
+                     for page in self._chain(i) for key, value in page.records]
+            out += str(i) + ': ' + str(pairs) + '\n'
+        return out
+
+    # ------------------------------------------------------------------ #
+
+    def _format(self, initial_buckets: int) -> None:
+
+        """ Format helper that lays out an empty map with one primary page
+        per initial bucket. """
+
+        self._initial = initial_buckets
+        self._level = 0
+        self._split = 0
+        self._size = 0
+        self._pages = 1
+        self._directory_page = 0
+        self._directory_pages = 0
+        self._directory = array('q')
+        self._free = array('q')
+        self._file.truncate(self._page_size * (initial_buckets + 1))
+        self._map = mmap.mmap(self._file.fileno(), 0)
+
+        for _ in range(initial_buckets):
+            self._directory.append(self._new_page())
+        self.flush()
+
+    def _open(self) -> None:
+
+        """ Open helper that reads the file header and bucket directory of
+        an existing map. """
+
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        (magic, self._page_size, self._initial, self._level, self._split,
+         self._size, self._pages, self._directory_page, directory_length,
+         free_length) = FILE_HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(self._path + ' is not a disk HashMap')
+
+        start = self._directory_page * self._page_size
+        end = start + (directory_length + free_length) * 8
+        entries = array('q', self._map[start:end])
+        self._directory = entries[:directory_length]
+        self._free = entries[directory_length:]
+        self._directory_pages = -(-(end - start) // self._page_size)
+
+    def _ensure_file(self, pages: int) -> None:
+
+        """ Helper that grows the file, doubling it, so `pages` pages fit,
+        and maps it again. """
+
+        needed = pages * self._page_size
+        if needed <= len(self._map):
+            return
+
+        size = max(needed, len(self._map) * 2)
+        self._map.close()
+        self._file.truncate(size)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+
+    def _new_page(self) -> int:
+
+        """ Helper that returns the number of an empty page, reusing freed
+        pages first. The page is placed in the cache as a dirty page. """
+
+        if len(self._free) > 0:
+            number = self._free.pop()
+        else:
+            number = self._pages
+            self._pages += 1
+            self._ensure_file(self._pages)
+
+        page = Page(number)
+        page.dirty = True
+        self._cache_put(page)
+        return number
+
+    # ------------------------------------------------------------------ #
+
+    def _read_page(self, number: int) -> Page:
+
+        """ Helper that returns a page from the cache, decoding it from the
+        mapped file on a miss. """
+
+        page = self._cache.get(number)
+        if page is not None:
+            self._cache.move_to_end(number)
+            return page
+
+        offset = number * self._page_size
+        page = Page.decode(number, self._map[offset:offset + self._page_size])
+        self._cache_put(page)
+        return page
+
+    def _cache_put(self, page: Page) -> None:
+
+        """ Helper that adds a page to the cache. When the cache is full,
+        the least recently used quarter is evicted in one batch and its
+        dirty pages are written back in page order. """
+
+        self._cache[page.number] = page
+        if len(self._cache) <= self._cache_pages:
+            return
+
+        evicted = []
+        for _ in range(max(self._cache_pages // 4, 1)):
+            evicted.append(self._cache.popitem(last=False)[1])
+        self._write_pages(evicted)
+
+    def _write_pages(self, pages: list) -> None:
+
+        """ Helper that writes the dirty pages of a list back to the mapped
+        file, sorted by page number so the writes are sequential. """
+
+        for page in sorted(pages, key=lambda page: page.number):
+            if page.dirty:
+                offset = page.number * self._page_size
+                self._map[offset:offset + self._page_size] = page.encode(self._page_size)
+                page.dirty = False
+
+    def _dirty(self, page: Page) -> None:
+
+        """ Helper that marks a page as modified, putting it back in the
+        cache if it was evicted while the caller still held it. """
+
+        page.dirty = True
+        if page.number not in self._cache:
+            self._cache_put(page)
+
+    def flush(self) -> None:
+
+        """ Flush method that writes every dirty page, the bucket directory
+        and the file header, then flushes the mapping to disk. """
+
+        self._write_pages(list(self._cache.values()))
+
+        entries = (self._directory + self._free).tobytes()
+        pages = max(-(-len(entries) // self._page_size), 1)
+        if pages > self._directory_pages:
+            # the old directory pages are abandoned, the region doubles
+            self._directory_pages = pages * 2
+            self._directory_page = self._pages
+            self._pages += self._directory_pages
+            self._ensure_file(self._pages)
+
+        start = self._directory_page * self._page_size
+        self._map[start:start + len(entries)] = entries
+        self._map[0:FILE_HEADER.size] = FILE_HEADER.pack(
+            MAGIC, self._page_size, self._initial, self._level, self._split,
+            self._size, self._pages, self._directory_page,
+            len(self._directory), len(self._free))
+        self._map.flush()
+
+    def close(self) -> None:
+
+        """ Close method that flushes the map and closes the file. """
+
+        self.flush()
+        self._map.close()
+        self._file.close()
+
+    # ------------------------------------------------------------------ #
+
+    def _bucket(self, key: bytes) -> int:
+
+        """ Helper that returns the linear hashing bucket of a key. Buckets
+        before the split pointer have already been split this round and use
+        the next level's modulus. """
+
+        hash = self._hash_function(key.decode('utf-8'))
+        buckets = self._initial << self._level
+        index = hash % buckets
+        if index < self._split:
+            index = hash % (buckets * 2)
+        return index
+
+    def _chain(self, bucket: int):
+
+        """ Generator that yields the primary page of a bucket followed by
+        its overflow pages. """
+
+        number = self._directory[bucket]
+        while number:
+            page = self._read_page(number)
+            yield page
+            number = page.next
+
+    def _find(self, key: bytes) -> tuple:
+
+        """ Helper that returns the (page, record index) holding a key, or
+        (None, None) if the key is not in the map. """
+
+        for page in self._chain(self._bucket(key)):
+            records = page.records
+            for i in range(len(records)):
+                if records[i][0] == key:
+                    return page, i
+        return None, None
+
+    def _insert(self, bucket: int, key: bytes, value: bytes) -> None:
+
+        """ Helper that appends a record to the first page of a bucket with
+        room for it, adding an overflow page if every page is full. """
+
+        needed = RECORD_HEADER.size + len(key) + len(value)
+        room = self._page_size - PAGE_HEADER.size
+        if needed > room:
+            raise ValueError('record of ' + str(needed) +
+                             ' bytes does not fit in a page')
+
+        last = None
+        for page in self._chain(bucket):
+            if page.used + needed <= room:
+                break
+            last = page
+        else:
+            page = self._read_page(self._new_page())
+            last.next = page.number
+            self._dirty(last)
+
+        page.records.append([key, value])
+        page.used += needed
+        self._dirty(page)
+
+    # ------------------------------------------------------------------ #
+
+    def put(self, key: str, value: object) -> None:
+
+        """ Put method that adds a key/value pair to the key's bucket,
+        replacing the value of an existing key. Once the average number of
+        keys per bucket goes above the bucket load, the bucket under the
+        split pointer is split. """
+
+        key_bytes = key.encode('utf-8')
+        value_bytes = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+        page, i = self._find(key_bytes)
+        if page is not None:
+            old = page.records[i][1]
+            if page.used - len(old) + len(value_bytes) <= self._page_size - PAGE_HEADER.size:
+                page.records[i][1] = value_bytes
+                page.used += len(value_bytes) - len(old)
+                self._dirty(page)
+                return
+            del page.records[i]
+            page.used -= RECORD_HEADER.size + len(key_bytes) + len(old)
+            self._dirty(page)
+            self._size -= 1
+
+        self._insert(self._bucket(key_bytes), key_bytes, value_bytes)
+        self._size += 1
+
+        if self._size > self._bucket_load * len(self._directory):
+            self._split_bucket()
+
+    def _split_bucket(self) -> None:
+
+        """ Helper that splits the bucket under the split pointer into
+        itself and a new bucket at the end of the directory, then advances
+        the split pointer, starting a new level once every bucket of the
+        current level has been split. """
+
+        bucket = self._split
+        records = []
+        pages = list(self._chain(bucket))
+        for page in pages:
+            records.extend(page.records)
+
+        # keep the primary page, release the overflow pages
+        primary = pages[0]
+        primary.records = []
+        primary.used = 0
+        primary.next = 0
+        self._dirty(primary)
+        for page in pages[1:]:
+            self._cache.pop(page.number, None)
+            self._free.append(page.number)
+
+        self._directory.append(self._new_page())
+        self._split += 1
+        if self._split == self._initial << self._level:
+            self._level += 1
+            self._split = 0
+
+        for key, value in records:
+            self._insert(self._bucket(key), key, value)
+
+    def get(self, key: str) -> object:
+
+        """ Get method that returns the value of a given key, or None. """
+
+        page, i = self._find(key.encode('utf-8'))
+        if page is None:
+            return None
+        return pickle.loads(page.records[i][1])
+
+    def contains_key(self, key: str) -> bool:
+
+        """ Contains key method that returns True if the key is present. """
+
+        return self._find(key.encode('utf-8'))[0] is not None
+
+    def remove(self, key: str) -> None:
+
+        """ Remove method that removes a key/value pair. Nothing happens if
+        the key is not in the map. """
+
+        key_bytes = key.encode('utf-8')
+        page, i = self._find(key_bytes)
+        if page is None:
+            return
+
+        page.used -= RECORD_HEADER.size + len(key_bytes) + len(page.records[i][1])
+        del page.records[i]
+        self._dirty(page)
+        self._size -= 1
+
+    def clear(self) -> None:
+
+        """ Clear method that empties the map and shrinks the file back to
+        its initial buckets. """
+
+        self._cache.clear()
+        self._map.close()
+        self._file.truncate(0)
+        self._format(self._initial)
+
+    # ------------------------------------------------------------------ #
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return number of buckets of map
+        """
+        return len(self._directory)
+
+    def table_load(self) -> float:
+
+        """ Table load method that returns the average # of keys per
+        bucket. """
+
+        return self._size / len(self._directory)
+
+    def empty_buckets(self) -> int:
+
+        """ Empty buckets method that returns the # of buckets without any
+        keys. """
+
+        empty = 0
+        for bucket in range(len(self._directory)):
+            if all(len(page.records) == 0 for page in self._chain(bucket)):
+                empty += 1
+        return empty
+
+    def resize_table(self, new_capacity: int) -> None:
+
+        """ Resize table method that splits buckets one at a time until the
+        map has at least `new_capacity` buckets. Linear hashing never
+        shrinks, so smaller capacities are ignored. """
+
+        while len(self._directory) < new_capacity:
+            self._split_bucket()
+
+    def iter_items(self):
+
+        """ Generator that yields the key/value pairs of the map bucket by
+        bucket. """
+
+        for bucket in range(len(self._directory)):
+            for page in self._chain(bucket):
+                for key, value in list(page.records):
+                    yield key.decode('utf-8'), pickle.loads(value)
+
+    def get_keys_and_values(self) -> DynamicArray:
+
+        """ Get keys and values method that returns the key/value pairs of
+        the map. """
+
+        answer = DynamicArray()
+        for pair in self.iter_items():
+            answer.append(pair)
+        return answer
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    import tempfile
+
+    path = os.path.join(tempfile.mkdtemp(), 'map.db')
+
+    print("\nDisk - put example 1")
+    print("--------------------")
+    m = HashMap(path, cache_pages=64)
+    for i in range(20000):
+        m.put('str' + str(i), i * 100)
+        if i % 5000 == 4999:
+            print(m.get_size(), m.get_capacity(), round(m.table_load(), 2))
+    m.remove('str1')
+    m.close()
+
+    print("\nDisk - reopen example 1")
+    print("-----------------------")
+    m = HashMap(path)
+    print(m.get_size(), m.get_capacity(), m.get('str19999'),
+          m.get('str1'), m.contains_key('str2'))
+    m.clear()
+    print(m.get_size(), m.get_capacity(), m.get('str2'))
+    m.close()
@@ -0,0 +1,380 @@
+# Description: Read-only Hash Map built with a minimal perfect hash (CHD,
+# compress hash and displace) from the pairs of an OA or SC HashMap
+
+
+import pickle
+import struct
+from array import array
+from hashlib import blake2b
+
+from .core import DynamicArray
+
+
+MAGIC = b'HMFROZ01'
+
+# magic, number of keys, number of displacement buckets, hash seed
+FILE_HEADER = struct.Struct('<8sQQQ')
+
+# number of d1 values tried for every d0 while placing a bucket, and of
+# d0 values tried before the build starts over with a new seed
+D1_RANGE = 64
+D0_RANGE = 64
+
+# seeds tried before giving up; every SEEDS_PER_GROWTH failed seeds the
+# number of displacement buckets doubles, so buckets get smaller
+MAX_SEEDS = 256
+SEEDS_PER_GROWTH = 4
+
+
+def _hashes(key_bytes: bytes, seed: int = 0) -> tuple:
+    """
+    Return the bucket hash and the two slot hashes of a key. All three come
+    from one 128-bit digest salted with `seed`, so they are stable across
+    processes and can be saved with the map.
+    """
+    salt = seed.to_bytes(16, 'little')
+    digest = int.from_bytes(blake2b(key_bytes, digest_size=16, salt=salt).digest(), 'little')
+    return (digest & 0xFFFFFFFFFFFFFFFF,
+            (digest >> 64) & 0xFFFFFFFF,
+            digest >> 96)
+
+
+class BlobSequence:
+    """
+    Read-only sequence over variable length items packed one after the
+    other in a buffer (bytes or an mmap), found through an offset array
+    """
+
+    def __init__(self, buffer, offsets, decode: callable) -> None:
+        """Initialize the sequence given its buffer, offsets and decoder."""
+        self._buffer = buffer
+        self._offsets = offsets
+        self._decode = decode
+
+    def __getitem__(self, index: int):
+        """Decode and return the item at a given index."""
+        return self._decode(self._buffer[self._offsets[index]:self._offsets[index + 1]])
+
+    def __len__(self) -> int:
+        """Return the number of items."""
+        return len(self._offsets) - 1
+
+
+class FrozenHashMap:
+    def __init__(self, pairs: DynamicArray, bucket_size: int = 3) -> None:
+        """
+        Build a read-only map from a DynamicArray of key/value pairs
+        Keys are grouped into displacement buckets of `bucket_size` keys on
+        average. Buckets are placed largest first: for each one a
+        displacement (d0, d1) is searched so that every key of the bucket
+        lands on a free slot at (f1 + d0 * f2 + d1) % n. Every slot ends up
+        holding exactly one key, so a lookup is always a single probe.
+        When some bucket cannot be placed (two of its keys share f1 and f2
+        modulo n, or no displacement reaches the free slots), the build
+        starts over with the next hash seed, and with more buckets after
+        every few seeds. The seed is saved with the map.
+        """
+        self._size = pairs.length()
+        self._bucket_count = max(-(-self._size // bucket_size), 1)
+        self._seed = 0
+        self._displacements = array('Q', bytes(8 * self._bucket_count))
+        self._keys = [None] * self._size
+        self._values = [None] * self._size
+        if self._size == 0:
+            return
+
+        for seed in range(MAX_SEEDS):
+            if seed and seed % SEEDS_PER_GROWTH == 0:
+                self._bucket_count = min(self._bucket_count * 2, self._size)
+            self._seed = seed
+            self._displacements = array('Q', bytes(8 * self._bucket_count))
+            self._keys = [None] * self._size
+            self._values = [None] * self._size
+            if self._build(pairs):
+                return
+        raise ValueError('no perfect hash found for ' + str(self._size) + ' keys')
+
+    def _build(self, pairs: DynamicArray) -> bool:
+
+        """ Build helper that computes the displacement of every bucket and
+        stores every pair in its slot. Returns False if some bucket could
+        not be placed with the current seed. """
+
+        n = self._size
+        buckets = [[] for _ in range(self._bucket_count)]
+        for i in range(n):
+            key, value = pairs[i]
+            bucket_hash, f1, f2 = _hashes(key.encode('utf-8'), self._seed)
+            buckets[bucket_hash % self._bucket_count].append((f1, f2, key, value))
+
+        order = sorted(range(self._bucket_count), key=lambda b: -len(buckets[b]))
+        taken = bytearray(n)
+        free = []
+
+        for b in order:
+            members = buckets[b]
+            if not members:
+                break
+
+            if len(members) == 1:
+                # single keys take any free slot directly with d0 = 0
+                if not free:
+                    free = [slot for slot in range(n) if not taken[slot]]
+                slot = free.pop()
+                while taken[slot]:
+                    slot = free.pop()
+                f1, f2, key, value = members[0]
+                d0, d1 = 0, (slot - f1) % n
+                slots = [slot]
+            else:
+                placement = self._displace(members, taken, n)
+                if placement is None:
+                    return False
+                d0, d1, slots = placement
+
+            self._displacements[b] = d0 * n + d1
+            for slot, (_, _, key, value) in zip(slots, members):
+                taken[slot] = 1
+                self._keys[slot] = key
+                self._values[slot] = value
+
+        return True
+
+    @staticmethod
+    def _displace(members: list, taken: bytearray, n: int) -> tuple:
+
+        """ Displace helper that searches the first (d0, d1) that sends all
+        keys of a bucket to distinct free slots, trying D0_RANGE values of
+        d0. Returns None if there is none. """
+
+        for d0 in range(min(D0_RANGE, n)):
+            bases = [(f1 + d0 * f2) % n for f1, f2, _, _ in members]
+            for d1 in range(min(D1_RANGE, n)):
+                slots = []
+                for base in bases:
+                    slot = (base + d1) % n
+                    if taken[slot] or slot in slots:
+                        break
+                    slots.append(slot)
+                else:
+                    return d0, d1, slots
+        return None
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i in range(self._size):
+            out += str(i) + ': (' + str(self._keys[i]) + ': ' + str(self._values[i]) + ')\n'
+        return out
+
+    # ------------------------------------------------------------------ #
+
+    def _slot(self, key: str) -> int:
+
+        """ Helper that returns the only slot a key can be in. """
+
+        bucket_hash, f1, f2 = _hashes(key.encode('utf-8'), self._seed)
+        d = self._displacements[bucket_hash % self._bucket_count]
+        return (f1 + (d // self._size) * f2 + d % self._size) % self._size
+
+    def get(self, key: str) -> object:
+
+        """ Get method that returns the value of a given key, or None if the
+        key is not in the map. """
+
+        if self._size == 0:
+            return None
+        slot = self._slot(key)
+        if self._keys[slot] == key:
+            return self._values[slot]
+        return None
+
+    def contains_key(self, key: str) -> bool:
+
+        """ Contains key method that returns True if the key is present. """
+
+        return self._size > 0 and self._keys[self._slot(key)] == key
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map, which is always its size
+        """
+        return self._size
+
+    def table_load(self) -> float:
+        """
+        Return table load of map, which is always 1
+        """
+        return 1.0
+
+    def empty_buckets(self) -> int:
+        """
+        Return # of empty buckets, which is always 0
+        """
+        return 0
+
+    def iter_items(self):
+
+        """ Generator that yields the key/value pairs of the map. """
+
+        for i in range(self._size):
+            yield self._keys[i], self._values[i]
+
+    def get_keys_and_values(self) -> DynamicArray:
+
+        """ Get keys and values method that returns the key/value pairs of
+        the map. """
+
+        return DynamicArray(list(self.iter_items()))
+
+    # ------------------------------------------------------------------ #
+
+    def save(self, path: str) -> None:
+
+        """ Save method that writes the map in its compact layout: header,
+        displacements, key offsets, value offsets, then the UTF-8 keys and
+        pickled values packed back to back. Every section but the last two
+        is made of 8-byte integers, so it can be used in place from an
+        mmap. """
+
+        keys = [self._keys[i].encode('utf-8') for i in range(self._size)]
+        values = [pickle.dumps(self._values[i], protocol=pickle.HIGHEST_PROTOCOL)
+                  for i in range(self._size)]
+
+        position = FILE_HEADER.size + 8 * self._bucket_count + 16 * (self._size + 1)
+        key_offsets = array('Q', [position])
+        for key in keys:
+            position += len(key)
+            key_offsets.append(position)
+        value_offsets = array('Q', [position])
+        for value in values:
+            position += len(value)
+            value_offsets.append(position)
+
+        with open(path, 'wb') as file:
+            file.write(FILE_HEADER.pack(MAGIC, self._size, self._bucket_count, self._seed))
+            file.write(self._displacements.tobytes())
+            file.write(key_offsets.tobytes())
+            file.write(value_offsets.tobytes())
+            file.write(b''.join(keys))
+            file.write(b''.join(values))
+
+    @classmethod
+    def load(cls, path: str) -> "FrozenHashMap":
+
+        """ Load method that maps a file written by save into memory. The
+        displacements and offsets are used in place, and keys and values
+        are only decoded when a lookup reaches their slot. """
+
+        import mmap
+
+        with open(path, 'rb') as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, size, bucket_count, seed = FILE_HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError(path + ' is not a frozen HashMap')
+
+        view = memoryview(buffer)
+        offset = FILE_HEADER.size
+        displacements = view[offset:offset + 8 * bucket_count].cast('Q')
+        offset += 8 * bucket_count
+        key_offsets = view[offset:offset + 8 * (size + 1)].cast('Q')
+        offset += 8 * (size + 1)
+        value_offsets = view[offset:offset + 8 * (size + 1)].cast('Q')
+
+        frozen = cls.__new__(cls)
+        frozen._size = size
+        frozen._bucket_count = bucket_count
+        frozen._seed = seed
+        frozen._displacements = displacements
+        frozen._keys = BlobSequence(buffer, key_offsets, lambda data: data.decode('utf-8'))
+        frozen._values = BlobSequence(buffer, value_offsets, pickle.loads)
+        return frozen
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    import os
+    import random
+    import tempfile
+    import time
+    import tracemalloc
+
+    from .core import hash_function_3
+    from .hash_map_oa import HashMap as OAHashMap
+    from .hash_map_sc import HashMap as SCHashMap
+
+    n = 50000
+    keys = ['str' + str(i) for i in range(n)]
+    misses = ['key' + str(i) for i in range(n)]
+
+    def build(factory):
+        tracemalloc.start()
+        structure = factory()
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        return structure, memory
+
+    def fill(m):
+        for i in range(n):
+            m.put(keys[i], i)
+        return m
+
+    oa, oa_memory = build(lambda: fill(OAHashMap(n, hash_function_3)))
+    sc, sc_memory = build(lambda: fill(SCHashMap(n, hash_function_3)))
+    frozen, frozen_memory = build(oa.freeze)
+
+    path = os.path.join(tempfile.mkdtemp(), 'map.frozen')
+    frozen.save(path)
+    mapped = FrozenHashMap.load(path)
+
+    print("\nFrozen - correctness")
+    print("--------------------")
+    print(all(frozen.get(key) == i for i, key in enumerate(keys)),
+          all(mapped.get(key) == i for i, key in enumerate(keys)),
+          any(frozen.contains_key(key) for key in misses),
+          frozen.get_size(), frozen.empty_buckets())
+
+    # frozen shares its key and value objects with the map it was frozen
+    # from, so only its own arrays are traced; frozen mmap reports the size
+    # of the saved file instead
+    print("\nFrozen - many small maps")
+    print("-------------------------")
+    small_path = os.path.join(tempfile.mkdtemp(), 'small.frozen')
+    frozen_ok = 0
+    for trial in range(500):
+        m = OAHashMap(11, hash_function_3)
+        for _ in range(random.randint(1, 25)):
+            m.put('k' + str(random.randrange(100000)), trial)
+        small = m.freeze()
+        small.save(small_path)
+        reloaded = FrozenHashMap.load(small_path)
+        frozen_ok += all(small.get(key) == value and reloaded.get(key) == value
+                         for key, value in m.iter_items())
+    print(frozen_ok, 'of 500')
+
+    print("\nFrozen - hits/s, misses/s and bytes per key")
+    print("-------------------------------------------")
+    for name, m, memory in (('oa', oa, oa_memory), ('sc', sc, sc_memory),
+                            ('frozen', frozen, frozen_memory),
+                            ('frozen mmap', mapped, os.path.getsize(path))):
+        start = time.perf_counter()
+        for key in keys:
+            m.get(key)
+        hits = n / (time.perf_counter() - start)
+        start = time.perf_counter()
+        for key in misses:
+            m.get(key)
+        miss = n / (time.perf_counter() - start)
+        print(name, int(hits), int(miss), round(memory / n, 1))
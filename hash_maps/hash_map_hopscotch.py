@@ -0,0 +1,350 @@
+# Description: Hopscotch hashing engine with the OA & SC HashMap API: every
+# key lives within HOP_RANGE buckets of its home bucket, so lookups stay
+# short and contiguous up to a 0.9 load
+
+
+from array import array
+
+from .core import DynamicArray, is_prime, next_prime
+
+
+# size of the neighborhood of a bucket, and of its hop bitmap
+HOP_RANGE = 32
+
+MAX_LOAD = 0.9
+
+HASH_MASK = 0xFFFFFFFFFFFFFFFF
+
+
+class HopscotchHashMap:
+    def __init__(self, capacity: int, function) -> None:
+        """
+        Initialize new HashMap that uses hopscotch hashing for collision
+        resolution
+        Bit i of the hop bitmap of a bucket is set when the key stored i
+        buckets after it has that bucket as its home, so a lookup only
+        reads the buckets named by one bitmap. The hash of every key is
+        cached, which lets keys hop and the table resize without calling
+        the hash function again. Keys that cannot be placed in their
+        neighborhood even after the table grows (more than HOP_RANGE keys
+        sharing a home bucket) are kept in an overflow dict.
+        """
+        self._capacity = next_prime(capacity)
+        self._keys = [None] * self._capacity
+        self._values = [None] * self._capacity
+        self._hashes = array('Q', [0]) * self._capacity
+        self._hops = array('L', [0]) * self._capacity
+        # keys that did not fit in their neighborhood: key -> (value, hash)
+        self._overflow = {}
+
+        self._hash_function = function
+        self._size = 0
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i in range(self._capacity):
+            key = self._keys[i]
+            entry = None if key is None else (key, self._values[i])
+            out += str(i) + ': ' + str(entry) + '\n'
+        for key, (value, _) in self._overflow.items():
+            out += 'overflow: ' + str((key, value)) + '\n'
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    # ------------------------------------------------------------------ #
+
+    def _find_index(self, key: str, hash: int) -> int:
+
+        """ Find index helper that returns the bucket holding a key, or
+        None. Only the buckets set in the hop bitmap of the key's home
+        bucket are read, lowest offset first. """
+
+        capacity = self._capacity
+        home = hash % capacity
+        keys = self._keys
+        bits = self._hops[home]
+        while bits:
+            low = bits & -bits
+            index = home + low.bit_length() - 1
+            if index >= capacity:
+                index -= capacity
+            if keys[index] == key:
+                return index
+            bits ^= low
+        return None
+
+    def _hop_into(self, free: int) -> int:
+
+        """ Hop helper that moves a key from one of the HOP_RANGE - 1
+        buckets before an empty bucket into it, without taking that key
+        out of its own neighborhood. Returns the bucket freed that way,
+        closer to the home of the key being added, or None if no key can
+        move. Candidates are tried farthest first, to hop as far as
+        possible. """
+
+        capacity = self._capacity
+        keys, values, hashes, hops = self._keys, self._values, self._hashes, self._hops
+
+        for distance in range(HOP_RANGE - 1, 0, -1):
+            index = free - distance
+            if index < 0:
+                index += capacity
+            home = hashes[index] % capacity
+            offset = index - home
+            if offset < 0:
+                offset += capacity
+            if offset + distance >= HOP_RANGE:
+                continue
+
+            keys[free], values[free], hashes[free] = keys[index], values[index], hashes[index]
+            keys[index] = values[index] = None
+            hops[home] = (hops[home] & ~(1 << offset)) | (1 << (offset + distance))
+            return index
+
+        return None
+
+    def _place(self, key: str, value: object, hash: int) -> bool:
+
+        """ Place helper that stores a key known to be absent. The nearest
+        empty bucket after the home bucket is found with a linear scan,
+        then hopped back until it lies within the neighborhood. Returns
+        False if that is not possible; keys hopped on the way stay valid. """
+
+        capacity = self._capacity
+        keys = self._keys
+        home = hash % capacity
+
+        free = home
+        distance = 0
+        while keys[free] is not None:
+            free += 1
+            if free == capacity:
+                free = 0
+            distance += 1
+            if distance == capacity:
+                return False
+
+        while distance >= HOP_RANGE:
+            free = self._hop_into(free)
+            if free is None:
+                return False
+            distance = free - home
+            if distance < 0:
+                distance += capacity
+
+        keys[free] = key
+        self._values[free] = value
+        self._hashes[free] = hash
+        self._hops[home] |= 1 << distance
+        return True
+
+    def put(self, key: str, value: object) -> None:
+
+        """ Put method that adds a key/value pair into the hash map, or
+        replaces the value of an existing key. The table doubles once the
+        load reaches MAX_LOAD, and also when no empty bucket can be brought
+        into the neighborhood of the key while the table is at least half
+        full; otherwise the key goes to the overflow dict. """
+
+        new_capacity = self.pending_resize()
+        if new_capacity is not None:
+            self.resize_table(new_capacity)
+
+        hash = self._hash_function(key) & HASH_MASK
+        index = self._find_index(key, hash)
+        if index is not None:
+            self._values[index] = value
+            return
+        if self._overflow and key in self._overflow:
+            self._overflow[key] = (value, hash)
+            return
+
+        placed = self._place(key, value, hash)
+
+        # a sparse table that cannot take the key will not after growing
+        # either: its neighborhood is full of keys sharing its home bucket
+        if not placed and self.table_load() >= MAX_LOAD / 2:
+            self.resize_table(self._capacity * 2)
+            placed = self._place(key, value, hash)
+        if not placed:
+            self._overflow[key] = (value, hash)
+        self._size += 1
+
+    def get(self, key: str) -> object:
+
+        """ Get method that returns the value of a given key. Returns
+        None if the key is invalid. """
+
+        index = self._find_index(key, self._hash_function(key) & HASH_MASK)
+        if index is not None:
+            return self._values[index]
+        if self._overflow and key in self._overflow:
+            return self._overflow[key][0]
+        return None
+
+    def contains_key(self, key: str) -> bool:
+
+        """ Contains key method that returns True if the key is present. """
+
+        if self._find_index(key, self._hash_function(key) & HASH_MASK) is not None:
+            return True
+        return bool(self._overflow) and key in self._overflow
+
+    def remove(self, key: str) -> None:
+
+        """ Remove method that empties the bucket of a given key and clears
+        its bit in the hop bitmap. No tombstone is needed, since lookups
+        never probe past the bitmap. """
+
+        hash = self._hash_function(key) & HASH_MASK
+        index = self._find_index(key, hash)
+        if index is None:
+            if self._overflow.pop(key, None) is not None:
+                self._size -= 1
+            return
+
+        home = hash % self._capacity
+        offset = index - home
+        if offset < 0:
+            offset += self._capacity
+        self._hops[home] &= ~(1 << offset)
+        self._keys[index] = self._values[index] = None
+        self._size -= 1
+
+    def clear(self) -> None:
+
+        """ Clear method that empties every bucket without changing the
+        capacity. """
+
+        self._keys = [None] * self._capacity
+        self._values = [None] * self._capacity
+        self._hashes = array('Q', [0]) * self._capacity
+        self._hops = array('L', [0]) * self._capacity
+        self._overflow = {}
+        self._size = 0
+
+    # ------------------------------------------------------------------ #
+
+    def empty_buckets(self) -> int:
+
+        """ Empty buckets method that returns the # of empty buckets in the
+        hash table. """
+
+        return self._capacity - self._size + len(self._overflow)
+
+    def table_load(self) -> float:
+
+        """ Table load method that returns the current hash table load
+        factor. """
+
+        return self._size / self._capacity
+
+    def pending_resize(self) -> int:
+
+        """ Pending resize method that returns the capacity the next put will
+        resize the table to, or None if the next put will not resize. A
+        put that finds no room in a neighborhood also resizes, which cannot
+        be known in advance. """
+
+        if self._size + 1 > self._capacity * MAX_LOAD:
+            return self._capacity * 2
+        return None
+
+    def resize_table(self, new_capacity: int) -> None:
+
+        """ Resize table method that rehashes the keys into a table of at
+        least `new_capacity` buckets (rounded up to a prime), using their
+        cached hashes. Keys in the overflow dict get another chance at a
+        bucket, and keys that no longer fit go to it. """
+
+        if new_capacity < self._size:
+            return
+
+        if is_prime(new_capacity) is not True:
+            new_capacity = next_prime(new_capacity)
+
+        old = [(self._keys[i], self._values[i], self._hashes[i])
+               for i in range(self._capacity) if self._keys[i] is not None]
+        old.extend((key, value, hash) for key, (value, hash) in self._overflow.items())
+
+        self._capacity = new_capacity
+        self.clear()
+        for key, value, hash in old:
+            if not self._place(key, value, hash):
+                self._overflow[key] = (value, hash)
+        self._size = len(old)
+
+    # ------------------------------------------------------------------ #
+
+    def iter_items(self):
+
+        """ Generator that yields the key/value pairs of the map. """
+
+        values = self._values
+        for i, key in enumerate(self._keys):
+            if key is not None:
+                yield key, values[i]
+        for key, (value, _) in self._overflow.items():
+            yield key, value
+
+    def get_keys_and_values(self) -> DynamicArray:
+
+        """ Get keys and values method that returns the key/value pairs of
+        the map. """
+
+        return DynamicArray(list(self.iter_items()))
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    import random
+    import time
+
+    from .core import hash_function_3
+    from .hash_map_oa import HashMap
+
+    print("\nHopscotch - put/remove example 1")
+    print("--------------------------------")
+    m = HopscotchHashMap(11, hash_function_3)
+    for i in range(1000):
+        m.put('str' + str(i), i)
+    for i in range(0, 1000, 3):
+        m.remove('str' + str(i))
+    print(m.get_size(), m.get_capacity(), round(m.table_load(), 2),
+          m.get('str1'), m.get('str3'), m.contains_key('str2'))
+
+    print("\nHopscotch - hit and miss latency against OA (ns)")
+    print("------------------------------------------------")
+    n = 200000
+    keys = ['str' + str(i) for i in range(n)]
+    misses = ['miss' + str(i) for i in range(n)]
+    random.shuffle(keys)
+    for name, engine, capacity in (('oa', HashMap, 2 * n), ('hopscotch', HopscotchHashMap, int(n / 0.89))):
+        m = engine(capacity, hash_function_3)
+        for key in keys:
+            m.put(key, True)
+        start = time.perf_counter()
+        for key in keys:
+            m.get(key)
+        hit = time.perf_counter() - start
+        start = time.perf_counter()
+        for key in misses:
+            m.get(key)
+        miss = time.perf_counter() - start
+        print(name, round(m.table_load(), 2), round(hit / n * 1e9), round(miss / n * 1e9))
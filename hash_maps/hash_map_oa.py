@@ -0,0 +1,1424 @@
+# Name: Joseph Shing
+# Description: Hash Map Implementation utilizing a Dynamic Array and HashEntry objects
+
+
+import weakref
+from array import array
+
+from .core import (CountingBloomFilter, DynamicArray, HashEntry, KeyArena,
+                   HashFunctionSelector, SkipList, fibonacci_hash, hash_function_1,
+                   hash_function_2, is_prime, next_prime)
+from .hash_vectorized import as_key_array, hash_many
+
+
+# bucket markers of the ArenaHashMap
+EMPTY = -1
+TOMBSTONE = -2
+
+HASH_MASK = 0xFFFFFFFFFFFFFFFF
+
+# key markers of the IntHashMap; keys equal to them are kept aside
+INT_EMPTY = -(1 << 63)
+INT_DELETED = INT_EMPTY + 1
+
+
+class HashMap:
+    def __init__(self, capacity: int, function) -> None:
+        """
+        Initialize new HashMap that uses
+        quadratic probing for collision resolution
+        """
+        # capacity must be a prime number
+        self._capacity = next_prime(capacity)
+        self._buckets = DynamicArray(size=self._capacity)
+
+        # function='auto' starts with hash_function_1 and lets a
+        # HashFunctionSelector replace it once enough keys were put
+        self._selector = None
+        self._next_hash_function = None
+        self._hash_decision = None
+        if function == 'auto':
+            function = hash_function_1
+            self._selector = HashFunctionSelector()
+
+        self._hash_function = function
+        self._size = 0
+        self._tombstones = 0
+        self._generation = 0
+        self._filter = None
+        self._index = None
+        self._snapshots = weakref.WeakSet()
+        self._hooks = None
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i in range(self._buckets.length()):
+            entry = self._buckets[i]
+            if entry is not None and entry.generation != self._generation:
+                entry = None
+            out += str(i) + ': ' + str(entry) + '\n'
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    def get_stats(self) -> dict:
+        """
+        Return size, capacity, table load, the current hash function and
+        the decision taken by function='auto' (None until one is taken)
+        """
+        return {
+            'size': self._size,
+            'capacity': self._capacity,
+            'table_load': self.table_load(),
+            'hash_function': self._hash_function.__name__,
+            'hash_decision': self._hash_decision,
+        }
+
+    # ------------------------------------------------------------------ #
+    # ------------------------------------------------------------------ #
+    # ------------------------------------------------------------------ #
+
+    def put(self, key: str, value: object) -> None:
+
+        """ Put method that adds a key/value pair into the hash map. The
+        key/value pair is added as a HashEntry object. If the key already
+        exists within the hash table, the value will be replaced. The hash
+        table will auto resize when attempting to add in a node when the load
+        factor is equal to or greater than 0.5. Tombstones found along the
+        probe sequence are recycled for new keys, and the table is compacted
+        in place once live entries plus tombstones fill half the buckets. """
+
+        new_capacity = self.pending_resize()
+        if new_capacity is not None:
+            self.resize_table(new_capacity)
+
+        hash = self._hash_function(key)
+        index = hash % self._capacity
+        initial_index = index
+        first_tombstone = None
+        j = 1
+
+        # quadratic probing until the key or an empty index is found;
+        # entries from before the last clear count as empty
+        buckets = self._buckets
+        generation = self._generation
+        entry = buckets.get_unchecked(index)
+        while entry is not None and entry.generation == generation:
+
+            # if the key is already in the hash table
+            if entry.key == key:
+                if self._snapshots:
+                    self._copy_on_write(index)
+                if entry.is_tombstone is True:
+                    entry.is_tombstone = False
+                    self._tombstones -= 1
+                    self._size += 1
+                    if self._filter is not None:
+                        self._filter_add(key)
+                    if self._index is not None:
+                        self._index.insert(key)
+                entry.value = value
+                return
+
+            if entry.is_tombstone is True and first_tombstone is None:
+                first_tombstone = index
+
+            index = (initial_index + j ** 2) % self._capacity
+            entry = buckets.get_unchecked(index)
+            j += 1
+
+        # reuse the first tombstone passed over, otherwise the empty index
+        if first_tombstone is not None:
+            index = first_tombstone
+            self._tombstones -= 1
+
+        if self._snapshots:
+            self._copy_on_write(index)
+        buckets.set_unchecked(index, HashEntry(key, value, generation))
+        self._size += 1
+        if self._filter is not None:
+            self._filter_add(key)
+        if self._index is not None:
+            self._index.insert(key)
+        if self._selector is not None and self._selector.observe(key):
+            self._choose_hash_function()
+
+    # ------------------------------------------------------------------ #
+
+    def _choose_hash_function(self) -> None:
+
+        """ Helper that lets the selector of a function='auto' map decide
+        on a hash function. A switch is not applied right away: the next
+        put (or the chunked resize of AsyncHashMap) rehashes the table once
+        with the new function, through pending_resize. """
+
+        decision = self._selector.decide(self._hash_function, self._capacity)
+        self._selector = None
+        self._hash_decision = decision
+        if decision['switched']:
+            self._next_hash_function = decision['function']
+
+    # ------------------------------------------------------------------ #
+
+    def _find_index(self, key: str) -> int:
+
+        """ Find index method that follows the quadratic probe sequence of
+        the given key and returns the index of its HashEntry (tombstone or
+        not), or None once an empty index is reached. An entry left over
+        from before the last clear ends the probe like an empty index and
+        is reclaimed on the way. A prime table only has (capacity + 1) / 2
+        distinct indices on a probe sequence, which can all be taken at the
+        0.5 load limit, so the probe also gives up once it wraps around. """
+
+        index = self._hash_function(key) % self._capacity
+        initial_index = index
+        buckets = self._buckets
+        j = 1
+
+        entry = buckets.get_unchecked(index)
+        while entry is not None and j <= self._capacity:
+            if entry.generation != self._generation:
+                buckets.set_unchecked(index, None)
+                return None
+            if entry.key == key:
+                return index
+            index = (initial_index + j ** 2) % self._capacity
+            entry = buckets.get_unchecked(index)
+            j += 1
+
+        return None
+
+    def _probe_length(self, key: str) -> int:
+
+        """ Probe length helper that returns the # of buckets the probe
+        sequence of a key reads before reaching the key or an empty bucket,
+        for the profiling hooks. """
+
+        index = self._hash_function(key) % self._capacity
+        initial_index = index
+        buckets = self._buckets
+        j = 1
+
+        entry = buckets.get_unchecked(index)
+        while (entry is not None and entry.generation == self._generation and
+               entry.key != key and j <= self._capacity):
+            index = (initial_index + j ** 2) % self._capacity
+            entry = buckets.get_unchecked(index)
+            j += 1
+
+        return j
+
+    # ------------------------------------------------------------------ #
+
+    def table_load(self) -> float:
+
+        """ Table load method that returns the table load of the hash table.
+        The table load is the # of elements / # of buckets. """
+
+        load_factor = self._size / self._capacity
+        return load_factor
+
+    # ------------------------------------------------------------------ #
+
+    def empty_buckets(self) -> int:
+
+        """ Empty buckets method that returns the # of empty buckets in the
+        hash table. """
+
+        empty_buckets = 0
+        for i in range(self._capacity):
+            entry = self._buckets[i]
+            if entry is None or entry.generation != self._generation:
+                empty_buckets += 1
+
+        return empty_buckets
+
+    # ------------------------------------------------------------------ #
+
+    def resize_table(self, new_capacity: int) -> None:
+
+        """ Resize table method that resizes the hash table if the load
+        factor is equal to or above 0.5. After resizing, the method will
+        rehash the exisiting elements into the newly resized hash table.
+        The hash table will only be resized if the input capacity is valid.
+        The input capacity is also processed for prime validity, and if that
+        is not true, the capacity will be incremented to next highest prime
+        number. Tombstones are dropped, so resizing to the current capacity
+        compacts the table. """
+
+        for _ in self.resize_table_steps(new_capacity):
+            pass
+
+    def resize_table_steps(self, new_capacity: int, chunk_size: int = 4096):
+
+        """ Generator version of resize_table that yields after every
+        `chunk_size` buckets rehashed, so callers can spread a large resize
+        over several slices of work. The old hash table stays in place
+        until the last step, so a generator closed early leaves the map as
+        it was, and the map must not be written to until it is exhausted. """
+
+        # if the capacity is greater than the current size
+        if new_capacity < self._size:
+            return
+
+        # checks to see if the input capacity is a prime number
+        if is_prime(new_capacity) is not True:
+            new_capacity = next_prime(new_capacity)
+
+        # the keys are rehashed without put, so grow the capacity up front
+        # the way a put at half load would have in the middle of them
+        while self._size - 1 >= new_capacity * 0.5:
+            new_capacity = next_prime(new_capacity * 2)
+
+        # a hash function chosen by function='auto' takes over here, so
+        # the whole table is rehashed with it once
+        function = self._next_hash_function or self._hash_function
+
+        # instantiate new hash table with greater size
+        new_hash_table = DynamicArray(size=new_capacity)
+        new_size = 0
+
+        # rehash elements into new hash table; the keys do not change, so
+        # they are not put again through the filter, the ordered index or
+        # the selector of function='auto'
+        original_hash_table = self._buckets
+        for i in range(original_hash_table.length()):
+            entry = original_hash_table.get_unchecked(i)
+            if (entry is not None and entry.is_tombstone is False and
+                    entry.generation == self._generation):
+                self._rehash_entry(new_hash_table, function, entry.key, entry.value)
+                new_size += 1
+            if i % chunk_size == chunk_size - 1:
+                yield
+
+        # every entry was rehashed as a new HashEntry, so the old table is
+        # never written to again and snapshots can keep it as it is
+        self._detach_snapshots()
+        self._hash_function, self._next_hash_function = function, None
+        self._capacity = new_capacity
+        self._buckets = new_hash_table
+        self._size = new_size
+        self._tombstones = 0
+
+    def _rehash_entry(self, buckets: DynamicArray, function: callable, key: str, value: object) -> None:
+
+        """ Rehash helper that writes a key known to be absent from
+        `buckets` at the first empty index of its probe sequence under
+        `function`. """
+
+        capacity = buckets.length()
+        index = function(key) % capacity
+        initial_index = index
+        j = 1
+
+        while buckets.get_unchecked(index) is not None:
+            index = (initial_index + j ** 2) % capacity
+            j += 1
+        buckets.set_unchecked(index, HashEntry(key, value, self._generation))
+
+    def pending_resize(self) -> int:
+
+        """ Pending resize method that returns the capacity the next put
+        will resize the table to, or None if the next put will not resize.
+        A hash function switch decided by function='auto' is applied by
+        resizing to the current capacity. """
+
+        if self._next_hash_function is not None:
+            return self._capacity
+        if self.table_load() >= 0.5:
+            return self._capacity * 2
+        if (self._size + self._tombstones) / self._capacity >= 0.5:
+            return self._capacity
+        return None
+
+    # ------------------------------------------------------------------ #
+
+    def get(self, key: str) -> object:
+
+        """ Get method that returns the value of a given key. Returns
+        None if the key is invalid. """
+
+        if self._filter is not None and not self._filter.might_contain(key):
+            return None
+
+        index = self._find_index(key)
+        if index is not None and self._buckets[index].is_tombstone is False:
+            return self._buckets[index].value
+
+        if self._filter is not None:
+            self._filter.false_positive()
+        return None
+
+    # ------------------------------------------------------------------ #
+
+    def get_many(self, keys) -> DynamicArray:
+
+        """ Get many method that returns a DynamicArray with the value of
+        every key in `keys` (None for missing keys), in the same order.
+        Integer keys are looked up as their string form. When NumPy is
+        installed and the hash function has a vectorized version, the whole
+        batch is hashed at once and the probes are resolved round by round:
+        every unresolved key moves one step along its probe sequence per
+        round. Otherwise every key goes through get. """
+
+        if isinstance(keys, DynamicArray):
+            keys = [keys[i] for i in range(keys.length())]
+
+        hashes = hash_many(keys, self._hash_function) if len(keys) else None
+        if hashes is None:
+            answer = DynamicArray()
+            for key in keys:
+                answer.append(self.get(str(key)))
+            return answer
+
+        keys = as_key_array(keys).tolist()
+        homes = (hashes % self._capacity).tolist()
+        values = [None] * len(keys)
+
+        pending = list(range(len(keys)))
+        indices = list(homes)
+        j = 1
+        while pending:
+            unresolved = []
+            for position in pending:
+                entry = self._buckets.get_unchecked(indices[position])
+                if entry is None or entry.generation != self._generation:
+                    continue
+                if entry.key == keys[position]:
+                    if entry.is_tombstone is False:
+                        values[position] = entry.value
+                    continue
+                if j <= self._capacity:
+                    unresolved.append(position)
+
+            for position in unresolved:
+                indices[position] = (homes[position] + j ** 2) % self._capacity
+            pending = unresolved
+            j += 1
+
+        return DynamicArray(values)
+
+    # ------------------------------------------------------------------ #
+    def contains_key(self, key: str) -> bool:
+
+        """ Contains key method that returns True if the hash table contains
+        the input key and False otherwise. """
+
+        if self._filter is not None and not self._filter.might_contain(key):
+            return False
+
+        index = self._find_index(key)
+        if index is not None and self._buckets[index].is_tombstone is False:
+            return True
+
+        if self._filter is not None:
+            self._filter.false_positive()
+        return False
+
+    # ------------------------------------------------------------------ #
+
+    def remove(self, key: str) -> None:
+
+        """ Remove method that removes a key/value pair from the hash table.
+        An element is "removed" if the tombstone status of the HashEntry
+        object is True. """
+
+        if self._filter is not None and not self._filter.might_contain(key):
+            return
+
+        index = self._find_index(key)
+        if index is not None and self._buckets[index].is_tombstone is False:
+            if self._snapshots:
+                self._copy_on_write(index)
+            self._buckets[index].is_tombstone = True
+            self._size -= 1
+            self._tombstones += 1
+            if self._filter is not None:
+                self._filter.discard(key)
+            if self._index is not None:
+                self._index.remove(key)
+        elif self._filter is not None:
+            self._filter.false_positive()
+
+    # ------------------------------------------------------------------ #
+
+    def clear(self) -> None:
+
+        """ Clear method that clears the Hash Table in O(1). Bumping the
+        generation makes every existing HashEntry read as an empty index,
+        and each one is reclaimed the next time its index is touched. While
+        snapshots are open the table is replaced by an empty one instead, so
+        they keep the old table untouched. """
+
+        if self._snapshots:
+            self._detach_snapshots()
+            self._buckets = DynamicArray(size=self._capacity)
+        self._generation += 1
+        self._size = 0
+        self._tombstones = 0
+        if self._filter is not None:
+            self._filter.clear()
+        if self._index is not None:
+            self._index = SkipList()
+
+    # ------------------------------------------------------------------ #
+
+    def snapshot(self) -> "Snapshot":
+
+        """ Snapshot method that returns a read-only point-in-time view of
+        the map in O(1). Nothing is copied up front: the first write to an
+        index after the snapshot saves that index for it, and a resize or
+        clear hands the whole old table over to it. Values are shared, not
+        copied. """
+
+        snapshot = Snapshot(self)
+        self._snapshots.add(snapshot)
+        return snapshot
+
+    def _copy_on_write(self, index: int) -> None:
+
+        """ Helper that saves the entry at an index for every open snapshot
+        that has not saved it yet, right before the entry is written to. """
+
+        saved = _entry_state(self._buckets.get_unchecked(index), self._generation)
+        for snapshot in self._snapshots:
+            if index not in snapshot._saved:
+                snapshot._saved[index] = saved
+
+    def _detach_snapshots(self) -> None:
+
+        """ Helper that lets every open snapshot keep the current table as
+        its own, once the map stops writing to it. """
+
+        for snapshot in list(self._snapshots):
+            snapshot._map = None
+        self._snapshots = weakref.WeakSet()
+
+    # ------------------------------------------------------------------ #
+
+    def update(self, other) -> None:
+
+        """ Update method that puts every key/value pair of `other` (any
+        map with iter_items) into this map, replacing existing values. """
+
+        self.merge(other, None)
+
+    def merge(self, other, combine_fn: callable) -> None:
+
+        """ Merge method that adds every key/value pair of `other` to this
+        map. A key present in both ends up with combine_fn(this value, other
+        value). The table is resized once up front for the incoming keys,
+        so none of the puts resizes. Probe sequences depend on the whole
+        table, so unlike the separate chaining map there is no
+        index-by-index fast path. """
+
+        from .hash_map_snapshot import presize
+
+        presize(self, other.get_size())
+        for key, value in other.iter_items():
+            if combine_fn is not None:
+                index = self._find_index(key)
+                if index is not None:
+                    entry = self._buckets.get_unchecked(index)
+                    if entry.is_tombstone is False:
+                        if self._snapshots:
+                            self._copy_on_write(index)
+                        entry.value = combine_fn(entry.value, value)
+                        continue
+            self.put(key, value)
+
+    def diff(self, other) -> "HashMap":
+
+        """ Diff method that returns a new HashMap with the key/value pairs
+        of this map whose key is missing from `other` or holds a different
+        value there. """
+
+        answer = HashMap(self._capacity, self._hash_function)
+        for key, value in self.iter_items():
+            found = other.get(key)
+            if found != value or (found is None and not other.contains_key(key)):
+                answer.put(key, value)
+        return answer
+
+    # ------------------------------------------------------------------ #
+
+    def get_keys_and_values(self) -> DynamicArray:
+
+        """ Get keys and values method that returns the key/value pairs of
+        the hash table. """
+
+        answer = DynamicArray()
+
+        for i in range(self._capacity):
+            entry = self._buckets[i]
+            if (entry is not None and entry.is_tombstone is False and
+                    entry.generation == self._generation):
+                answer.append((entry.key, entry.value))
+
+        return answer
+
+    def iter_items(self):
+
+        """ Generator that yields the key/value pairs of the hash table one
+        at a time, without building a DynamicArray of all of them. """
+
+        for i in range(self._capacity):
+            entry = self._buckets.get_unchecked(i)
+            if (entry is not None and entry.is_tombstone is False and
+                    entry.generation == self._generation):
+                yield entry.key, entry.value
+
+    def freeze(self) -> "FrozenHashMap":
+
+        """ Freeze method that builds a read-only FrozenHashMap holding the
+        current key/value pairs, with one probe per lookup and no empty
+        buckets. Later changes to this map do not affect it. """
+
+        from .hash_map_frozen import FrozenHashMap
+
+        return FrozenHashMap(self.get_keys_and_values())
+
+    # ------------------------------------------------------------------ #
+
+    def hooks(self) -> "HookRegistry":
+
+        """ Hooks method that returns the hook registry of this map,
+        creating it on first use. Registering a pre or post callback on an
+        operation wraps that method on this map only; with no callback
+        registered the map runs its class methods untouched. """
+
+        if self._hooks is None:
+            from .hash_profile import HookRegistry
+
+            self._hooks = HookRegistry(self)
+        return self._hooks
+
+    def record_trace(self, path: str) -> "TraceRecorder":
+
+        """ Record trace method that starts writing every put, get,
+        contains_key, remove, clear and resize_table call made on this map
+        to a binary trace at `path`, for hash_trace.replay. Call stop on
+        the returned recorder to end the recording. """
+
+        from .hash_trace import TraceRecorder
+
+        return TraceRecorder(self, path)
+
+    def enable_filter(self, error_rate: float = 0.01) -> None:
+
+        """ Enable filter method that puts a counting Bloom filter in front
+        of get, contains_key and remove, so most lookups of missing keys
+        return without touching the hash table. The filter starts sized
+        for twice the current # of keys and is rebuilt at twice its size
+        whenever the map outgrows it. """
+
+        self._filter = CountingBloomFilter(max(self._size * 2, 64), error_rate)
+        for key, _ in self.iter_items():
+            self._filter.add(key)
+
+    def filter_false_positive_rate(self) -> float:
+
+        """ Returns the measured share of lookups of missing keys that the
+        filter could not rule out, or None if no filter is enabled. """
+
+        if self._filter is None:
+            return None
+        return self._filter.false_positive_rate()
+
+    def _filter_add(self, key: str) -> None:
+
+        """ Helper method that adds a new key to the filter, rebuilding the
+        filter at twice its size once it holds more keys than it was sized
+        for. """
+
+        self._filter.add(key)
+        if self._filter.length() > self._filter.capacity():
+            self._filter = self._filter.resized(self._filter.capacity() * 2)
+            for existing, _ in self.iter_items():
+                self._filter.add(existing)
+
+    # ------------------------------------------------------------------ #
+
+    def enable_ordered_index(self) -> None:
+
+        """ Enable ordered index method that keeps every key in a SkipList
+        updated by put, remove and clear, so range, prefix, min_key,
+        max_key and iter_ordered run in O(log n + k) instead of sorting
+        every key on every call. """
+
+        self._index = self._build_index()
+
+    def _build_index(self) -> SkipList:
+
+        """ Helper method that returns a SkipList holding the current keys:
+        the ordered index when it is enabled, otherwise one built for a
+        single query. """
+
+        if self._index is not None:
+            return self._index
+
+        index = SkipList()
+        for key, _ in self.iter_items():
+            index.insert(key)
+        return index
+
+    def range(self, low: str, high: str) -> DynamicArray:
+
+        """ Range method that returns the key/value pairs with
+        low <= key <= high, in key order. """
+
+        answer = DynamicArray()
+        for key in self._build_index().keys_between(low, high):
+            answer.append((key, self.get(key)))
+        return answer
+
+    def prefix(self, prefix: str) -> DynamicArray:
+
+        """ Prefix method that returns the key/value pairs whose key starts
+        with the given prefix, in key order. """
+
+        answer = DynamicArray()
+        for key in self._build_index().keys_with_prefix(prefix):
+            answer.append((key, self.get(key)))
+        return answer
+
+    def min_key(self) -> str:
+
+        """ Returns the smallest key, or None if the map is empty. """
+
+        return self._build_index().first()
+
+    def max_key(self) -> str:
+
+        """ Returns the largest key, or None if the map is empty. """
+
+        return self._build_index().last()
+
+    def iter_ordered(self):
+
+        """ Generator that yields the key/value pairs in key order. """
+
+        for key in self._build_index():
+            yield key, self.get(key)
+
+
+
+def _entry_state(entry: HashEntry, generation: int) -> tuple:
+    """
+    Return the (key, value, is_tombstone) state of an entry, or None for an
+    empty index or an entry from before the given generation
+    """
+    if entry is None or entry.generation != generation:
+        return None
+    return entry.key, entry.value, entry.is_tombstone
+
+
+class Snapshot:
+    def __init__(self, hash_map: HashMap) -> None:
+        """
+        Initialize a read-only view of an OA HashMap as it is right now
+        The view reads the live table, except for the indices the map has
+        written to since, which it saved beforehand.
+        """
+        self._map = hash_map
+        self._buckets = hash_map._buckets
+        self._capacity = hash_map._capacity
+        self._generation = hash_map._generation
+        self._hash_function = hash_map._hash_function
+        self._size = hash_map._size
+        self._saved = {}
+
+    def _entry(self, index: int) -> tuple:
+
+        """ Helper that returns the state of an index when the snapshot was
+        taken. """
+
+        if index in self._saved:
+            return self._saved[index]
+        return _entry_state(self._buckets.get_unchecked(index), self._generation)
+
+    def get(self, key: str) -> object:
+
+        """ Get method that returns the value a key had when the snapshot
+        was taken, or None. """
+
+        index = self._hash_function(key) % self._capacity
+        initial_index = index
+        j = 1
+
+        entry = self._entry(index)
+        while entry is not None and j <= self._capacity:
+            if entry[0] == key:
+                return None if entry[2] else entry[1]
+            index = (initial_index + j ** 2) % self._capacity
+            entry = self._entry(index)
+            j += 1
+
+        return None
+
+    def contains_key(self, key: str) -> bool:
+
+        """ Contains key method that returns True if the key was present
+        when the snapshot was taken. """
+
+        index = self._hash_function(key) % self._capacity
+        initial_index = index
+        j = 1
+
+        entry = self._entry(index)
+        while entry is not None and j <= self._capacity:
+            if entry[0] == key:
+                return not entry[2]
+            index = (initial_index + j ** 2) % self._capacity
+            entry = self._entry(index)
+            j += 1
+
+        return False
+
+    def get_size(self) -> int:
+        """
+        Return size of map when the snapshot was taken
+        """
+        return self._size
+
+    def iter_items(self):
+
+        """ Generator that yields the key/value pairs of the snapshot. """
+
+        for i in range(self._capacity):
+            entry = self._entry(i)
+            if entry is not None and not entry[2]:
+                yield entry[0], entry[1]
+
+    def get_keys_and_values(self) -> DynamicArray:
+
+        """ Get keys and values method that returns the key/value pairs of
+        the snapshot. """
+
+        return DynamicArray(list(self.iter_items()))
+
+    def close(self) -> None:
+
+        """ Close method that stops the map from saving indices for this
+        snapshot. The snapshot must not be used afterwards. """
+
+        if self._map is not None:
+            self._map._snapshots.discard(self)
+            self._map = None
+        self._buckets = None
+        self._saved = {}
+
+
+class ArenaHashMap:
+    def __init__(self, capacity: int, function) -> None:
+        """
+        Initialize new HashMap that uses quadratic probing like HashMap, but
+        stores its keys in a KeyArena instead of HashEntry objects
+        Every bucket is a 64-bit reference into the arena, and the values
+        are kept in a list indexed by the same reference.
+        """
+        self._capacity = next_prime(capacity)
+        self._slots = array('q', [EMPTY]) * self._capacity
+        self._arena = KeyArena()
+        self._values = []
+
+        self._hash_function = function
+        self._next_hash_function = None
+        self._size = 0
+        self._tombstones = 0
+
+    get_size = HashMap.get_size
+    get_capacity = HashMap.get_capacity
+    table_load = HashMap.table_load
+    pending_resize = HashMap.pending_resize
+    freeze = HashMap.freeze
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i in range(self._capacity):
+            ref = self._slots[i]
+            entry = None if ref < 0 else (self._arena.key(ref), self._values[ref])
+            out += str(i) + ': ' + str(entry) + '\n'
+        return out
+
+    # ------------------------------------------------------------------ #
+
+    def _probe(self, key_bytes: bytes, hash: int) -> tuple:
+
+        """ Probe helper that follows the quadratic probe sequence of an
+        encoded key. Returns the index holding the key (or None) and the
+        index a new key should be written to. Like _find_index, the probe
+        gives up once it wraps around. """
+
+        slots = self._slots
+        arena = self._arena
+        index = hash % self._capacity
+        initial_index = index
+        first_free = None
+        j = 1
+
+        ref = slots[index]
+        while ref != EMPTY and j <= self._capacity:
+            if ref == TOMBSTONE:
+                if first_free is None:
+                    first_free = index
+            elif arena.matches(ref, key_bytes, hash):
+                return index, None
+            index = (initial_index + j ** 2) % self._capacity
+            ref = slots[index]
+            j += 1
+
+        if ref != EMPTY or first_free is not None:
+            return None, first_free
+        return None, index
+
+    def put(self, key: str, value: object) -> None:
+
+        """ Put method that adds a key/value pair into the hash map, or
+        replaces the value of an existing key. The key is encoded once and
+        appended to the arena along with its hash. Resizes follow the same
+        rules as HashMap. """
+
+        new_capacity = self.pending_resize()
+        if new_capacity is not None:
+            self.resize_table(new_capacity)
+
+        key_bytes = key.encode('utf-8')
+        hash = self._hash_function(key) & HASH_MASK
+        index, free = self._probe(key_bytes, hash)
+        if index is not None:
+            self._values[self._slots[index]] = value
+            return
+
+        if self._slots[free] == TOMBSTONE:
+            self._tombstones -= 1
+        self._slots[free] = self._arena.add(key_bytes, hash)
+        self._values.append(value)
+        self._size += 1
+
+    def get(self, key: str) -> object:
+
+        """ Get method that returns the value of a given key. Returns
+        None if the key is invalid. """
+
+        index, _ = self._probe(key.encode('utf-8'), self._hash_function(key) & HASH_MASK)
+        if index is None:
+            return None
+        return self._values[self._slots[index]]
+
+    def contains_key(self, key: str) -> bool:
+
+        """ Contains key method that returns True if the key is present. """
+
+        index, _ = self._probe(key.encode('utf-8'), self._hash_function(key) & HASH_MASK)
+        return index is not None
+
+    def remove(self, key: str) -> None:
+
+        """ Remove method that tombstones the bucket of a given key. The
+        key bytes stay in the arena until the next resize compacts it. """
+
+        index, _ = self._probe(key.encode('utf-8'), self._hash_function(key) & HASH_MASK)
+        if index is None:
+            return
+
+        self._values[self._slots[index]] = None
+        self._slots[index] = TOMBSTONE
+        self._size -= 1
+        self._tombstones += 1
+
+    def clear(self) -> None:
+
+        """ Clear method that drops the arena, the values and every bucket
+        without changing the capacity. """
+
+        self._slots = array('q', [EMPTY]) * self._capacity
+        self._arena = KeyArena()
+        self._values = []
+        self._size = 0
+        self._tombstones = 0
+
+    # ------------------------------------------------------------------ #
+
+    def empty_buckets(self) -> int:
+
+        """ Empty buckets method that returns the # of empty buckets in the
+        hash table. """
+
+        return self._capacity - self._size - self._tombstones
+
+    def resize_table(self, new_capacity: int) -> None:
+
+        """ Resize table method that rehashes the live keys into a table of
+        at least `new_capacity` buckets (rounded up to a prime). The cached
+        hashes are reused, and the keys are copied into a fresh arena, which
+        drops the bytes of removed keys. The capacity is also raised to keep
+        the load under 0.5, as the re-puts of HashMap.resize_table do: only
+        then is a quadratic probe sure to reach an empty bucket. """
+
+        if new_capacity < self._size:
+            return
+
+        new_capacity = max(new_capacity, 2 * self._size + 1)
+        if is_prime(new_capacity) is not True:
+            new_capacity = next_prime(new_capacity)
+
+        old_slots, old_arena, old_values = self._slots, self._arena, self._values
+        self._capacity = new_capacity
+        self._slots = slots = array('q', [EMPTY]) * new_capacity
+        self._arena = arena = KeyArena()
+        self._values = values = []
+        self._tombstones = 0
+
+        # keys are unique, so each goes to the first empty bucket
+        for ref in old_slots:
+            if ref < 0:
+                continue
+            hash = old_arena.hash(ref)
+            index = hash % new_capacity
+            initial_index = index
+            j = 1
+            while slots[index] != EMPTY:
+                index = (initial_index + j ** 2) % new_capacity
+                j += 1
+            slots[index] = arena.add(old_arena.key_bytes(ref), hash)
+            values.append(old_values[ref])
+
+    # ------------------------------------------------------------------ #
+
+    def iter_items(self):
+
+        """ Generator that yields the key/value pairs of the map. """
+
+        for ref in self._slots:
+            if ref >= 0:
+                yield self._arena.key(ref), self._values[ref]
+
+    def get_keys_and_values(self) -> DynamicArray:
+
+        """ Get keys and values method that returns the key/value pairs of
+        the map. """
+
+        return DynamicArray(list(self.iter_items()))
+
+
+class IntHashMap:
+    def __init__(self, capacity: int, function=fibonacci_hash) -> None:
+        """
+        Initialize new HashMap for 64-bit integer keys that uses linear
+        probing over a power of two table
+        The keys are stored unboxed in an array('q'), with INT_EMPTY and
+        INT_DELETED marking the free buckets, and the values in a list
+        indexed the same way. `function` maps a key to 64 bits, whose high
+        bits pick the bucket (fibonacci_hash or splitmix64 from core).
+        """
+        self._capacity = _power_of_two(capacity)
+        self._shift = 65 - self._capacity.bit_length()
+        self._keys = array('q', [INT_EMPTY]) * self._capacity
+        self._values = [None] * self._capacity
+        # keys equal to INT_EMPTY or INT_DELETED and their values
+        self._reserved = {}
+
+        self._hash_function = function
+        self._next_hash_function = None
+        self._size = 0
+        self._tombstones = 0
+
+    get_size = HashMap.get_size
+    get_capacity = HashMap.get_capacity
+    table_load = HashMap.table_load
+    pending_resize = HashMap.pending_resize
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i in range(self._capacity):
+            key = self._keys[i]
+            entry = None if key <= INT_DELETED else (key, self._values[i])
+            out += str(i) + ': ' + str(entry) + '\n'
+        for key, value in self._reserved.items():
+            out += 'reserved: ' + str((key, value)) + '\n'
+        return out
+
+    # ------------------------------------------------------------------ #
+
+    def _find(self, key: int) -> tuple:
+
+        """ Find helper that follows the linear probe sequence of a key.
+        Returns the index holding the key (or None) and the index a new
+        key should be written to: the first deleted bucket passed, or the
+        empty bucket that ended the probe. """
+
+        keys = self._keys
+        mask = self._capacity - 1
+        index = self._hash_function(key) >> self._shift
+        first_free = None
+        j = 0
+
+        while j <= mask:
+            found = keys[index]
+            if found == key:
+                return index, None
+            if found == INT_EMPTY:
+                return None, index if first_free is None else first_free
+            if found == INT_DELETED and first_free is None:
+                first_free = index
+            index = (index + 1) & mask
+            j += 1
+
+        return None, first_free
+
+    def put(self, key: int, value: object) -> None:
+
+        """ Put method that adds a key/value pair into the hash map, or
+        replaces the value of an existing key. Resizes follow the same
+        rules as HashMap, doubling the table once the load reaches 0.5. """
+
+        new_capacity = self.pending_resize()
+        if new_capacity is not None:
+            self.resize_table(new_capacity)
+
+        if key <= INT_DELETED:
+            if key not in self._reserved:
+                self._size += 1
+            self._reserved[key] = value
+            return
+
+        index, free = self._find(key)
+        if index is not None:
+            self._values[index] = value
+            return
+
+        if self._keys[free] == INT_DELETED:
+            self._tombstones -= 1
+        self._keys[free] = key
+        self._values[free] = value
+        self._size += 1
+
+    def get(self, key: int) -> object:
+
+        """ Get method that returns the value of a given key. Returns
+        None if the key is invalid. """
+
+        if key <= INT_DELETED:
+            return self._reserved.get(key)
+        index, _ = self._find(key)
+        if index is None:
+            return None
+        return self._values[index]
+
+    def contains_key(self, key: int) -> bool:
+
+        """ Contains key method that returns True if the key is present. """
+
+        if key <= INT_DELETED:
+            return key in self._reserved
+        return self._find(key)[0] is not None
+
+    def remove(self, key: int) -> None:
+
+        """ Remove method that marks the bucket of a given key deleted. """
+
+        if key <= INT_DELETED:
+            if self._reserved.pop(key, self._reserved) is not self._reserved:
+                self._size -= 1
+            return
+
+        index, _ = self._find(key)
+        if index is None:
+            return
+
+        self._keys[index] = INT_DELETED
+        self._values[index] = None
+        self._size -= 1
+        self._tombstones += 1
+
+    def clear(self) -> None:
+
+        """ Clear method that empties every bucket without changing the
+        capacity. """
+
+        self._keys = array('q', [INT_EMPTY]) * self._capacity
+        self._values = [None] * self._capacity
+        self._reserved = {}
+        self._size = 0
+        self._tombstones = 0
+
+    # ------------------------------------------------------------------ #
+
+    def empty_buckets(self) -> int:
+
+        """ Empty buckets method that returns the # of empty buckets in the
+        hash table. """
+
+        return self._capacity - self._size + len(self._reserved) - self._tombstones
+
+    def resize_table(self, new_capacity: int) -> None:
+
+        """ Resize table method that rehashes the keys into a table of at
+        least `new_capacity` buckets, rounded up to a power of two. Deleted
+        buckets are dropped along the way. """
+
+        if new_capacity < self._size:
+            return
+
+        new_capacity = _power_of_two(new_capacity)
+        old_keys, old_values = self._keys, self._values
+        self._capacity = new_capacity
+        self._shift = shift = 65 - new_capacity.bit_length()
+        self._keys = keys = array('q', [INT_EMPTY]) * new_capacity
+        self._values = values = [None] * new_capacity
+        self._tombstones = 0
+        function = self._hash_function
+        mask = new_capacity - 1
+
+        # keys are unique, so each goes to the first empty bucket
+        for i, key in enumerate(old_keys):
+            if key <= INT_DELETED:
+                continue
+            index = function(key) >> shift
+            while keys[index] != INT_EMPTY:
+                index = (index + 1) & mask
+            keys[index] = key
+            values[index] = old_values[i]
+
+    # ------------------------------------------------------------------ #
+
+    def iter_items(self):
+
+        """ Generator that yields the key/value pairs of the map. """
+
+        values = self._values
+        for i, key in enumerate(self._keys):
+            if key > INT_DELETED:
+                yield key, values[i]
+        yield from self._reserved.items()
+
+    def get_keys_and_values(self) -> DynamicArray:
+
+        """ Get keys and values method that returns the key/value pairs of
+        the map. """
+
+        return DynamicArray(list(self.iter_items()))
+
+
+def _power_of_two(capacity: int) -> int:
+    """Return the smallest power of two at or above `capacity` (at least 2)."""
+    return 1 << max(capacity - 1, 1).bit_length()
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+# if __name__ == "__main__":
+
+#     print("\nPDF - put example 1")
+#     print("-------------------")
+#     m = HashMap(53, hash_function_1)
+#     for i in range(150):
+#         m.put('str' + str(i), i * 100)
+#         if i % 25 == 24:
+#             print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+    
+
+#     print("\nPDF - put example 2")
+#     print("-------------------")
+#     m = HashMap(41, hash_function_2)
+#     for i in range(50):
+#         m.put('str' + str(i // 3), i * 100)
+#         # print(m.get_size())
+#         # print(i, 'str' + str(i // 3))
+#         # print('\n')
+#         # print(m)
+#         if i % 10 == 9:
+#             print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+
+#     print("\nPDF - table_load example 1")
+#     print("--------------------------")
+#     m = HashMap(101, hash_function_1)
+#     print(round(m.table_load(), 2))
+#     m.put('key1', 10)
+#     print(round(m.table_load(), 2))
+#     m.put('key2', 20)
+#     print(round(m.table_load(), 2))
+#     m.put('key1', 30)
+#     print(round(m.table_load(), 2))
+
+#     print("\nPDF - table_load example 2")
+#     print("--------------------------")
+#     m = HashMap(53, hash_function_1)
+#     for i in range(50):
+#         m.put('key' + str(i), i * 100)
+#         if i % 10 == 0:
+#             print(round(m.table_load(), 2), m.get_size(), m.get_capacity())
+
+#     print("\nPDF - empty_buckets example 1")
+#     print("-----------------------------")
+#     m = HashMap(101, hash_function_1)
+#     print(m.empty_buckets(), m.get_size(), m.get_capacity())
+#     m.put('key1', 10)
+#     print(m.empty_buckets(), m.get_size(), m.get_capacity())
+#     m.put('key2', 20)
+#     print(m.empty_buckets(), m.get_size(), m.get_capacity())
+#     m.put('key1', 30)
+#     print(m.empty_buckets(), m.get_size(), m.get_capacity())
+#     m.put('key4', 40)
+#     print(m.empty_buckets(), m.get_size(), m.get_capacity())
+
+#     print("\nPDF - empty_buckets example 2")
+#     print("-----------------------------")
+#     m = HashMap(53, hash_function_1)
+#     for i in range(150):
+#         m.put('key' + str(i), i * 100)
+#         if i % 30 == 0:
+#             print(m.empty_buckets(), m.get_size(), m.get_capacity())
+
+#     print("\nPDF - resize example 1")
+#     print("----------------------")
+#     m = HashMap(23, hash_function_1)
+#     m.put('key1', 10)
+#     print(m.get_size(), m.get_capacity(), m.get('key1'), m.contains_key('key1'))
+#     m.resize_table(30)
+#     print(m.get_size(), m.get_capacity(), m.get('key1'), m.contains_key('key1'))
+
+
+#     print("\nPDF - resize example 2")
+#     print("----------------------")
+#     m = HashMap(79, hash_function_2)
+#     keys = [i for i in range(1, 1000, 15)]
+#     for key in keys:
+#         m.put(str(key), key * 42)
+#     print(m.get_size(), m.get_capacity(), round(m.table_load(),2))
+#     # print(f"Original m: {m}")
+
+
+#     for capacity in range(111, 1000, 117):
+#         m.resize_table(capacity)
+
+#         if m.table_load() > 0.5:
+#             print(capacity)
+#             print(f"Check that the load factor is acceptable after the call to resize_table().\n"
+#                   f"Your load factor is {round(m.table_load(), 2)} and should be less than or equal to 0.5")
+
+#         m.put('some key', 'some value')
+#         result = m.contains_key('some key')
+#         m.remove('some key')
+
+#         for key in keys:
+#             # all inserted keys must be present
+#             result &= m.contains_key(str(key))
+#             # NOT inserted keys must be absent
+#             result &= not m.contains_key(str(key + 1))
+#         print(capacity, result, m.get_size(), m.get_capacity(), round(m.table_load(), 2))
+
+#     print("\nPDF - get example 1")
+#     print("-------------------")
+#     m = HashMap(31, hash_function_1)
+#     print(m.get('key'))
+#     m.put('key1', 10)
+#     print(m.get('key1'))
+
+#     print("\nPDF - get example 2")
+#     print("-------------------")
+#     m = HashMap(151, hash_function_2)
+#     for i in range(200, 300, 7):
+#         m.put(str(i), i * 10)
+#     print(m.get_size(), m.get_capacity())
+#     for i in range(200, 300, 21):
+#         print(i, m.get(str(i)), m.get(str(i)) == i * 10)
+#         print(i + 1, m.get(str(i + 1)), m.get(str(i + 1)) == (i + 1) * 10)
+
+#     print("\nPDF - contains_key example 1")
+#     print("----------------------------")
+#     m = HashMap(11, hash_function_1)
+#     print(m.contains_key('key1'))
+#     m.put('key1', 10)
+#     m.put('key2', 20)
+#     m.put('key3', 30)
+#     print(m.contains_key('key1'))
+#     print(m.contains_key('key4'))
+#     print(m.contains_key('key2'))
+#     print(m.contains_key('key3'))
+#     m.remove('key3')
+#     print(m.contains_key('key3'))
+
+#     print("\nPDF - contains_key example 2")
+#     print("----------------------------")
+#     m = HashMap(79, hash_function_2)
+#     keys = [i for i in range(1, 1000, 20)]
+#     for key in keys:
+#         m.put(str(key), key * 42)
+#     print(m.get_size(), m.get_capacity())
+#     result = True
+#     for key in keys:
+#         # all inserted keys must be present
+#         result &= m.contains_key(str(key))
+#         # NOT inserted keys must be absent
+#         result &= not m.contains_key(str(key + 1))
+#     print(result)
+
+#     print("\nPDF - remove example 1")
+#     print("----------------------")
+#     m = HashMap(53, hash_function_1)
+#     print(m.get('key1'))
+#     m.put('key1', 10)
+#     print(m.get('key1'))
+#     m.remove('key1')
+#     print(m.get('key1'))
+#     m.remove('key4')
+
+#     print("\nPDF - clear example 1")
+#     print("---------------------")
+#     m = HashMap(101, hash_function_1)
+#     print(m.get_size(), m.get_capacity())
+#     m.put('key1', 10)
+#     m.put('key2', 20)
+#     m.put('key1', 30)
+#     print(m.get_size(), m.get_capacity())
+#     m.clear()
+#     print(m.get_size(), m.get_capacity())
+
+#     print("\nPDF - clear example 2")
+#     print("---------------------")
+#     m = HashMap(53, hash_function_1)
+#     print(m.get_size(), m.get_capacity())
+#     m.put('key1', 10)
+#     print(m.get_size(), m.get_capacity())
+#     m.put('key2', 20)
+#     print(m.get_size(), m.get_capacity())
+#     m.resize_table(100)
+#     print(m.get_size(), m.get_capacity())
+#     m.clear()
+#     print(m.get_size(), m.get_capacity())
+
+#     print("\nPDF - get_keys_and_values example 1")
+#     print("------------------------")
+#     m = HashMap(11, hash_function_2)
+#     for i in range(1, 6):
+#         m.put(str(i), str(i * 10))
+#     print(m.get_keys_and_values())
+
+#     m.resize_table(2)
+#     print(m.get_keys_and_values())
+
+#     m.put('20', '200')
+#     m.remove('1')
+#     m.resize_table(12)
+#     print(m.get_keys_and_values())
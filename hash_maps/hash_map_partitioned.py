@@ -0,0 +1,489 @@
+# Description: Partitioned map spreading keys over shard processes, each
+# running an OA or SC HashMap, with a consistent-hash ring of virtual nodes
+# and a batched request protocol over pipes
+
+
+import bisect
+import hashlib
+import multiprocessing
+
+from .core import DynamicArray
+from .hash_map_sc import HashMap
+
+
+OP_PUT = 1
+OP_GET = 2
+OP_CONTAINS = 3
+OP_REMOVE = 4
+OP_SIZE = 5
+OP_ITEMS = 6
+OP_CLEAR = 7
+OP_REBALANCE = 8
+OP_DRAIN = 9
+
+# requests sent to one shard in a single message
+BATCH_SIZE = 1024
+
+
+def ring_point(label: str) -> int:
+    """
+    Return the 64-bit position of `label` on the ring. blake2b is used
+    rather than hash() so every process agrees on the positions.
+    """
+    return int.from_bytes(hashlib.blake2b(label.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class HashRing:
+    """
+    Consistent-hash ring placing every shard at `vnodes` points
+    A key belongs to the shard owning the first point at or after the
+    key's own position, wrapping around. Adding or removing a shard only
+    changes the owner of the keys between its points and their
+    predecessors, about 1 / N of the keys.
+    Supported methods are: add_shard, remove_shard, shard_for, get_shards
+    """
+
+    def __init__(self, vnodes: int = 64) -> None:
+        """Initialize an empty ring."""
+        self._vnodes = vnodes
+        self._points = []
+        self._owners = []
+        self._shards = []
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        return 'HashRing(' + ', '.join(self._shards) + ')'
+
+    def add_shard(self, name: str) -> None:
+        """Place the `vnodes` points of a new shard on the ring."""
+        if name in self._shards:
+            raise ValueError('shard ' + name + ' is already on the ring')
+        self._shards.append(name)
+        for i in range(self._vnodes):
+            point = ring_point(name + '#' + str(i))
+            index = bisect.bisect_left(self._points, point)
+            self._points.insert(index, point)
+            self._owners.insert(index, name)
+
+    def remove_shard(self, name: str) -> None:
+        """Take the points of a shard off the ring."""
+        self._shards.remove(name)
+        keep = [i for i, owner in enumerate(self._owners) if owner != name]
+        self._points = [self._points[i] for i in keep]
+        self._owners = [self._owners[i] for i in keep]
+
+    def shard_for(self, key: str) -> str:
+        """Return the name of the shard owning `key`."""
+        if not self._points:
+            raise KeyError('the ring has no shards')
+        return _owner(self._points, self._owners, ring_point(key))
+
+    def get_shards(self) -> list:
+        """
+        Return names of the shards on the ring
+        """
+        return list(self._shards)
+
+    def get_layout(self) -> tuple:
+        """
+        Return sorted points and their owners, as sent to the shards
+        """
+        return self._points, self._owners
+
+
+def _owner(points: list, owners: list, point: int) -> str:
+    """Return the owner of the first ring point at or after `point`."""
+    index = bisect.bisect_left(points, point)
+    return owners[index if index < len(points) else 0]
+
+
+# ------------------------------------------------------------------ #
+
+def _apply(hash_map, request: tuple) -> object:
+    """Run one request against a shard's map and return its answer."""
+    op = request[0]
+    if op == OP_GET:
+        return hash_map.get(request[1])
+    if op == OP_PUT:
+        hash_map.put(request[1], request[2])
+        # the SC table never grows on its own; the OA load stays under 1
+        if hash_map.table_load() > 1:
+            hash_map.resize_table(hash_map.get_capacity() * 2)
+        return None
+    if op == OP_CONTAINS:
+        return hash_map.contains_key(request[1])
+    if op == OP_REMOVE:
+        hash_map.remove(request[1])
+        return None
+    if op == OP_SIZE:
+        return hash_map.get_size()
+    if op == OP_ITEMS:
+        return list(hash_map.iter_items())
+    if op == OP_CLEAR:
+        hash_map.clear()
+        return None
+    if op == OP_REBALANCE:
+        # hand over the pairs the new layout gives to another shard
+        points, owners, name = request[1:]
+        moved = [(key, value) for key, value in hash_map.iter_items()
+                 if _owner(points, owners, ring_point(key)) != name]
+        for key, _ in moved:
+            hash_map.remove(key)
+        return moved
+    if op == OP_DRAIN:
+        pairs = list(hash_map.iter_items())
+        hash_map.clear()
+        return pairs
+    raise ValueError('unknown shard request ' + str(op))
+
+
+def serve_shard(connection, engine: type = HashMap, capacity: int = 11,
+                function: callable = 'auto') -> None:
+    """
+    Shard main loop: build a map of class `engine` and answer every batch
+    of requests received on `connection` with the list of their answers,
+    until None is received.
+    """
+    hash_map = engine(capacity, function)
+    while True:
+        batch = connection.recv()
+        if batch is None:
+            break
+        connection.send([_apply(hash_map, request) for request in batch])
+    connection.close()
+
+
+class PartitionedHashMap:
+    """
+    Client of a set of shards, routing every key with a HashRing
+    A shard is anything with send and recv speaking the serve_shard
+    protocol: a Pipe to a local process, or a multiprocessing.connection
+    Client to another node. Requests are grouped per shard into batches of
+    BATCH_SIZE; one batch is sent to every shard before any answer is read,
+    so the shards work in parallel, and each shard has a single batch in
+    flight, so neither side can block on a full pipe.
+    Supported methods are: put, get, contains_key, remove, put_many,
+    get_many, remove_many, add_shard, remove_shard, get_size, clear,
+    iter_items
+    """
+
+    def __init__(self, vnodes: int = 64, batch_size: int = BATCH_SIZE) -> None:
+        """Initialize a map with no shards."""
+        self._ring = HashRing(vnodes)
+        self._connections = {}
+        self._batch_size = batch_size
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        return 'PartitionedHashMap(' + ', '.join(
+            name + ': ' + str(size) for name, size in self.shard_sizes().items()) + ')'
+
+    def get_ring(self) -> HashRing:
+        """
+        Return ring routing the keys
+        """
+        return self._ring
+
+    # ------------------------------------------------------------------ #
+
+    def _run(self, batches: dict) -> dict:
+
+        """ Helper that sends the lists of requests in `batches` (keyed by
+        shard name) and returns the lists of answers, keyed the same way.
+        Each round sends the next BATCH_SIZE requests of every shard, then
+        reads every answer of that round. """
+
+        answers = {name: [] for name in batches}
+        offset = 0
+        while True:
+            sent = []
+            for name, requests in batches.items():
+                chunk = requests[offset:offset + self._batch_size]
+                if chunk:
+                    self._connections[name].send(chunk)
+                    sent.append(name)
+            if not sent:
+                return answers
+            for name in sent:
+                answers[name].extend(self._connections[name].recv())
+            offset += self._batch_size
+
+    def _route(self, keys) -> dict:
+
+        """ Helper that groups the positions of `keys` by owning shard. """
+
+        points, owners = self._ring.get_layout()
+        if not points:
+            raise KeyError('the map has no shards')
+        positions = {}
+        for position, key in enumerate(keys):
+            positions.setdefault(_owner(points, owners, ring_point(key)), []).append(position)
+        return positions
+
+    def _broadcast(self, request: tuple) -> dict:
+
+        """ Helper that sends one request to every shard and returns their
+        answers keyed by shard name. """
+
+        answers = self._run({name: [request] for name in self._connections})
+        return {name: answer[0] for name, answer in answers.items()}
+
+    def put_many(self, pairs) -> None:
+
+        """ Put many method that adds every key/value pair of `pairs`,
+        batching the requests per shard. """
+
+        pairs = list(pairs)
+        positions = self._route(key for key, _ in pairs)
+        self._run({name: [(OP_PUT,) + pairs[i] for i in indices]
+                   for name, indices in positions.items()})
+
+    def get_many(self, keys) -> list:
+
+        """ Get many method that returns the values of `keys`, in order,
+        with None for missing keys. """
+
+        keys = list(keys)
+        positions = self._route(keys)
+        answers = self._run({name: [(OP_GET, keys[i]) for i in indices]
+                             for name, indices in positions.items()})
+        values = [None] * len(keys)
+        for name, indices in positions.items():
+            for i, value in zip(indices, answers[name]):
+                values[i] = value
+        return values
+
+    def remove_many(self, keys) -> None:
+
+        """ Remove many method that removes every key of `keys`. """
+
+        keys = list(keys)
+        positions = self._route(keys)
+        self._run({name: [(OP_REMOVE, keys[i]) for i in indices]
+                   for name, indices in positions.items()})
+
+    def _call(self, request: tuple) -> object:
+
+        """ Helper that sends a single keyed request to its shard. """
+
+        name = self._ring.shard_for(request[1])
+        return self._run({name: [request]})[name][0]
+
+    def put(self, key: str, value: object) -> None:
+
+        """ Put method that adds a key/value pair into the shard owning
+        the key. Every call is a round trip, so put_many is the fast path
+        for bulk loads. """
+
+        self._call((OP_PUT, key, value))
+
+    def get(self, key: str) -> object:
+
+        """ Get method that returns the value of a given key. Returns
+        None if the key is invalid. """
+
+        return self._call((OP_GET, key))
+
+    def contains_key(self, key: str) -> bool:
+
+        """ Contains key method that returns True if the key is in the
+        map. """
+
+        return self._call((OP_CONTAINS, key))
+
+    def remove(self, key: str) -> None:
+
+        """ Remove method that removes a key and its value from the map. """
+
+        self._call((OP_REMOVE, key))
+
+    def shard_sizes(self) -> dict:
+
+        """ Shard sizes method that returns the number of keys held by
+        every shard. """
+
+        return self._broadcast((OP_SIZE,))
+
+    def get_size(self) -> int:
+
+        """ Get size method that returns the number of keys over all
+        shards. """
+
+        return sum(self.shard_sizes().values())
+
+    def clear(self) -> None:
+
+        """ Clear method that empties every shard. """
+
+        self._broadcast((OP_CLEAR,))
+
+    def iter_items(self):
+
+        """ Iter items method that yields the key/value pairs of every
+        shard, one shard after the other. """
+
+        for pairs in self._broadcast((OP_ITEMS,)).values():
+            yield from pairs
+
+    def get_keys_and_values(self) -> DynamicArray:
+
+        """ Get keys and values method that returns every key/value pair
+        of the map. """
+
+        return DynamicArray(list(self.iter_items()))
+
+    # ------------------------------------------------------------------ #
+
+    def add_shard(self, name: str, connection) -> int:
+
+        """ Add shard method that puts a new, empty shard on the ring and
+        moves to it the keys it now owns. Every other shard works out its
+        own moved keys from the new ring layout, so only those keys travel.
+        Returns the number of keys moved. """
+
+        self._ring.add_shard(name)
+        points, owners = self._ring.get_layout()
+        moved = self._run({shard: [(OP_REBALANCE, points, owners, shard)]
+                           for shard in self._connections})
+        self._connections[name] = connection
+        pairs = [pair for answer in moved.values() for pair in answer[0]]
+        if pairs:
+            self.put_many(pairs)
+        return len(pairs)
+
+    def remove_shard(self, name: str) -> tuple:
+
+        """ Remove shard method that takes a shard off the ring and hands
+        its keys to the shards now owning them. Returns the connection of
+        the removed shard, which is still running, and the number of keys
+        moved. """
+
+        connection = self._connections[name]
+        pairs = self._run({name: [(OP_DRAIN,)]})[name][0]
+        self._ring.remove_shard(name)
+        del self._connections[name]
+        if pairs:
+            self.put_many(pairs)
+        return connection, len(pairs)
+
+
+class LocalCluster:
+    """
+    Test harness standing in for real nodes: every shard is a local
+    process running serve_shard at the end of a Pipe, behind a single
+    PartitionedHashMap
+    Supported methods are: add_shard, remove_shard, close
+    """
+
+    def __init__(self,
+                 shards: int = 4,
+                 engine: type = HashMap,
+                 capacity: int = 11,
+                 function: callable = 'auto',
+                 vnodes: int = 64) -> None:
+        """
+        Start `shards` processes, each holding a map of class `engine`
+        built with `capacity` and `function`, and connect them to a new
+        PartitionedHashMap
+        """
+        self._engine = engine
+        self._capacity = capacity
+        self._function = function
+        self._processes = {}
+        self._next_id = 0
+        self.map = PartitionedHashMap(vnodes)
+        for _ in range(shards):
+            self.add_shard()
+
+    def __enter__(self) -> "LocalCluster":
+        """Return the cluster, which is closed on exit."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Stop every shard process."""
+        self.close()
+
+    def add_shard(self) -> tuple:
+
+        """ Add shard method that starts a new shard process and adds it
+        to the map. Returns its name and the number of keys moved to it. """
+
+        name = 'shard' + str(self._next_id)
+        self._next_id += 1
+        connection, child = multiprocessing.Pipe()
+        process = multiprocessing.Process(
+            target=serve_shard, args=(child, self._engine, self._capacity, self._function),
+            name=name, daemon=True)
+        process.start()
+        child.close()
+        self._processes[name] = process
+        return name, self.map.add_shard(name, connection)
+
+    def remove_shard(self, name: str) -> int:
+
+        """ Remove shard method that hands the keys of a shard to the
+        others, then stops its process. Returns the number of keys moved. """
+
+        connection, moved = self.map.remove_shard(name)
+        self._stop(name, connection)
+        return moved
+
+    def _stop(self, name: str, connection) -> None:
+
+        """ Helper that ends a shard process and waits for it. """
+
+        connection.send(None)
+        connection.close()
+        self._processes.pop(name).join()
+
+    def close(self) -> None:
+
+        """ Close method that stops every shard process. """
+
+        for name in list(self._processes):
+            self._stop(name, self.map._connections.pop(name))
+            self.map._ring.remove_shard(name)
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    import time
+
+    print("\nHashRing - placement example 1")
+    print("------------------------------")
+    ring = HashRing()
+    for name in ('a', 'b', 'c', 'd'):
+        ring.add_shard(name)
+    keys = ['str' + str(i) for i in range(100000)]
+    before = [ring.shard_for(key) for key in keys]
+    ring.add_shard('e')
+    after = [ring.shard_for(key) for key in keys]
+    print(ring, sum(x != y for x, y in zip(before, after)) / len(keys),
+          {name: after.count(name) for name in ring.get_shards()})
+
+    print("\nLocalCluster - batched puts and gets example 1")
+    print("----------------------------------------------")
+    with LocalCluster(shards=4) as cluster:
+        m = cluster.map
+        pairs = [(key, i) for i, key in enumerate(keys)]
+        start = time.perf_counter()
+        m.put_many(pairs)
+        values = m.get_many(keys)
+        print(round(time.perf_counter() - start, 3), values == list(range(len(keys))), m.get_size())
+        start = time.perf_counter()
+        for key in keys[:2000]:
+            m.get(key)
+        print('2000 single gets', round(time.perf_counter() - start, 3))
+
+        print("\nLocalCluster - shard add/remove example 1")
+        print("-----------------------------------------")
+        name, moved = cluster.add_shard()
+        print(name, moved, m.shard_sizes(), m.get_many(keys) == values)
+        moved = cluster.remove_shard('shard1')
+        print('shard1', moved, m.shard_sizes(), m.get_many(keys) == values)
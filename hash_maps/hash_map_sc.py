@@ -0,0 +1,1389 @@
+# Name: Joseph Shing
+# Description: Hash Map Implementation utilizing a Dynamic Array of LinkedLists
+
+
+import weakref
+from array import array
+
+from .core import (CountingBloomFilter, DynamicArray, KeyArena, LinkedList,
+                   HashFunctionSelector, SkipList, hash_function_1, hash_function_2,
+                   hash_function_3, is_prime, next_prime)
+
+
+# chain end marker of the ArenaHashMap
+EMPTY = -1
+
+# empty LinkedList shared by every bucket that has not been written to
+# yet; no map ever reaches its generation, so _bucket replaces it with a
+# list of its own on first write, and building a table costs one pointer
+# per bucket instead of one LinkedList per bucket
+STALE_BUCKET = LinkedList()
+STALE_BUCKET.generation = -1
+
+HASH_MASK = 0xFFFFFFFFFFFFFFFF
+
+
+class HashMap:
+    def __init__(self,
+                 capacity: int = 11,
+                 function: callable = hash_function_1) -> None:
+        """
+        Initialize new HashMap that uses
+        separate chaining for collision resolution
+        """
+        # capacity must be a prime number
+        self._capacity = next_prime(capacity)
+        self._buckets = DynamicArray(size=self._capacity, fill=STALE_BUCKET)
+
+        # function='auto' starts with hash_function_1 and lets a
+        # HashFunctionSelector replace it once enough keys were put
+        self._selector = None
+        self._next_hash_function = None
+        self._hash_decision = None
+        if function == 'auto':
+            function = hash_function_1
+            self._selector = HashFunctionSelector()
+
+        self._hash_function = function
+        self._size = 0
+        self._generation = 0
+        self._swept_generation = -1
+        self._filter = None
+        self._index = None
+        self._snapshots = weakref.WeakSet()
+        self._hooks = None
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i in range(self._buckets.length()):
+            bucket = self._buckets[i]
+            if bucket.generation != self._generation:
+                bucket = LinkedList()
+            out += str(i) + ': ' + str(bucket) + '\n'
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    def get_stats(self) -> dict:
+        """
+        Return size, capacity, table load, the current hash function and
+        the decision taken by function='auto' (None until one is taken)
+        """
+        return {
+            'size': self._size,
+            'capacity': self._capacity,
+            'table_load': self.table_load(),
+            'hash_function': self._hash_function.__name__,
+            'hash_decision': self._hash_decision,
+        }
+
+    def put(self, key: str, value: object) -> None:
+
+        """ Put method that adds a key/value node to the appropriate index
+        in the hash table, which has a linked list at each index. If the
+        given key already exists in the linked list, the value is simply
+        replaced. A hash function switch decided by function='auto' is
+        applied first, by rehashing the table once at its capacity. """
+
+        if self._next_hash_function is not None:
+            self.resize_table(self._capacity)
+
+        hash = self._hash_function(key)
+        index = hash % self._capacity
+
+        # if the key already exists in the LinkedList
+        if self._snapshots:
+            self._copy_on_write(index)
+        bucket = self._bucket(index)
+        node = bucket.contains(key)
+        if node:
+            node.value = value
+        else:
+            bucket.insert(key, value)
+            self._size += 1
+            if self._filter is not None:
+                self._filter_add(key)
+            if self._index is not None:
+                self._index.insert(key)
+            if self._selector is not None and self._selector.observe(key):
+                self._choose_hash_function()
+
+    # ------------------------------------------------------------------ #
+
+    def _choose_hash_function(self) -> None:
+
+        """ Helper that lets the selector of a function='auto' map decide
+        on a hash function. A switch is not applied right away: the next
+        put (or the chunked resize of AsyncHashMap) rehashes the table once
+        with the new function, through pending_resize. """
+
+        decision = self._selector.decide(self._hash_function, self._capacity)
+        self._selector = None
+        self._hash_decision = decision
+        if decision['switched']:
+            self._next_hash_function = decision['function']
+
+    # ------------------------------------------------------------------ #
+
+    def _bucket(self, index: int) -> LinkedList:
+
+        """ Helper method that returns the LinkedList at an index. A list
+        left over from before the last clear is replaced by an empty one
+        the first time it is touched. """
+
+        bucket = self._buckets.get_unchecked(index)
+        if bucket.generation != self._generation:
+            bucket = LinkedList()
+            bucket.generation = self._generation
+            self._buckets.set_unchecked(index, bucket)
+        return bucket
+
+    # ------------------------------------------------------------------ #
+
+    def _probe_length(self, key: str) -> int:
+
+        """ Probe length helper that returns the # of nodes of its chain
+        read to find a key, or the whole chain length for a missing key,
+        for the profiling hooks. """
+
+        length = 0
+        for node in self._bucket(self._hash_function(key) % self._capacity):
+            length += 1
+            if node.key == key:
+                break
+        return length
+
+    # ------------------------------------------------------------------ #
+
+    def empty_buckets(self) -> int:
+
+        """ Empty buckets method that returns the # of empty buckets in
+        the hash table. """
+
+        empty_buckets = self._capacity
+
+        length = self._buckets.length()
+        for i in range(0, length):
+            bucket = self._buckets[i]
+            if bucket.generation == self._generation and bucket.length() > 0:
+                empty_buckets -= 1
+
+        return empty_buckets
+
+    # ------------------------------------------------------------------ #
+
+    def table_load(self) -> float:
+
+        """ Table load method that returns the load factor of the hash
+        table. """
+
+        load = self._size / self._capacity
+
+        return load 
+    # ------------------------------------------------------------------ #
+
+    def clear(self) -> None:
+
+        """ Clear method that clears the hash table in O(1). Bumping the
+        generation makes every existing LinkedList read as empty, and each
+        one is reclaimed the next time its index is touched. While snapshots
+        are open the table is replaced by new empty lists instead, so they
+        keep the old table untouched. """
+
+        if self._snapshots:
+            self._detach_snapshots()
+            self._buckets = DynamicArray(size=self._capacity, fill=STALE_BUCKET)
+        self._generation += 1
+        self._size = 0
+        if self._filter is not None:
+            self._filter.clear()
+        if self._index is not None:
+            self._index = SkipList()
+
+    # ------------------------------------------------------------------ #
+
+    def resize_table(self, new_capacity: int) -> None:
+
+        """ Resize table method that resizes the hash table with the input
+        capacity. The hash table is then rehashed into the new hash table
+        according to the new capacity of the hash table. """
+
+        for _ in self.resize_table_steps(new_capacity):
+            pass
+
+    def resize_table_steps(self, new_capacity: int, chunk_size: int = 4096):
+
+        """ Generator version of resize_table that yields after every
+        `chunk_size` buckets rehashed. The old hash table stays
+        in place until the last step, so the map must not be written to
+        until the generator is exhausted. """
+
+        # if the proposed capacity is invalid
+        if new_capacity < 1:
+            return
+
+        # check to see if the capacity is prime
+        if not is_prime(new_capacity):
+            new_capacity = next_prime(new_capacity)
+
+        # a hash function chosen by function='auto' takes over here, so
+        # the whole table is rehashed with it once
+        if self._next_hash_function is not None:
+            self._hash_function, self._next_hash_function = self._next_hash_function, None
+
+        # every node is inserted into a new LinkedList, so the old table is
+        # never written to again and snapshots can keep it as it is
+        self._detach_snapshots()
+
+        # instantiate resized hash table; a LinkedList is only created
+        # for the indices that receive a node
+        new_size = 0
+        new_bucket = DynamicArray(size=new_capacity, fill=STALE_BUCKET)
+
+        # rehash the old hash table into the new hash table; keys are
+        # already unique, so they are inserted without a contains check
+        for i in range(self._buckets.length()):
+            bucket = self._buckets.get_unchecked(i)
+            if bucket.generation == self._generation and bucket.length() != 0:
+                for node in bucket:
+                    # rehash and get new index
+                    hash = self._hash_function(node.key)
+                    new_index = hash % new_capacity
+
+                    target = new_bucket.get_unchecked(new_index)
+                    if target is STALE_BUCKET:
+                        target = LinkedList()
+                        new_bucket.set_unchecked(new_index, target)
+                    target.insert(node.key, node.value)
+                    new_size += 1
+
+            if i % chunk_size == chunk_size - 1:
+                yield
+
+        # the new lists all start at generation 0, and the indices still
+        # holding STALE_BUCKET are left for get_buckets to sweep
+        self._capacity = new_capacity
+        self._buckets = new_bucket
+        self._size = new_size
+        self._generation = 0
+        self._swept_generation = -1
+
+    def pending_resize(self) -> int:
+
+        """ Pending resize method that returns the capacity the next put
+        will resize the table to. The separate chaining table never grows
+        on its own, so this is None unless a hash function switch decided
+        by function='auto' is waiting to rehash the table at its current
+        capacity. """
+
+        if self._next_hash_function is not None:
+            return self._capacity
+        return None
+
+    # ------------------------------------------------------------------ #
+
+    def get(self, key: str) -> object:
+
+        """ Get method that returns the value of a given key. Only the
+        LinkedList at the key's hashed index is searched. """
+
+        if self._filter is not None and not self._filter.might_contain(key):
+            return None
+
+        index = self._hash_function(key) % self._capacity
+        node = self._bucket(index).contains(key)
+        if node:
+            return node.value
+
+        if self._filter is not None:
+            self._filter.false_positive()
+        return None
+
+    # ------------------------------------------------------------------ #
+
+    def contains_key(self, key: str) -> bool:
+
+        """ Contains key method that returns True if the given key is
+        present in the hash table and False otherwise. """
+
+        if self._filter is not None and not self._filter.might_contain(key):
+            return False
+
+        index = self._hash_function(key) % self._capacity
+        if self._bucket(index).contains(key) is not None:
+            return True
+
+        if self._filter is not None:
+            self._filter.false_positive()
+        return False
+
+    # ------------------------------------------------------------------ #
+
+    def remove(self, key: str) -> None:
+
+        """ Remove method that removes a given key/value pair from the hash
+        table. Nothing happens if the key is invalid. """
+
+        if self._filter is not None and not self._filter.might_contain(key):
+            return
+
+        index = self._hash_function(key) % self._capacity
+        if self._snapshots and self._bucket(index).contains(key):
+            self._copy_on_write(index)
+        if self._bucket(index).remove(key):
+            self._size -= 1
+            if self._filter is not None:
+                self._filter.discard(key)
+            if self._index is not None:
+                self._index.remove(key)
+        elif self._filter is not None:
+            self._filter.false_positive()
+
+    # ------------------------------------------------------------------ #
+
+    def snapshot(self) -> "Snapshot":
+
+        """ Snapshot method that returns a read-only point-in-time view of
+        the map in O(1). Nothing is copied up front: the first write to a
+        LinkedList after the snapshot saves its pairs for it, and a resize
+        or clear hands the whole old table over to it. Values are shared,
+        not copied. """
+
+        snapshot = Snapshot(self)
+        self._snapshots.add(snapshot)
+        return snapshot
+
+    def _copy_on_write(self, index: int) -> None:
+
+        """ Helper that saves the pairs of the LinkedList at an index for
+        every open snapshot that has not saved it yet, right before the
+        list is written to. """
+
+        saved = _bucket_state(self._buckets.get_unchecked(index), self._generation)
+        for snapshot in self._snapshots:
+            if index not in snapshot._saved:
+                snapshot._saved[index] = saved
+
+    def _detach_snapshots(self) -> None:
+
+        """ Helper that lets every open snapshot keep the current table as
+        its own, once the map stops writing to it. """
+
+        for snapshot in list(self._snapshots):
+            snapshot._map = None
+        self._snapshots = weakref.WeakSet()
+
+    # ------------------------------------------------------------------ #
+
+    def _aligned_with(self, other) -> bool:
+
+        """ Helper that returns True if `other` is a separate chaining
+        HashMap with the same capacity and hash function, so every key sits
+        at the same index in both tables. """
+
+        return (isinstance(other, HashMap) and other._capacity == self._capacity and
+                other._hash_function is self._hash_function)
+
+    def _absorb(self, bucket: LinkedList, key: str, value: object, combine_fn) -> None:
+
+        """ Helper that adds a key/value pair to the LinkedList the key
+        hashes to. An existing value is replaced, or combined with the new
+        one when `combine_fn` is given. """
+
+        node = bucket.contains(key)
+        if node:
+            node.value = value if combine_fn is None else combine_fn(node.value, value)
+            return
+
+        bucket.insert(key, value)
+        self._size += 1
+        if self._filter is not None:
+            self._filter_add(key)
+        if self._index is not None:
+            self._index.insert(key)
+        if self._selector is not None and self._selector.observe(key):
+            self._choose_hash_function()
+
+    def update(self, other) -> None:
+
+        """ Update method that puts every key/value pair of `other` (any
+        map with iter_items) into this map, replacing existing values. """
+
+        self.merge(other, None)
+
+    def merge(self, other, combine_fn: callable) -> None:
+
+        """ Merge method that adds every key/value pair of `other` to this
+        map. A key present in both ends up with combine_fn(this value, other
+        value). When both tables line up (same capacity and hash function)
+        the LinkedLists are merged index by index without hashing any key.
+        Otherwise the table is resized once, up to a load factor of 1 for
+        all the keys, and each incoming key is hashed once. """
+
+        if self._aligned_with(other):
+            for i in range(self._capacity):
+                source = other._buckets.get_unchecked(i)
+                if source.generation != other._generation or source.length() == 0:
+                    continue
+                if self._snapshots:
+                    self._copy_on_write(i)
+                bucket = self._bucket(i)
+                for node in source:
+                    self._absorb(bucket, node.key, node.value, combine_fn)
+            return
+
+        needed = self._size + other.get_size()
+        if needed > self._capacity:
+            self.resize_table(needed)
+        for key, value in other.iter_items():
+            index = self._hash_function(key) % self._capacity
+            if self._snapshots:
+                self._copy_on_write(index)
+            self._absorb(self._bucket(index), key, value, combine_fn)
+
+    def diff(self, other) -> "HashMap":
+
+        """ Diff method that returns a new HashMap with the key/value pairs
+        of this map whose key is missing from `other` or holds a different
+        value there. Aligned tables are compared index by index, and the
+        result shares their capacity, so no key is hashed. """
+
+        answer = HashMap(self._capacity, self._hash_function)
+
+        if self._aligned_with(other):
+            for i in range(self._capacity):
+                bucket = self._buckets.get_unchecked(i)
+                if bucket.generation != self._generation or bucket.length() == 0:
+                    continue
+                source = other._buckets.get_unchecked(i)
+                if source.generation != other._generation:
+                    source = None
+                for node in bucket:
+                    match = source.contains(node.key) if source is not None else None
+                    if match is None or match.value != node.value:
+                        answer._bucket(i).insert(node.key, node.value)
+                        answer._size += 1
+            return answer
+
+        for key, value in self.iter_items():
+            found = other.get(key)
+            if found != value or (found is None and not other.contains_key(key)):
+                answer.put(key, value)
+        return answer
+
+    # ------------------------------------------------------------------ #
+
+    def get_keys_and_values(self) -> DynamicArray:
+
+        """ Returns a tuple of the key/value pairs of the hash table. """
+
+        answer = DynamicArray()
+
+        for i in range(self._buckets.length()):
+            bucket = self._buckets[i]
+            if bucket.generation == self._generation:
+                for node in bucket:
+                    answer.append((node.key, node.value))
+        return answer
+
+    def iter_items(self):
+
+        """ Generator that yields the key/value pairs of the hash table one
+        at a time, without building a DynamicArray of all of them. """
+
+        for i in range(self._buckets.length()):
+            bucket = self._buckets.get_unchecked(i)
+            if bucket.generation == self._generation:
+                for node in bucket:
+                    yield node.key, node.value
+
+    def freeze(self) -> "FrozenHashMap":
+
+        """ Freeze method that builds a read-only FrozenHashMap holding the
+        current key/value pairs, with one probe per lookup and no empty
+        buckets. Later changes to this map do not affect it. """
+
+        from .hash_map_frozen import FrozenHashMap
+
+        return FrozenHashMap(self.get_keys_and_values())
+
+    def hooks(self) -> "HookRegistry":
+
+        """ Hooks method that returns the hook registry of this map,
+        creating it on first use. Registering a pre or post callback on an
+        operation wraps that method on this map only; with no callback
+        registered the map runs its class methods untouched. """
+
+        if self._hooks is None:
+            from .hash_profile import HookRegistry
+
+            self._hooks = HookRegistry(self)
+        return self._hooks
+
+    def record_trace(self, path: str) -> "TraceRecorder":
+
+        """ Record trace method that starts writing every put, get,
+        contains_key, remove, clear and resize_table call made on this map
+        to a binary trace at `path`, for hash_trace.replay. Call stop on
+        the returned recorder to end the recording. """
+
+        from .hash_trace import TraceRecorder
+
+        return TraceRecorder(self, path)
+
+    def enable_filter(self, error_rate: float = 0.01) -> None:
+
+        """ Enable filter method that puts a counting Bloom filter in front
+        of get, contains_key and remove, so most lookups of missing keys
+        return without touching the hash table. The filter starts sized
+        for twice the current # of keys and is rebuilt at twice its size
+        whenever the map outgrows it. """
+
+        self._filter = CountingBloomFilter(max(self._size * 2, 64), error_rate)
+        for key, _ in self.iter_items():
+            self._filter.add(key)
+
+    def filter_false_positive_rate(self) -> float:
+
+        """ Returns the measured share of lookups of missing keys that the
+        filter could not rule out, or None if no filter is enabled. """
+
+        if self._filter is None:
+            return None
+        return self._filter.false_positive_rate()
+
+    def _filter_add(self, key: str) -> None:
+
+        """ Helper method that adds a new key to the filter, rebuilding the
+        filter at twice its size once it holds more keys than it was sized
+        for. """
+
+        self._filter.add(key)
+        if self._filter.length() > self._filter.capacity():
+            self._filter = self._filter.resized(self._filter.capacity() * 2)
+            for existing, _ in self.iter_items():
+                self._filter.add(existing)
+
+    def enable_ordered_index(self) -> None:
+
+        """ Enable ordered index method that keeps every key in a SkipList
+        updated by put, remove and clear, so range, prefix, min_key,
+        max_key and iter_ordered run in O(log n + k) instead of sorting
+        every key on every call. """
+
+        self._index = self._build_index()
+
+    def _build_index(self) -> SkipList:
+
+        """ Helper method that returns a SkipList holding the current keys:
+        the ordered index when it is enabled, otherwise one built for a
+        single query. """
+
+        if self._index is not None:
+            return self._index
+
+        index = SkipList()
+        for key, _ in self.iter_items():
+            index.insert(key)
+        return index
+
+    def range(self, low: str, high: str) -> DynamicArray:
+
+        """ Range method that returns the key/value pairs with
+        low <= key <= high, in key order. """
+
+        answer = DynamicArray()
+        for key in self._build_index().keys_between(low, high):
+            answer.append((key, self.get(key)))
+        return answer
+
+    def prefix(self, prefix: str) -> DynamicArray:
+
+        """ Prefix method that returns the key/value pairs whose key starts
+        with the given prefix, in key order. """
+
+        answer = DynamicArray()
+        for key in self._build_index().keys_with_prefix(prefix):
+            answer.append((key, self.get(key)))
+        return answer
+
+    def min_key(self) -> str:
+
+        """ Returns the smallest key, or None if the map is empty. """
+
+        return self._build_index().first()
+
+    def max_key(self) -> str:
+
+        """ Returns the largest key, or None if the map is empty. """
+
+        return self._build_index().last()
+
+    def iter_ordered(self):
+
+        """ Generator that yields the key/value pairs in key order. """
+
+        for key in self._build_index():
+            yield key, self.get(key)
+
+    def get_buckets(self):
+
+        """ Helper method for returning the hash table. Lists left over
+        from before the last clear are reclaimed first, so every list in
+        the returned table is current. """
+
+        if self._swept_generation != self._generation:
+            for i in range(self._buckets.length()):
+                self._bucket(i)
+            self._swept_generation = self._generation
+        return self._buckets
+
+    # ------------------------------------------------------------------ #
+
+def _bucket_state(bucket: LinkedList, generation: int) -> tuple:
+    """
+    Return the key/value pairs of a LinkedList as a tuple, which is empty
+    for a list from before the given generation
+    """
+    if bucket.generation != generation:
+        return ()
+    return tuple((node.key, node.value) for node in bucket)
+
+
+class Snapshot:
+    def __init__(self, hash_map: HashMap) -> None:
+        """
+        Initialize a read-only view of an SC HashMap as it is right now
+        The view reads the live table, except for the LinkedLists the map
+        has written to since, whose pairs it saved beforehand.
+        """
+        self._map = hash_map
+        self._buckets = hash_map._buckets
+        self._capacity = hash_map._capacity
+        self._generation = hash_map._generation
+        self._hash_function = hash_map._hash_function
+        self._size = hash_map._size
+        self._saved = {}
+
+    def _pairs(self, index: int):
+
+        """ Helper that returns the pairs at an index when the snapshot was
+        taken. """
+
+        if index in self._saved:
+            return self._saved[index]
+        bucket = self._buckets.get_unchecked(index)
+        if bucket.generation != self._generation:
+            return ()
+        return ((node.key, node.value) for node in bucket)
+
+    def get(self, key: str) -> object:
+
+        """ Get method that returns the value a key had when the snapshot
+        was taken, or None. """
+
+        for existing, value in self._pairs(self._hash_function(key) % self._capacity):
+            if existing == key:
+                return value
+        return None
+
+    def contains_key(self, key: str) -> bool:
+
+        """ Contains key method that returns True if the key was present
+        when the snapshot was taken. """
+
+        for existing, _ in self._pairs(self._hash_function(key) % self._capacity):
+            if existing == key:
+                return True
+        return False
+
+    def get_size(self) -> int:
+        """
+        Return size of map when the snapshot was taken
+        """
+        return self._size
+
+    def iter_items(self):
+
+        """ Generator that yields the key/value pairs of the snapshot. """
+
+        for i in range(self._capacity):
+            yield from self._pairs(i)
+
+    def get_keys_and_values(self) -> DynamicArray:
+
+        """ Get keys and values method that returns the key/value pairs of
+        the snapshot. """
+
+        return DynamicArray(list(self.iter_items()))
+
+    def close(self) -> None:
+
+        """ Close method that stops the map from saving LinkedLists for
+        this snapshot. The snapshot must not be used afterwards. """
+
+        if self._map is not None:
+            self._map._snapshots.discard(self)
+            self._map = None
+        self._buckets = None
+        self._saved = {}
+
+
+class ArenaHashMap:
+    def __init__(self,
+                 capacity: int = 11,
+                 function: callable = hash_function_1) -> None:
+        """
+        Initialize new HashMap that uses separate chaining like HashMap, but
+        stores its keys in a KeyArena instead of SLNode objects
+        Every bucket holds the arena reference of the head of its chain,
+        and the chain links and values are kept in an array and a list
+        indexed by the same reference.
+        """
+        self._capacity = next_prime(capacity)
+        self._heads = array('q', [EMPTY]) * self._capacity
+        self._next = array('q')
+        self._arena = KeyArena()
+        self._values = []
+
+        self._hash_function = function
+        self._next_hash_function = None
+        self._size = 0
+
+    get_size = HashMap.get_size
+    get_capacity = HashMap.get_capacity
+    table_load = HashMap.table_load
+    pending_resize = HashMap.pending_resize
+    freeze = HashMap.freeze
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i in range(self._capacity):
+            out += str(i) + ': '
+            ref = self._heads[i]
+            while ref != EMPTY:
+                out += '(' + self._arena.key(ref) + ': ' + str(self._values[ref]) + ') -> '
+                ref = self._next[ref]
+            out += '\n'
+        return out
+
+    # ------------------------------------------------------------------ #
+
+    def _find(self, key_bytes: bytes, hash: int) -> tuple:
+
+        """ Find helper that walks the chain of an encoded key. Returns the
+        reference of the key (or EMPTY) and of the node before it. """
+
+        arena = self._arena
+        previous = EMPTY
+        ref = self._heads[hash % self._capacity]
+        while ref != EMPTY:
+            if arena.matches(ref, key_bytes, hash):
+                return ref, previous
+            previous = ref
+            ref = self._next[ref]
+        return EMPTY, previous
+
+    def put(self, key: str, value: object) -> None:
+
+        """ Put method that adds a key/value pair to the front of its
+        chain, or replaces the value of an existing key. The key is encoded
+        once and appended to the arena along with its hash. """
+
+        key_bytes = key.encode('utf-8')
+        hash = self._hash_function(key) & HASH_MASK
+        ref, _ = self._find(key_bytes, hash)
+        if ref != EMPTY:
+            self._values[ref] = value
+            return
+
+        index = hash % self._capacity
+        ref = self._arena.add(key_bytes, hash)
+        self._next.append(self._heads[index])
+        self._values.append(value)
+        self._heads[index] = ref
+        self._size += 1
+
+    def get(self, key: str) -> object:
+
+        """ Get method that returns the value of a given key. Returns
+        None if the key is invalid. """
+
+        ref, _ = self._find(key.encode('utf-8'), self._hash_function(key) & HASH_MASK)
+        if ref == EMPTY:
+            return None
+        return self._values[ref]
+
+    def contains_key(self, key: str) -> bool:
+
+        """ Contains key method that returns True if the key is present. """
+
+        ref, _ = self._find(key.encode('utf-8'), self._hash_function(key) & HASH_MASK)
+        return ref != EMPTY
+
+    def remove(self, key: str) -> None:
+
+        """ Remove method that unlinks a given key from its chain. The key
+        bytes stay in the arena until a resize compacts it, which happens
+        on its own once removed keys outnumber live ones. """
+
+        hash = self._hash_function(key) & HASH_MASK
+        ref, previous = self._find(key.encode('utf-8'), hash)
+        if ref == EMPTY:
+            return
+
+        if previous == EMPTY:
+            self._heads[hash % self._capacity] = self._next[ref]
+        else:
+            self._next[previous] = self._next[ref]
+        self._values[ref] = None
+        self._size -= 1
+
+        if self._arena.length() - self._size > max(self._size, 1024):
+            self.resize_table(self._capacity)
+
+    def clear(self) -> None:
+
+        """ Clear method that drops the arena, the values and every chain
+        without changing the capacity. """
+
+        self._heads = array('q', [EMPTY]) * self._capacity
+        self._next = array('q')
+        self._arena = KeyArena()
+        self._values = []
+        self._size = 0
+
+    # ------------------------------------------------------------------ #
+
+    def empty_buckets(self) -> int:
+
+        """ Empty buckets method that returns the # of empty buckets in the
+        hash table. """
+
+        return self._heads.count(EMPTY)
+
+    def resize_table(self, new_capacity: int) -> None:
+
+        """ Resize table method that rehashes the live keys into a table of
+        `new_capacity` buckets (rounded up to a prime). The cached hashes
+        are reused, and the keys are copied into a fresh arena, which drops
+        the bytes of removed keys. """
+
+        if new_capacity < 1:
+            return
+
+        if not is_prime(new_capacity):
+            new_capacity = next_prime(new_capacity)
+
+        items = []
+        for i in range(self._capacity):
+            ref = self._heads[i]
+            while ref != EMPTY:
+                items.append(ref)
+                ref = self._next[ref]
+
+        old_arena, old_values = self._arena, self._values
+        self._capacity = new_capacity
+        self._heads = heads = array('q', [EMPTY]) * new_capacity
+        self._next = links = array('q')
+        self._arena = arena = KeyArena()
+        self._values = values = []
+
+        for ref in items:
+            hash = old_arena.hash(ref)
+            index = hash % new_capacity
+            links.append(heads[index])
+            heads[index] = arena.add(old_arena.key_bytes(ref), hash)
+            values.append(old_values[ref])
+
+    # ------------------------------------------------------------------ #
+
+    def iter_items(self):
+
+        """ Generator that yields the key/value pairs of the map. """
+
+        for i in range(self._capacity):
+            ref = self._heads[i]
+            while ref != EMPTY:
+                yield self._arena.key(ref), self._values[ref]
+                ref = self._next[ref]
+
+    def get_keys_and_values(self) -> DynamicArray:
+
+        """ Get keys and values method that returns the key/value pairs of
+        the map. """
+
+        return DynamicArray(list(self.iter_items()))
+
+    # ------------------------------------------------------------------ #
+
+class CountingMap:
+    def __init__(self,
+                 capacity: int = 11,
+                 function: callable = hash_function_1) -> None:
+        """
+        Initialize new map from keys to integer counts that uses separate
+        chaining like ArenaHashMap
+        Every key gets a reference the first time it is counted; its chain
+        link, cached hash and count live in arrays indexed by it. The
+        highest count and the keys holding it are kept up to date by every
+        increment, so the modes never need a scan of the table.
+        """
+        self._capacity = next_prime(capacity)
+        self._heads = array('q', [EMPTY]) * self._capacity
+        self._next = array('q')
+        self._keys = []
+        self._hashes = array('Q')
+        self._counts = array('q')
+
+        self._hash_function = function
+        self._size = 0
+        # highest count, None until a key is counted
+        self._max_count = None
+        # keys holding the max count, in the order they reached it; None
+        # once a negative increment of one of them leaves the max count and
+        # the modes to be recomputed
+        self._modes = {}
+
+    get_size = HashMap.get_size
+    get_capacity = HashMap.get_capacity
+    table_load = HashMap.table_load
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i in range(self._capacity):
+            out += str(i) + ': '
+            ref = self._heads[i]
+            while ref != EMPTY:
+                out += '(' + str(self._keys[ref]) + ': ' + str(self._counts[ref]) + ') -> '
+                ref = self._next[ref]
+            out += '\n'
+        return out
+
+    # ------------------------------------------------------------------ #
+
+    def _find(self, key: str, hash: int) -> int:
+
+        """ Find helper that walks the chain of a key and returns its
+        reference, or EMPTY. """
+
+        keys = self._keys
+        ref = self._heads[hash % self._capacity]
+        while ref != EMPTY and keys[ref] != key:
+            ref = self._next[ref]
+        return ref
+
+    def increment(self, key: str, n: int = 1) -> int:
+
+        """ Increment method that adds `n` to the count of a key, starting
+        from 0 for a new key, and returns the new count. The chain is
+        walked once, and the key is linked at its end when missing. The
+        table doubles once its load goes past 1, like find_mode did. """
+
+        hash = self._hash_function(key) & HASH_MASK
+        index = hash % self._capacity
+        keys, next = self._keys, self._next
+
+        ref = self._heads[index]
+        last = EMPTY
+        while ref != EMPTY and keys[ref] != key:
+            last = ref
+            ref = next[ref]
+
+        if ref != EMPTY:
+            count = self._counts[ref] + n
+            self._counts[ref] = count
+        else:
+            ref = len(keys)
+            keys.append(key)
+            next.append(EMPTY)
+            self._hashes.append(hash)
+            self._counts.append(n)
+            if last == EMPTY:
+                self._heads[index] = ref
+            else:
+                next[last] = ref
+            self._size += 1
+            count = n
+
+        # keep the max count and its keys current; a lowered mode may no
+        # longer hold the max, which only a scan can tell
+        if self._modes is not None:
+            if n < 0 and key in self._modes:
+                self._modes = None
+            elif self._max_count is None or count > self._max_count:
+                self._max_count = count
+                self._modes = {key: None}
+            elif count == self._max_count:
+                self._modes[key] = None
+
+        if self._size > self._capacity:
+            self.resize_table(self._capacity * 2)
+        return count
+
+    def increment_many(self, keys) -> None:
+
+        """ Increment many method that adds 1 to the count of every key of
+        `keys`, a DynamicArray or any iterable. """
+
+        if isinstance(keys, DynamicArray):
+            keys = keys._data
+        increment = self.increment
+        for key in keys:
+            increment(key)
+
+    def get(self, key: str) -> int:
+
+        """ Get method that returns the count of a given key, 0 if it was
+        never counted. """
+
+        ref = self._find(key, self._hash_function(key) & HASH_MASK)
+        if ref == EMPTY:
+            return 0
+        return self._counts[ref]
+
+    def contains_key(self, key: str) -> bool:
+
+        """ Contains key method that returns True if the key was counted. """
+
+        return self._find(key, self._hash_function(key) & HASH_MASK) != EMPTY
+
+    def clear(self) -> None:
+
+        """ Clear method that drops every key and count without changing
+        the capacity. """
+
+        self._heads = array('q', [EMPTY]) * self._capacity
+        self._next = array('q')
+        self._keys = []
+        self._hashes = array('Q')
+        self._counts = array('q')
+        self._size = 0
+        self._max_count = None
+        self._modes = {}
+
+    # ------------------------------------------------------------------ #
+
+    def _update_modes(self) -> None:
+
+        """ Helper that recomputes the max count and its keys after a
+        negative increment lowered a count holding it. """
+
+        counts = self._counts
+        self._max_count = max(counts) if self._size else None
+        self._modes = {self._keys[ref]: None for ref in range(self._size)
+                       if counts[ref] == self._max_count}
+
+    def max_count(self) -> int:
+
+        """ Max count method that returns the highest count, 0 when no key
+        was counted. """
+
+        if self._modes is None:
+            self._update_modes()
+        return 0 if self._max_count is None else self._max_count
+
+    def get_modes(self) -> DynamicArray:
+
+        """ Get modes method that returns the keys holding the highest
+        count, in the order they reached it. """
+
+        if self._modes is None:
+            self._update_modes()
+        return DynamicArray(list(self._modes))
+
+    def empty_buckets(self) -> int:
+
+        """ Empty buckets method that returns the # of empty buckets in the
+        hash table. """
+
+        return self._heads.count(EMPTY)
+
+    def resize_table(self, new_capacity: int) -> None:
+
+        """ Resize table method that relinks every key into a table of
+        `new_capacity` buckets (rounded up to a prime), using the cached
+        hashes. The references, and so the counts, do not move. """
+
+        if new_capacity < 1:
+            return
+
+        if not is_prime(new_capacity):
+            new_capacity = next_prime(new_capacity)
+
+        self._capacity = new_capacity
+        self._heads = heads = array('q', [EMPTY]) * new_capacity
+        next = self._next
+        for ref, hash in enumerate(self._hashes):
+            index = hash % new_capacity
+            next[ref] = heads[index]
+            heads[index] = ref
+
+    # ------------------------------------------------------------------ #
+
+    def iter_items(self):
+
+        """ Generator that yields the key/count pairs of the map, in the
+        order the keys were first counted. """
+
+        yield from zip(self._keys, self._counts)
+
+    def get_keys_and_values(self) -> DynamicArray:
+
+        """ Get keys and values method that returns the key/count pairs of
+        the map. """
+
+        return DynamicArray(list(self.iter_items()))
+
+
+def find_mode(da: DynamicArray) -> (DynamicArray, int):
+
+    """ Find mode function that finds the mode of an array utilizing a
+    CountingMap. Every element is counted with a single walk of its chain,
+    and the map keeps the highest count and the elements holding it as it
+    goes, so the answer needs no final pass over the table. The table
+    doubles once its load exceeds 1, and hash_function_3 spreads similar
+    strings that hash_function_1 would pile into a few chains, so chains
+    stay O(1) long and the whole count is O(n). """
+
+    counts = CountingMap(11, hash_function_3)
+    counts.increment_many(da)
+    return (counts.get_modes(), counts.max_count())
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+# if __name__ == "__main__":
+
+    # i = 8
+    # m = HashMap(10, hash_function_1)
+    # m.put("dragon", 100)
+    # m.put('str' + str(i), i * 100)
+    # m.put('str' + str(i), i * 200)
+
+    # print("\nPDF - put example 1")
+    # print("-------------------")
+    # m = HashMap(53, hash_function_1)
+    # for i in range(150):
+    #     m.put('str' + str(i), i * 100)
+    #     if i % 25 == 24:
+    #         # print(f" i: {i}, Empty buckets: {m.empty_buckets()}, Table Load: {round(m.table_load(), 2)}, Size: {m.get_size()}, Capacity: {m.get_capacity()}")
+    #         print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+
+    # print("\nPDF - put example 2")
+    # print("-------------------")
+    # m = HashMap(41, hash_function_2)
+    # for i in range(50):
+    #     m.put('str' + str(i // 3), i * 100)
+    #     if i % 10 == 9:
+    #         print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+
+    # print("\nPDF - empty_buckets example 1")
+    # print("-----------------------------")
+    # m = HashMap(101, hash_function_1)
+    # print(m.empty_buckets(), m.get_size(), m.get_capacity())
+    # m.put('key1', 10)
+    # print(m.empty_buckets(), m.get_size(), m.get_capacity())
+    # m.put('key2', 20)
+    # print(m.empty_buckets(), m.get_size(), m.get_capacity())
+    # m.put('key1', 30)
+    # print(m.empty_buckets(), m.get_size(), m.get_capacity())
+    # m.put('key4', 40)
+    # print(m.empty_buckets(), m.get_size(), m.get_capacity())
+
+    # print("\nPDF - empty_buckets example 2")
+    # print("-----------------------------")
+    # m = HashMap(53, hash_function_1)
+    # for i in range(150):
+    #     m.put('key' + str(i), i * 100)
+    #     if i % 30 == 0:
+    #         print(m.empty_buckets(), m.get_size(), m.get_capacity())
+
+    # print("\nPDF - table_load example 1")
+    # print("--------------------------")
+    # m = HashMap(101, hash_function_1)
+    # print(round(m.table_load(), 2))
+    # m.put('key1', 10)
+    # print(round(m.table_load(), 2))
+    # m.put('key2', 20)
+    # print(round(m.table_load(), 2))
+    # m.put('key1', 30)
+    # print(round(m.table_load(), 2))
+
+    # print("\nPDF - table_load example 2")
+    # print("--------------------------")
+    # m = HashMap(53, hash_function_1)
+    # for i in range(50):
+    #     m.put('key' + str(i), i * 100)
+    #     if i % 10 == 0:
+    #         print(round(m.table_load(), 2), m.get_size(), m.get_capacity())
+
+    # print("\nPDF - clear example 1")
+    # print("---------------------")
+    # m = HashMap(101, hash_function_1)
+    # print(m.get_size(), m.get_capacity())
+    # m.put('key1', 10)
+    # m.put('key2', 20)
+    # m.put('key1', 30)
+    # print(m.get_size(), m.get_capacity())
+    # m.clear()
+    # print(m.get_size(), m.get_capacity())
+
+    # print("\nPDF - clear example 2")
+    # print("---------------------")
+    # m = HashMap(53, hash_function_1)
+    # print(m.get_size(), m.get_capacity())
+    # m.put('key1', 10)
+    # print(m.get_size(), m.get_capacity())
+    # m.put('key2', 20)
+    # print(m.get_size(), m.get_capacity())
+    # m.resize_table(100)
+    # print(m.get_size(), m.get_capacity())
+    # m.clear()
+    # print(m.get_size(), m.get_capacity())
+
+    # m = HashMap(5, hash_function_1)
+    # m.put("hi", 200)
+    # m.put("dragon", 2000)
+    # m.resize_table(10)
+
+    # m = HashMap(5, hash_function_1)
+    # print(m._is_prime(2))
+
+    # print("\nPDF - resize example 1")
+    # print("----------------------")
+    # m = HashMap(23, hash_function_1)
+    # m.put('key1', 10)
+    # print(f"Size: {m.get_size()}, Capacity: {m.get_capacity()}, Value at key: {m.get('key1')}, Is Key in list: {m.contains_key('key1')}")
+    # m.resize_table(30)
+    # m.put('key2', 10)
+    # print(f"Size: {m.get_size()}, Capacity: {m.get_capacity()}, Value at key: {m.get('key1')}, Is Key in list: {m.contains_key('key1')}")
+    # # print(m.get_size(), m.get_capacity(), m.get('key1'), m.contains_key('key1'))
+
+    # print("\nPDF - resize example 2")
+    # print("----------------------")
+    # m = HashMap(50, hash_function_2)
+    # keys = [i for i in range(1, 1000, 13)]
+    # for key in keys:
+    #     m.put(str(key), key * 10)
+    # print(f"Size: {m.get_size()}, Capacity: {m.get_capacity()}\n")
+
+    # for capacity in range(111, 1000, 117):
+    #     m.resize_table(capacity)
+    #     m.put('some key', 'some value')
+    #     result = m.contains_key('some key')
+    #     m.remove('some key')
+    #     for key in keys:
+    #         # all inserted keys must be present
+    #         result &= m.contains_key(str(key))
+    #         # NOT inserted keys must be absent
+    #         result &= not m.contains_key(str(key + 1))
+    #     print(capacity, result, m.get_size(), m.get_capacity(), round(m.table_load(), 2))
+
+    # print("\nPDF - get example 1")
+    # print("-------------------")
+    # m = HashMap(31, hash_function_1)
+    # print(m.get('key'))
+    # m.put('key1', 10)
+    # print(m.get('key1'))
+
+    # print("\nPDF - get example 2")
+    # print("-------------------")
+    # m = HashMap(151, hash_function_2)
+    # for i in range(200, 300, 7):
+    #     m.put(str(i), i * 10)
+    # print(m.get_size(), m.get_capacity())
+    # for i in range(200, 300, 21):
+    #     print(i, m.get(str(i)), m.get(str(i)) == i * 10)
+    #     print(i + 1, m.get(str(i + 1)), m.get(str(i + 1)) == (i + 1) * 10)
+
+    # print("\nPDF - contains_key example 1")
+    # print("----------------------------")
+    # m = HashMap(53, hash_function_1)
+    # print(m.contains_key('key1'))
+    # m.put('key1', 10)
+    # m.put('key2', 20)
+    # m.put('key3', 30)
+    # print(m.contains_key('key1'))
+    # print(m.contains_key('key4'))
+    # print(m.contains_key('key2'))
+    # print(m.contains_key('key3'))
+    # m.remove('key3')
+    # print(m.contains_key('key3'))
+
+    # print("\nPDF - contains_key example 2")
+    # print("----------------------------")
+    # m = HashMap(79, hash_function_2)
+    # keys = [i for i in range(1, 1000, 20)]
+    # for key in keys:
+    #     m.put(str(key), key * 42)
+    # print(m.get_size(), m.get_capacity())
+    # result = True
+    # for key in keys:
+    #     # all inserted keys must be present
+    #     result &= m.contains_key(str(key))
+    #     # NOT inserted keys must be absent
+    #     result &= not m.contains_key(str(key + 1))
+    # print(result)
+
+    # print("\nPDF - remove example 1")
+    # print("----------------------")
+    # m = HashMap(53, hash_function_1)
+    # print(m.get('key1'))
+    # m.put('key1', 10)
+    # print(m.get('key1'))
+    # m.remove('key1')
+    # print(m.get('key1'))
+    # m.remove('key4')
+
+    # print("\nPDF - get_keys_and_values example 1")
+    # print("------------------------")
+    # m = HashMap(11, hash_function_2)
+    # for i in range(1, 6):
+    #     m.put(str(i), str(i * 10))
+    # print(m.get_keys_and_values())
+
+    # m.resize_table(1)
+    # print(m.get_keys_and_values())
+
+    # m.put('20', '200')
+    # m.remove('1')
+    # m.resize_table(2)
+    # print(m.get_keys_and_values())
+
+    # print("\nPDF - find_mode example 1")
+    # print("-----------------------------")
+    # da = DynamicArray(["grape", "apple", "melon", "peach", "grape"])
+    # mode, frequency = find_mode(da)
+    # print(f"Input: {da}\nMode : {mode}, Frequency: {frequency}")
+
+    # print("\nPDF - find_mode example 2")
+    # print("-----------------------------")
+    # test_cases = (
+    #     ["Arch", "Manjaro", "Manjaro", "Mint", "Mint", "Mint", "Ubuntu", "Ubuntu", "Ubuntu", "Ubuntu"],
+    #     ["one", "two", "three", "four", "five"],
+    #     ["2", "4", "2", "6", "8", "4", "1", "3", "4", "5", "7", "3", "3", "2"]
+    # )
+
+    # for case in test_cases:
+    #     da = DynamicArray(case)
+    #     mode, frequency = find_mode(da)
+    #     print(f"Input: {da}\nMode : {mode}, Frequency: {frequency}\n")
@@ -0,0 +1,67 @@
+# Description: Snapshot files for the OA & SC HashMaps, saving the key/value
+# pairs of a map to disk and bulk loading them back
+
+
+import os
+import pickle
+
+from .core import DynamicArray
+
+
+SNAPSHOT_MAGIC = b'HMSNAP01'
+
+
+def write_pairs(pairs: DynamicArray, path: str) -> None:
+    """
+    Write a DynamicArray of key/value pairs to `path`. The file is written
+    next to its destination and renamed over it, so a crash never leaves a
+    half written snapshot behind.
+    """
+    data = [pairs[i] for i in range(pairs.length())]
+    tmp_path = path + '.tmp'
+
+    with open(tmp_path, 'wb') as file:
+        file.write(SNAPSHOT_MAGIC)
+        pickle.dump(data, file, protocol=pickle.HIGHEST_PROTOCOL)
+        file.flush()
+        os.fsync(file.fileno())
+
+    os.replace(tmp_path, path)
+
+
+def read_pairs(path: str) -> DynamicArray:
+    """Read back the key/value pairs written by write_pairs."""
+    with open(path, 'rb') as file:
+        if file.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+            raise ValueError(path + ' is not a HashMap snapshot')
+        return DynamicArray(pickle.load(file))
+
+
+def presize(hash_map, count: int) -> None:
+    """
+    Resize `hash_map` once so that `count` more keys fit without any
+    resize along the way. Both tables are grown to twice the number of
+    keys, which keeps the OA table under its 0.5 load factor.
+    """
+    needed = (hash_map.get_size() + count) * 2 + 1
+    if needed > hash_map.get_capacity():
+        hash_map.resize_table(needed)
+
+
+def bulk_load(hash_map, pairs: DynamicArray):
+    """Pre-size `hash_map` for `pairs` and put all of them. Return the map."""
+    presize(hash_map, pairs.length())
+    for i in range(pairs.length()):
+        key, value = pairs[i]
+        hash_map.put(key, value)
+    return hash_map
+
+
+def save_snapshot(hash_map, path: str) -> None:
+    """Save every key/value pair of an OA or SC HashMap to `path`."""
+    write_pairs(hash_map.get_keys_and_values(), path)
+
+
+def load_snapshot(path: str, hash_map):
+    """Bulk load a snapshot saved by save_snapshot into `hash_map`."""
+    return bulk_load(hash_map, read_pairs(path))
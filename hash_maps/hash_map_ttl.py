@@ -0,0 +1,295 @@
+# Description: Time-to-live wrapper for the OA & SC HashMaps, expiring keys
+# through a hierarchical timer wheel
+
+
+import math
+import time
+
+from .core import DynamicArray
+
+
+class TimerWheel:
+    """
+    Hierarchical timer wheel used to expire keys in amortized O(1)
+    Level 0 holds one slot per tick, every level above it covers
+    `slots` times the span of the level below. Timers that are not due
+    yet when their slot comes around cascade down to a finer level.
+    Supported methods are: schedule, advance, clear, length
+    """
+
+    def __init__(self,
+                 tick: float = 1.0,
+                 slots: int = 64,
+                 levels: int = 4,
+                 start: float = 0.0) -> None:
+        """Initialize an empty wheel whose current tick matches `start`."""
+        self._tick = tick
+        self._slots = slots
+        self._levels = levels
+        self._wheels = [[[] for _ in range(slots)] for _ in range(levels)]
+        self._current = int(start // tick)
+        self._size = 0
+
+    def _place(self, key: object, deadline: float) -> None:
+        """Put a timer into the slot of the level that covers its delay."""
+        # a timer fires on the first tick boundary at or after its deadline
+        due = max(math.ceil(deadline / self._tick), self._current + 1)
+        delta = due - self._current
+
+        level, span = 0, self._slots
+        while delta >= span and level < self._levels - 1:
+            level += 1
+            span *= self._slots
+
+        # timers beyond the wheel's horizon wait in the top level and are
+        # re-placed every time that slot comes around
+        slot = (due // (span // self._slots)) % self._slots
+        self._wheels[level][slot].append((key, deadline))
+
+    def schedule(self, key: object, deadline: float) -> None:
+        """Register `key` to be reported once the wheel reaches `deadline`."""
+        self._place(key, deadline)
+        self._size += 1
+
+    def advance(self, now: float) -> DynamicArray:
+        """
+        Move the wheel forward to `now` and return the (key, deadline)
+        pairs that fell due on the way.
+        """
+        due = DynamicArray()
+        target = int(now // self._tick)
+
+        while self._current < target:
+            self._current += 1
+
+            # cascade the coarser levels whose slot boundary was just crossed
+            span = 1
+            for level in range(1, self._levels):
+                span *= self._slots
+                if self._current % span != 0:
+                    break
+                bucket = self._wheels[level][(self._current // span) % self._slots]
+                self._wheels[level][(self._current // span) % self._slots] = []
+                for key, deadline in bucket:
+                    if math.ceil(deadline / self._tick) <= self._current:
+                        due.append((key, deadline))
+                        self._size -= 1
+                    else:
+                        self._place(key, deadline)
+
+            bucket = self._wheels[0][self._current % self._slots]
+            self._wheels[0][self._current % self._slots] = []
+            for key, deadline in bucket:
+                due.append((key, deadline))
+                self._size -= 1
+
+            # nothing left to fire, so jump straight to the target tick
+            if self._size == 0:
+                self._current = target
+
+        return due
+
+    def clear(self) -> None:
+        """Drop every pending timer."""
+        self._wheels = [[[] for _ in range(self._slots)]
+                        for _ in range(self._levels)]
+        self._size = 0
+
+    def length(self) -> int:
+        """Return the number of pending timers."""
+        return self._size
+
+
+class TTLHashMap:
+    def __init__(self,
+                 hash_map,
+                 default_ttl: float = None,
+                 tick: float = 1.0,
+                 clock: callable = time.monotonic) -> None:
+        """
+        Initialize a TTL cache on top of an empty OA or SC HashMap
+        Values are stored in the wrapped map as (value, deadline) pairs,
+        with a deadline of None for keys that never expire.
+        """
+        self._map = hash_map
+        self._default_ttl = default_ttl
+        self._clock = clock
+        self._wheel = TimerWheel(tick, start=clock())
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        return str(self._map)
+
+    def get_size(self) -> int:
+        """
+        Return size of map, including expired keys not yet reclaimed
+        """
+        return self._map.get_size()
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of the wrapped map
+        """
+        return self._map.get_capacity()
+
+    # ------------------------------------------------------------------ #
+
+    def put(self, key: str, value: object, ttl: float = None) -> None:
+
+        """ Put method that adds a key/value pair that expires `ttl` seconds
+        from now (or after the default TTL when none is given). Putting an
+        existing key replaces both its value and its deadline. Due timers
+        are processed first, so expiry work is spread over the writes. """
+
+        now = self._clock()
+        self._expire(now)
+
+        if ttl is None:
+            ttl = self._default_ttl
+
+        deadline = None if ttl is None else now + ttl
+        self._map.put(key, (value, deadline))
+
+        if deadline is not None:
+            self._wheel.schedule(key, deadline)
+
+    # ------------------------------------------------------------------ #
+
+    def _expire(self, now: float) -> int:
+
+        """ Expire helper that advances the timer wheel and removes every
+        key whose deadline has passed. Timers left behind by a later put of
+        the same key no longer match the stored deadline and are skipped. """
+
+        removed = 0
+        due = self._wheel.advance(now)
+
+        for i in range(due.length()):
+            key, deadline = due[i]
+            entry = self._map.get(key)
+            if entry is not None and entry[1] == deadline:
+                self._map.remove(key)
+                removed += 1
+
+        return removed
+
+    def expire(self) -> int:
+
+        """ Expire method that removes all keys that are due and returns how
+        many were removed. """
+
+        return self._expire(self._clock())
+
+    # ------------------------------------------------------------------ #
+
+    def _live_entry(self, key: str) -> tuple:
+
+        """ Helper method that returns the stored (value, deadline) pair of
+        a key, lazily removing it if it has already expired. """
+
+        entry = self._map.get(key)
+        if entry is None:
+            return None
+
+        if entry[1] is not None and entry[1] <= self._clock():
+            self._map.remove(key)
+            return None
+
+        return entry
+
+    def get(self, key: str) -> object:
+
+        """ Get method that returns the value of a given key, or None if the
+        key is missing or expired. """
+
+        entry = self._live_entry(key)
+        return None if entry is None else entry[0]
+
+    def contains_key(self, key: str) -> bool:
+
+        """ Contains key method that returns True if the key is present and
+        not expired, False otherwise. """
+
+        return self._live_entry(key) is not None
+
+    def ttl(self, key: str) -> float:
+
+        """ TTL method that returns the seconds left before the key expires,
+        or None if the key is missing or never expires. """
+
+        entry = self._live_entry(key)
+        if entry is None or entry[1] is None:
+            return None
+        return entry[1] - self._clock()
+
+    # ------------------------------------------------------------------ #
+
+    def remove(self, key: str) -> None:
+
+        """ Remove method that removes a key/value pair. Its pending timer is
+        left on the wheel and discarded when it fires. """
+
+        self._map.remove(key)
+
+    def clear(self) -> None:
+
+        """ Clear method that empties the map and drops all timers. """
+
+        self._map.clear()
+        self._wheel.clear()
+
+    def get_keys_and_values(self) -> DynamicArray:
+
+        """ Get keys and values method that returns the key/value pairs that
+        have not expired. """
+
+        now = self._clock()
+        answer = DynamicArray()
+        pairs = self._map.get_keys_and_values()
+
+        for i in range(pairs.length()):
+            key, (value, deadline) = pairs[i]
+            if deadline is None or deadline > now:
+                answer.append((key, value))
+
+        return answer
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    from .core import hash_function_1
+    from .hash_map_oa import HashMap
+
+    class FakeClock:
+        def __init__(self):
+            self.now = 0.0
+
+        def __call__(self):
+            return self.now
+
+    print("\nTTL - expiry example 1")
+    print("----------------------")
+    clock = FakeClock()
+    m = TTLHashMap(HashMap(53, hash_function_1), clock=clock)
+    for i in range(100):
+        m.put('str' + str(i), i * 100, ttl=i % 10 + 1)
+    print(m.get_size(), m.get('str3'), m.contains_key('str9'))
+    clock.now = 5.5
+    print(m.expire(), m.get_size(), m.get('str3'), m.contains_key('str9'))
+    clock.now = 10.5
+    print(m.expire(), m.get_size())
+
+    print("\nTTL - long deadline example 1")
+    print("-----------------------------")
+    clock = FakeClock()
+    m = TTLHashMap(HashMap(11, hash_function_1), clock=clock)
+    m.put('key1', 10, ttl=100000)
+    m.put('key2', 20)
+    clock.now = 99999
+    print(m.expire(), m.get('key1'), m.ttl('key1'))
+    clock.now = 100001
+    print(m.expire(), m.get('key1'), m.get('key2'))
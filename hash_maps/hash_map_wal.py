@@ -0,0 +1,358 @@
+# Description: Append-only write-ahead log making OA & SC HashMap mutations
+# durable, with group commit, checkpoints and bulk recovery
+
+
+import os
+import pickle
+import struct
+import threading
+import zlib
+
+from .hash_map_snapshot import presize, read_pairs, save_snapshot
+
+
+OP_PUT = 1
+OP_REMOVE = 2
+OP_CLEAR = 3
+
+# crc32 of the rest of the record, op code, key length, value length
+RECORD_HEADER = struct.Struct('<IBII')
+
+
+class WriteAheadLog:
+    """
+    Append-only log of put, remove and clear records
+    Records are buffered and written with one write and one fsync per
+    group (group commit). A group is committed by the append that brings
+    it to `group_size` records, or else by a timer thread started with its
+    first record, `group_delay` seconds later.
+    Durability window: append returns before its record is on disk, and a
+    crash up to `group_delay` seconds (plus one write and fsync) after
+    it loses the record. Call sync to make every appended record durable
+    before going on.
+    Supported methods are: append, sync, truncate, close, records
+    """
+
+    def __init__(self,
+                 path: str,
+                 group_size: int = 64,
+                 group_delay: float = 0.005) -> None:
+        """Open (or create) the log at `path` for appending."""
+        self._path = path
+        self._file = open(path, 'ab')
+        self._group_size = group_size
+        self._group_delay = group_delay
+        self._pending = bytearray()
+        self._pending_records = 0
+        # guards the pending records and the file against the timer thread
+        self._lock = threading.Lock()
+        self._timer = None
+
+    @staticmethod
+    def encode(op: int, key: str, value: object) -> bytes:
+        """Return the binary record for one operation."""
+        key_bytes = b'' if key is None else key.encode('utf-8')
+        value_bytes = b'' if op != OP_PUT else pickle.dumps(
+            value, protocol=pickle.HIGHEST_PROTOCOL)
+        body = bytes((op,)) + struct.pack('<II', len(key_bytes), len(value_bytes))
+        crc = zlib.crc32(body + key_bytes + value_bytes)
+        return struct.pack('<I', crc) + body + key_bytes + value_bytes
+
+    def append(self, op: int, key: str = None, value: object = None) -> None:
+        """
+        Queue one record, committing the group if it is full, or starting
+        the timer that commits it after `group_delay` seconds
+        """
+        record = self.encode(op, key, value)
+        with self._lock:
+            self._pending += record
+            self._pending_records += 1
+            if self._pending_records >= self._group_size:
+                self._commit()
+            elif self._timer is None:
+                self._timer = threading.Timer(self._group_delay, self.sync)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _commit(self) -> None:
+        """Write and fsync every pending record; the lock must be held."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._pending_records == 0 or self._file.closed:
+            return
+
+        self._file.write(self._pending)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = bytearray()
+        self._pending_records = 0
+
+    def sync(self) -> None:
+        """Write and fsync every pending record."""
+        with self._lock:
+            self._commit()
+
+    def truncate(self) -> None:
+        """Drop every record, pending or written."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._pending = bytearray()
+            self._pending_records = 0
+            self._file.truncate(0)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        """Commit pending records and close the log."""
+        with self._lock:
+            self._commit()
+            self._file.close()
+
+    @staticmethod
+    def records(path: str):
+        """
+        Yield the (op, key, value, end) records of the log at `path`, where
+        end is the offset just past the record. Reading stops at the first
+        torn or corrupt record, which is what a crash in the middle of a
+        group commit leaves behind.
+        """
+        if not os.path.exists(path):
+            return
+
+        with open(path, 'rb') as file:
+            data = file.read()
+
+        offset = 0
+        while offset + RECORD_HEADER.size <= len(data):
+            crc, op, key_length, value_length = RECORD_HEADER.unpack_from(data, offset)
+            start = offset + RECORD_HEADER.size
+            end = start + key_length + value_length
+            if end > len(data) or zlib.crc32(data[offset + 4:end]) != crc:
+                return
+
+            key = data[start:start + key_length].decode('utf-8')
+            value = None
+            if op == OP_PUT:
+                value = pickle.loads(data[start + key_length:end])
+            yield op, key, value, end
+            offset = end
+
+
+class DurableHashMap:
+    def __init__(self,
+                 hash_map,
+                 path: str,
+                 group_size: int = 64,
+                 group_delay: float = 0.005,
+                 checkpoint_every: int = None) -> None:
+        """
+        Initialize a durable map over an OA or SC HashMap
+        The map is first recovered from `path`.snap and `path`.wal, then
+        every mutation is logged before it is applied. A checkpoint is
+        taken automatically after `checkpoint_every` logged records.
+        """
+        self._map = hash_map
+        self._snapshot_path = path + '.snap'
+        self._log_path = path + '.wal'
+        self._checkpoint_every = checkpoint_every
+        self._logged = 0
+
+        self.recover()
+        self._log = WriteAheadLog(self._log_path, group_size, group_delay)
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        return str(self._map)
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._map.get_size()
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._map.get_capacity()
+
+    # ------------------------------------------------------------------ #
+
+    def recover(self) -> int:
+
+        """ Recover method that rebuilds the map from the last checkpoint
+        and the log written since. The records are first folded into their
+        final state per key, so the map is sized once and every surviving
+        key is put exactly once. A torn or corrupt tail is cut off the log,
+        so records appended from now on are not written after it, where
+        the next recovery would never reach them. Returns the number of
+        records replayed. """
+
+        state = {}
+        if os.path.exists(self._snapshot_path):
+            pairs = read_pairs(self._snapshot_path)
+            for i in range(pairs.length()):
+                key, value = pairs[i]
+                state[key] = value
+
+        replayed = 0
+        valid_length = 0
+        for op, key, value, valid_length in WriteAheadLog.records(self._log_path):
+            if op == OP_PUT:
+                state[key] = value
+            elif op == OP_REMOVE:
+                state.pop(key, None)
+            elif op == OP_CLEAR:
+                state.clear()
+            replayed += 1
+
+        if os.path.exists(self._log_path) and os.path.getsize(self._log_path) > valid_length:
+            with open(self._log_path, 'r+b') as log:
+                log.truncate(valid_length)
+                log.flush()
+                os.fsync(log.fileno())
+
+        self._map.clear()
+        presize(self._map, len(state))
+        for key, value in state.items():
+            self._map.put(key, value)
+
+        return replayed
+
+    def checkpoint(self) -> None:
+
+        """ Checkpoint method that saves the map to the snapshot file and
+        empties the log. A crash between the two steps is harmless, since
+        replaying the whole log over the newer snapshot gives the same
+        map. """
+
+        self._log.sync()
+        save_snapshot(self._map, self._snapshot_path)
+        self._log.truncate()
+        self._logged = 0
+
+    def sync(self) -> None:
+
+        """ Sync method that forces pending log records to disk. """
+
+        self._log.sync()
+
+    def close(self) -> None:
+
+        """ Close method that syncs and closes the log. """
+
+        self._log.close()
+
+    def _logged_record(self) -> None:
+
+        """ Helper that counts a logged record and checkpoints when due. """
+
+        self._logged += 1
+        if self._checkpoint_every is not None and self._logged >= self._checkpoint_every:
+            self.checkpoint()
+
+    # ------------------------------------------------------------------ #
+
+    def put(self, key: str, value: object) -> None:
+
+        """ Put method that logs and then applies a put. """
+
+        self._log.append(OP_PUT, key, value)
+        self._map.put(key, value)
+        self._logged_record()
+
+    def remove(self, key: str) -> None:
+
+        """ Remove method that logs and then applies a remove. Removing a
+        missing key is not logged. """
+
+        if not self._map.contains_key(key):
+            return
+
+        self._log.append(OP_REMOVE, key)
+        self._map.remove(key)
+        self._logged_record()
+
+    def clear(self) -> None:
+
+        """ Clear method that logs and then applies a clear. """
+
+        self._log.append(OP_CLEAR)
+        self._map.clear()
+        self._logged_record()
+
+    def get(self, key: str) -> object:
+
+        """ Get method that returns the value of a given key. """
+
+        return self._map.get(key)
+
+    def contains_key(self, key: str) -> bool:
+
+        """ Contains key method that returns True if the key is present. """
+
+        return self._map.contains_key(key)
+
+    def get_keys_and_values(self):
+
+        """ Get keys and values method of the wrapped map. """
+
+        return self._map.get_keys_and_values()
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    import tempfile
+    import time
+
+    from .core import hash_function_2
+    from .hash_map_sc import HashMap
+
+    path = os.path.join(tempfile.mkdtemp(), 'map')
+
+    print("\nWAL - recovery example 1")
+    print("------------------------")
+    m = DurableHashMap(HashMap(11, hash_function_2), path)
+    for i in range(1000):
+        m.put('str' + str(i), i)
+    m.remove('str1')
+    m.checkpoint()
+    m.put('key1', 10)
+    m.clear()
+    m.put('key2', 20)
+    m.close()
+
+    m = DurableHashMap(HashMap(11, hash_function_2), path)
+    print(m.get_size(), m.get('key1'), m.get('key2'), m.get('str2'))
+
+    print("\nWAL - torn tail example 1")
+    print("-------------------------")
+    m.put('key3', 30)
+    m.put('key4', 40)
+    m.close()
+    with open(path + '.wal', 'r+b') as log:
+        log.truncate(os.path.getsize(path + '.wal') - 3)
+    m = DurableHashMap(HashMap(11, hash_function_2), path)
+    print(m.get_size(), m.get('key3'), m.get('key4'))
+    m.put('key5', 50)
+    m.close()
+    m = DurableHashMap(HashMap(11, hash_function_2), path)
+    print(m.get_size(), m.get('key3'), m.get('key5'))
+
+    print("\nWAL - group delay example 1")
+    print("---------------------------")
+    size = os.path.getsize(path + '.wal')
+    m.put('key6', 60)
+    time.sleep(0.1)
+    # the timer committed the put without any sync call, so the log on
+    # disk already holds it
+    print(os.path.getsize(path + '.wal') > size,
+          any(key == 'key6' for _, key, _, _ in WriteAheadLog.records(path + '.wal')))
+    m.close()
@@ -0,0 +1,289 @@
+# Description: Profiling hooks for the OA & SC HashMaps: a registry of pre
+# and post callbacks per operation with 1-in-N sampling, and a sampling
+# tracer exporting collapsed stacks and a per-call-site hot-key report
+
+
+import inspect
+import sys
+import time
+
+from .core import shadow_method, unshadow_method
+
+
+# operations hooks can be registered on; the first four take a key
+OPS = ('put', 'get', 'contains_key', 'remove', 'clear', 'resize_table')
+KEYED_OPS = ('put', 'get', 'contains_key', 'remove')
+
+# frames kept of the stack of a sampled call
+STACK_DEPTH = 64
+
+
+class HookEvent:
+    """
+    One sampled call: the operation, its key (None for clear and
+    resize_table), the probe or chain length of the key before the call,
+    the duration in ns (set before the post hooks run), the call site as
+    (file, line, function) and the calling stack, outermost frame first
+    """
+
+    __slots__ = ('op', 'key', 'probe_length', 'duration', 'site', 'stack')
+
+    def __init__(self, op: str, key: object, probe_length: int, site: tuple, stack: tuple) -> None:
+        """Initialize an event before the call is made."""
+        self.op = op
+        self.key = key
+        self.probe_length = probe_length
+        self.duration = None
+        self.site = site
+        self.stack = stack
+
+
+def _caller(frame) -> tuple:
+    """
+    Return the call site of a frame and its stack as frame names, leaving
+    out the frames of this module
+    """
+    code = frame.f_code
+    site = (code.co_filename, frame.f_lineno, code.co_name)
+    stack = []
+    while frame is not None and len(stack) < STACK_DEPTH:
+        if frame.f_globals is not globals():
+            stack.append(frame.f_globals.get('__name__', '?') + '.' + frame.f_code.co_name)
+        frame = frame.f_back
+    stack.reverse()
+    return site, tuple(stack)
+
+
+class HookRegistry:
+    """
+    Pre and post callbacks for the operations of one HashMap
+    Registering the first callback of an operation shadows that method
+    with a wrapper stored on the map instance, like hash_trace does, and
+    removing its last callback takes that wrapper away again, so an
+    operation with no callback costs nothing. Only the calls made from
+    outside the map are seen: the calls the map makes on itself while
+    one is running (the re-puts of an OA resize) go straight through.
+    With sample_every = N only one call in N builds a HookEvent and runs
+    the callbacks; the others only decrement a counter.
+    Supported methods are: add_hook, remove_hook, set_sample_every, close
+    """
+
+    def __init__(self, hash_map, sample_every: int = 1) -> None:
+        """Initialize a registry with no callbacks for `hash_map`."""
+        self._map = hash_map
+        self._pre = {op: [] for op in OPS}
+        self._post = {op: [] for op in OPS}
+        self._sample_every = sample_every
+        self._countdown = sample_every
+        self._wrappers = {}
+        self._depth = 0
+
+    def set_sample_every(self, sample_every: int) -> None:
+        """Run the callbacks for one call in `sample_every`."""
+        self._sample_every = sample_every
+        self._countdown = sample_every
+
+    def add_hook(self, op: str, pre: callable = None, post: callable = None) -> None:
+        """
+        Register callbacks taking a HookEvent, run before and after every
+        sampled call of `op`
+        """
+        if op not in OPS:
+            raise ValueError('cannot hook ' + repr(op))
+        if pre is not None:
+            self._pre[op].append(pre)
+        if post is not None:
+            self._post[op].append(post)
+        if op not in self._wrappers:
+            self._wrappers[op] = shadow_method(
+                self._map, op, lambda method: self._wrap(op, method))
+
+    def remove_hook(self, op: str, pre: callable = None, post: callable = None) -> None:
+        """Unregister callbacks, unwrapping `op` once it has none left."""
+        if pre is not None:
+            self._pre[op].remove(pre)
+        if post is not None:
+            self._post[op].remove(post)
+        if not self._pre[op] and not self._post[op] and op in self._wrappers:
+            unshadow_method(self._map, op, self._wrappers.pop(op))
+
+    def close(self) -> None:
+        """Unregister every callback and unwrap every operation."""
+        for op in OPS:
+            self._pre[op].clear()
+            self._post[op].clear()
+        for op, wrapper in self._wrappers.items():
+            unshadow_method(self._map, op, wrapper)
+        self._wrappers = {}
+
+    def _wrap(self, op: str, method: callable) -> callable:
+        """Return a wrapper that samples calls to `method`."""
+        pre, post = self._pre[op], self._post[op]
+        keyed = op in KEYED_OPS
+        hash_map = self._map
+        clock = time.perf_counter_ns
+        signature = inspect.signature(method)
+
+        def wrapper(*args, **kwargs):
+            if not wrapper.active or self._depth:
+                return method(*args, **kwargs)
+            self._countdown -= 1
+            if self._countdown > 0:
+                self._depth += 1
+                try:
+                    return method(*args, **kwargs)
+                finally:
+                    self._depth -= 1
+            self._countdown = self._sample_every
+
+            key = None
+            if keyed:
+                key = signature.bind(*args, **kwargs).args[0] if kwargs else args[0]
+            probe_length = hash_map._probe_length(key) if keyed else None
+            site, stack = _caller(sys._getframe(1))
+            event = HookEvent(op, key, probe_length, site, stack)
+            for hook in pre:
+                hook(event)
+            self._depth += 1
+            begin = clock()
+            try:
+                result = method(*args, **kwargs)
+            finally:
+                event.duration = clock() - begin
+                self._depth -= 1
+            for hook in post:
+                hook(event)
+            return result
+
+        return wrapper
+
+
+class SamplingTracer:
+    """
+    Post hook aggregating the sampled calls of one or more maps by stack
+    and by call site
+    The samples can be exported in the collapsed-stack format read by
+    flamegraph.pl and speedscope, weighted by sample count or time, and as
+    a report of the busiest call sites with their hottest keys.
+    Supported methods are: attach, detach, collapsed, hot_keys
+    """
+
+    def __init__(self, sample_every: int = 100) -> None:
+        """Initialize a tracer with no samples."""
+        self._sample_every = sample_every
+        self._registries = []
+        self._stacks = {}
+        self._sites = {}
+
+    def attach(self, hash_map) -> None:
+        """Start sampling one call in `sample_every` of every operation."""
+        registry = hash_map.hooks()
+        registry.set_sample_every(self._sample_every)
+        for op in OPS:
+            registry.add_hook(op, post=self._record)
+        self._registries.append(registry)
+
+    def detach(self) -> None:
+        """Stop sampling every attached map; the samples are kept."""
+        for registry in self._registries:
+            for op in OPS:
+                registry.remove_hook(op, post=self._record)
+        self._registries = []
+
+    def _record(self, event: HookEvent) -> None:
+        """Add a sampled call to the aggregates."""
+        stack = event.stack + (event.op,)
+        totals = self._stacks.get(stack)
+        if totals is None:
+            totals = self._stacks[stack] = [0, 0]
+        totals[0] += 1
+        totals[1] += event.duration
+
+        site = self._sites.get(event.site)
+        if site is None:
+            # samples, ns, probe length total, samples with a key, key counts
+            site = self._sites[event.site] = [0, 0, 0, 0, {}]
+        site[0] += 1
+        site[1] += event.duration
+        if event.key is not None:
+            site[2] += event.probe_length
+            site[3] += 1
+            site[4][event.key] = site[4].get(event.key, 0) + 1
+
+    def collapsed(self, weight: str = 'samples') -> str:
+        """
+        Return one 'frame;frame;op count' line per sampled stack, with the
+        count in samples or, with weight='time', in ns
+        """
+        column = 1 if weight == 'time' else 0
+        return '\n'.join(';'.join(stack) + ' ' + str(totals[column])
+                         for stack, totals in sorted(self._stacks.items()))
+
+    def hot_keys(self, sites: int = 10, keys: int = 5) -> str:
+        """
+        Return a report of the `sites` call sites with the most samples:
+        their estimated # of calls, mean duration and probe length, and
+        their `keys` most sampled keys
+        """
+        out = ''
+        ranked = sorted(self._sites.items(), key=lambda item: -item[1][0])
+        for (path, line, function), site in ranked[:sites]:
+            samples, ns, probes, keyed, counts = site
+            out += (path + ':' + str(line) + ' ' + function + ': ~' +
+                    str(samples * self._sample_every) + ' calls, ' +
+                    str(round(ns / samples / 1000, 2)) + ' us')
+            if keyed:
+                out += ', probe ' + str(round(probes / keyed, 2))
+            out += '\n'
+            top = sorted(counts.items(), key=lambda item: -item[1])[:keys]
+            for key, count in top:
+                out += '    ' + repr(key) + ' ' + str(count) + '\n'
+        return out.rstrip('\n')
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    import random
+
+    from .core import hash_function_1, hash_function_3
+    from .hash_map_oa import HashMap as OAHashMap
+    from .hash_map_sc import HashMap as SCHashMap
+
+    def load(m, count: int) -> None:
+        for i in range(count):
+            m.put('str' + str(i), i)
+
+    def lookups(m, count: int) -> None:
+        for _ in range(count):
+            m.get('str' + str(int(random.paretovariate(1.1)) % 1000))
+
+    print("\nHookRegistry - pre/post example 1")
+    print("---------------------------------")
+    m = SCHashMap(11, hash_function_1)
+    registry = m.hooks()
+    seen = []
+    registry.add_hook('put', pre=lambda event: seen.append(event.probe_length),
+                      post=lambda event: seen.append(event.duration > 0))
+    m.put('key1', 1)
+    m.put('key1', 2)
+    registry.remove_hook('put', pre=registry._pre['put'][0], post=registry._post['put'][0])
+    print(seen, 'put' in m.__dict__)
+
+    print("\nSamplingTracer - collapsed stacks example 1")
+    print("-------------------------------------------")
+    tracer = SamplingTracer(sample_every=10)
+    oa, sc = OAHashMap(11, hash_function_3), SCHashMap(11, hash_function_1)
+    tracer.attach(oa)
+    tracer.attach(sc)
+    load(oa, 1000)
+    load(sc, 1000)
+    lookups(oa, 20000)
+    lookups(sc, 20000)
+    tracer.detach()
+    print(tracer.collapsed())
+
+    print("\nSamplingTracer - hot keys example 1")
+    print("-----------------------------------")
+    print(tracer.hot_keys(sites=4, keys=3))
@@ -0,0 +1,274 @@
+# Description: Workload traces for the OA & SC HashMaps: an opt-in recorder
+# writing every call to a compact binary file, and a replay tool reporting
+# throughput, latency percentiles and resize events for any engine
+
+
+import inspect
+import struct
+import sys
+import time
+
+from .core import DynamicArray, shadow_method, unshadow_method
+
+
+TRACE_MAGIC = b'HMTRACE1'
+
+OP_PUT = 1
+OP_GET = 2
+OP_CONTAINS = 3
+OP_REMOVE = 4
+OP_CLEAR = 5
+OP_RESIZE = 6
+
+OP_NAMES = {
+    OP_PUT: 'put',
+    OP_GET: 'get',
+    OP_CONTAINS: 'contains_key',
+    OP_REMOVE: 'remove',
+    OP_CLEAR: 'clear',
+    OP_RESIZE: 'resize_table',
+}
+
+# op code, 64-bit key hash, ns since the recording started, value size
+# (the requested capacity for resize_table), key length
+RECORD = struct.Struct('<BQQII')
+
+HASH_MASK = 0xFFFFFFFFFFFFFFFF
+
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+class TraceRecorder:
+    """
+    Records every put, get, contains_key, remove, clear and resize_table
+    call made on a map to a binary trace file
+    Recording works by shadowing those methods with wrappers stored on the
+    map instance itself, so a map that is not being recorded runs its
+    class methods with no overhead at all. Calls a map makes on itself
+    (the OA put resizing its table) are not recorded, since the replayed
+    engine decides on its own when to do them.
+    Supported methods are: stop
+    """
+
+    def __init__(self, hash_map, path: str) -> None:
+        """Start recording the calls made on `hash_map` to `path`."""
+        self._map = hash_map
+        self._file = open(path, 'wb')
+        self._file.write(TRACE_MAGIC)
+        self._hash_function = hash_map._hash_function
+        self._start = time.perf_counter_ns()
+        self._depth = 0
+        self._count = 0
+
+        self._wrappers = {
+            name: shadow_method(hash_map, name, lambda method, op=op: self._wrap(op, method))
+            for op, name in OP_NAMES.items()}
+
+    def _wrap(self, op: int, method: callable) -> callable:
+        """Return a wrapper that records a call to `method`, then makes it."""
+        signature = inspect.signature(method)
+
+        def wrapper(*args, **kwargs):
+            if not wrapper.active:
+                return method(*args, **kwargs)
+            if self._depth == 0:
+                # keyword arguments are put back in parameter order
+                self._write(op, *(signature.bind(*args, **kwargs).args if kwargs else args))
+            self._depth += 1
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self._depth -= 1
+
+        return wrapper
+
+    def _write(self, op: int, key: object = None, value: object = None) -> None:
+        """Append one record to the trace."""
+        timestamp = time.perf_counter_ns() - self._start
+        if op == OP_RESIZE:
+            self._file.write(RECORD.pack(op, 0, timestamp, key, 0))
+            return
+        if key is None:
+            self._file.write(RECORD.pack(op, 0, timestamp, 0, 0))
+            return
+
+        key_bytes = key.encode('utf-8')
+        size = sys.getsizeof(value) if op == OP_PUT else 0
+        hash = self._hash_function(key) & HASH_MASK
+        self._file.write(RECORD.pack(op, hash, timestamp, size, len(key_bytes)) + key_bytes)
+        self._count += 1
+
+    def get_count(self) -> int:
+        """
+        Return number of keyed calls recorded so far
+        """
+        return self._count
+
+    def stop(self) -> None:
+        """
+        Remove the wrappers from the map and close the trace. Wrappers
+        other tools put on the same methods are left in place.
+        """
+        for name, wrapper in self._wrappers.items():
+            unshadow_method(self._map, name, wrapper)
+        self._file.close()
+
+
+def read_trace(path: str):
+    """
+    Yield the (op, key hash, timestamp in ns, value size, key) records of
+    the trace at `path`. The key is None for clear and resize_table.
+    """
+    with open(path, 'rb') as file:
+        data = file.read()
+
+    if data[:len(TRACE_MAGIC)] != TRACE_MAGIC:
+        raise ValueError(path + ' is not a HashMap trace')
+
+    offset = len(TRACE_MAGIC)
+    while offset + RECORD.size <= len(data):
+        op, hash, timestamp, size, key_length = RECORD.unpack_from(data, offset)
+        offset += RECORD.size
+        key = None
+        if key_length or op not in (OP_CLEAR, OP_RESIZE):
+            key = data[offset:offset + key_length].decode('utf-8')
+            offset += key_length
+        yield op, hash, timestamp, size, key
+
+
+def _percentile(ordered: list, percent: float) -> int:
+    """Return the nearest-rank percentile of a sorted list."""
+    rank = max(int(-(-percent * len(ordered) // 100)), 1)
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class ReplayReport:
+    """
+    Result of replaying a trace: run time, per-operation latencies in ns
+    and the resize events seen along the way, as (op number, old capacity,
+    new capacity, ns spent in that op) tuples
+    """
+
+    def __init__(self, seconds: float, latencies: dict, resizes: DynamicArray) -> None:
+        """Initialize the report from the raw measurements."""
+        self.seconds = seconds
+        self.latencies = latencies
+        self.resizes = resizes
+        self.ops = sum(len(values) for values in latencies.values())
+
+    def throughput(self) -> float:
+        """Return the number of operations replayed per second."""
+        return self.ops / self.seconds if self.seconds else 0.0
+
+    def percentiles(self, op: int) -> tuple:
+        """Return the PERCENTILES and the max latency of an op, in ns."""
+        ordered = sorted(self.latencies.get(op, ()))
+        if not ordered:
+            return ()
+        return tuple(_percentile(ordered, p) for p in PERCENTILES) + (ordered[-1],)
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = (str(self.ops) + ' ops in ' + str(round(self.seconds, 3)) + 's, ' +
+               str(int(self.throughput())) + ' ops/s\n')
+        out += 'op: ' + ' '.join('p' + str(p) for p in PERCENTILES) + ' max (us)\n'
+        for op, name in OP_NAMES.items():
+            latencies = self.percentiles(op)
+            if latencies:
+                out += name + ': ' + ' '.join(str(round(ns / 1000, 1)) for ns in latencies) + '\n'
+        out += 'resizes: ' + str(self.resizes.length())
+        for i in range(self.resizes.length()):
+            number, old, new, ns = self.resizes[i]
+            out += '\n  op ' + str(number) + ': ' + str(old) + ' -> ' + str(new) + \
+                   ' (' + str(round(ns / 1000, 1)) + ' us)'
+        return out
+
+
+def replay(path: str, hash_map, max_load: float = None) -> ReplayReport:
+    """
+    Re-drive the trace at `path` against `hash_map` as fast as possible and
+    return a ReplayReport. Values are replaced by bytes objects of the
+    recorded size. The trace is decoded up front, so only the map calls
+    are timed. With `max_load`, the table is doubled once its load goes
+    past it, for engines (SC) that never resize on their own.
+    """
+    records = list(read_trace(path))
+    values = {}
+    latencies = {op: [] for op in OP_NAMES}
+    resizes = DynamicArray()
+    capacity = hash_map.get_capacity()
+    clock = time.perf_counter_ns
+
+    started = time.perf_counter()
+    for number, (op, _, _, size, key) in enumerate(records):
+        if op == OP_PUT:
+            value = values.get(size)
+            if value is None:
+                value = values[size] = bytes(size)
+            begin = clock()
+            hash_map.put(key, value)
+            if max_load is not None and hash_map.table_load() > max_load:
+                hash_map.resize_table(hash_map.get_capacity() * 2)
+        elif op == OP_GET:
+            begin = clock()
+            hash_map.get(key)
+        elif op == OP_CONTAINS:
+            begin = clock()
+            hash_map.contains_key(key)
+        elif op == OP_REMOVE:
+            begin = clock()
+            hash_map.remove(key)
+        elif op == OP_CLEAR:
+            begin = clock()
+            hash_map.clear()
+        else:
+            begin = clock()
+            hash_map.resize_table(size)
+        elapsed = clock() - begin
+
+        latencies[op].append(elapsed)
+        if hash_map.get_capacity() != capacity:
+            resizes.append((number, capacity, hash_map.get_capacity(), elapsed))
+            capacity = hash_map.get_capacity()
+
+    return ReplayReport(time.perf_counter() - started, latencies, resizes)
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    import os
+    import random
+    import tempfile
+
+    from .core import hash_function_2, hash_function_3
+    from .hash_map_oa import HashMap as OAHashMap
+    from .hash_map_sc import HashMap as SCHashMap
+
+    path = os.path.join(tempfile.mkdtemp(), 'map.trace')
+
+    print("\nTrace - record example 1")
+    print("------------------------")
+    m = OAHashMap(11, hash_function_2)
+    recorder = m.record_trace(path)
+    for i in range(50000):
+        key = 'str' + str(int(random.paretovariate(1.2)) % 20000)
+        if i % 4 == 0:
+            m.put(key, 'x' * (i % 100))
+        elif i % 17 == 0:
+            m.remove(key)
+        else:
+            m.get(key)
+    recorder.stop()
+    print(recorder.get_count(), os.path.getsize(path), 'put' in m.__dict__)
+
+    print("\nTrace - replay example 1")
+    print("------------------------")
+    for name, target, max_load in (('oa hash_function_2', OAHashMap(11, hash_function_2), None),
+                                   ('oa hash_function_3', OAHashMap(11, hash_function_3), None),
+                                   ('sc hash_function_3', SCHashMap(11, hash_function_3), 1.0)):
+        print('\n' + name)
+        print(replay(path, target, max_load))
@@ -0,0 +1,138 @@
+# Description: Optional NumPy backed batch hashing for integer and short
+# fixed-width string keys, matching the sample hash functions in ds_include
+
+
+from .core import hash_function_1, hash_function_2, hash_function_3
+
+# NumPy is only imported by the first batch hashed, so importing the maps
+# does not pay for it; HAVE_NUMPY is resolved on first access as well
+np = None
+_numpy_checked = False
+
+FNV_OFFSET = 0xCBF29CE484222325
+FNV_PRIME = 0x100000001B3
+
+
+def _load_numpy():
+    """Import NumPy on first use. Return the module, or None if missing."""
+    global np, _numpy_checked
+    if not _numpy_checked:
+        _numpy_checked = True
+        try:
+            import numpy
+            np = numpy
+        except ImportError:
+            pass
+    return np
+
+
+def __getattr__(name: str):
+    """Resolve HAVE_NUMPY, importing NumPy the first time it is read."""
+    if name == 'HAVE_NUMPY':
+        return _load_numpy() is not None
+    raise AttributeError('module ' + repr(__name__) + ' has no attribute ' + repr(name))
+
+
+def as_key_array(keys):
+    """
+    Return `keys` as a NumPy array of fixed-width strings. Integer keys are
+    converted the same way str() converts them, since the maps store string
+    keys. Keys are expected to have no trailing NUL characters, which NumPy
+    strings cannot hold.
+    """
+    _load_numpy()
+    keys = np.asarray(keys)
+    if keys.dtype.kind != 'U':
+        keys = keys.astype(str)
+    return keys
+
+
+def _code_points(keys):
+    """
+    Return a (number of keys, key width) uint64 array with the code points
+    of every key, padded with zeros, and the length of every key.
+    """
+    codes = np.ascontiguousarray(keys).view(np.uint32).reshape(len(keys), -1)
+    return codes.astype(np.uint64), np.char.str_len(keys)
+
+
+def hash_many_1(keys):
+    """Vectorized hash_function_1: the sum of the code points of each key."""
+    codes, _ = _code_points(as_key_array(keys))
+    return codes.sum(axis=1, dtype=np.uint64)
+
+
+def hash_many_2(keys):
+    """
+    Vectorized hash_function_2: the code points of each key weighted by
+    their 1-based position. Padding code points are zero, so they add
+    nothing to the sum.
+    """
+    codes, _ = _code_points(as_key_array(keys))
+    weights = np.arange(1, codes.shape[1] + 1, dtype=np.uint64)
+    return (codes * weights).sum(axis=1, dtype=np.uint64)
+
+
+def hash_many_3(keys):
+    """
+    Vectorized hash_function_3 (64-bit FNV-1a). The loop runs once per
+    character column for the whole batch, and keys shorter than the
+    column are left untouched.
+    """
+    codes, lengths = _code_points(as_key_array(keys))
+    hashes = np.full(len(codes), FNV_OFFSET, dtype=np.uint64)
+    prime = np.uint64(FNV_PRIME)
+
+    for column in range(codes.shape[1]):
+        mixed = (hashes ^ codes[:, column]) * prime
+        hashes = np.where(lengths > column, mixed, hashes)
+
+    return hashes
+
+
+VECTORIZED = {
+    hash_function_1: hash_many_1,
+    hash_function_2: hash_many_2,
+    hash_function_3: hash_many_3,
+}
+
+
+def hash_many(keys, function):
+    """
+    Hash a whole batch of keys with the vectorized version of `function`.
+    Return a uint64 NumPy array, or None when NumPy is not installed or
+    `function` has no vectorized version.
+    """
+    if function not in VECTORIZED or _load_numpy() is None:
+        return None
+    return VECTORIZED[function](keys)
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    import random
+    import time
+
+    print("\nVectorized - hash_function_2 compatibility")
+    print("------------------------------------------")
+    keys = ['str' + str(i) for i in range(100000)]
+    keys += [str(random.getrandbits(40)) for _ in range(100000)]
+    for function in (hash_function_1, hash_function_2, hash_function_3):
+        batch = hash_many(keys, function).tolist()
+        print(function.__name__, batch == [function(key) for key in keys])
+    print(hash_many([1, 22, 333], hash_function_2).tolist(),
+          [hash_function_2(str(i)) for i in (1, 22, 333)])
+
+    print("\nVectorized - timing (200000 keys)")
+    print("---------------------------------")
+    for function in (hash_function_2, hash_function_3):
+        start = time.perf_counter()
+        for key in keys:
+            function(key)
+        scalar = time.perf_counter() - start
+        start = time.perf_counter()
+        hash_many(keys, function)
+        vector = time.perf_counter() - start
+        print(function.__name__, round(scalar, 3), round(vector, 3))